@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""Compare merging of large overlaid definitions with the previous merge implementation.
+
+Usage: python benchmarks/definition_merger.py [--repeat N]
+"""
+import argparse
+import functools
+import itertools
+import timeit
+
+from collections import abc
+
+from kubepy import definition_merger
+
+
+@functools.singledispatch
+def previous_merge_definitions(*definitions):
+    return definitions[-1]
+
+
+@previous_merge_definitions.register(dict)
+def previous_merge_dicts(*definitions):
+    if definitions[-1] is None:
+        return None
+    keys = set(itertools.chain(*(definition.keys() for definition in definitions if definition is not None)))
+    result = {}
+    for key in keys:
+        value = previous_merge_definitions(*(definition[key] for definition in definitions
+                                             if definition is not None and key in definition))
+        if value is not None:
+            result[key] = value
+    return result
+
+
+@previous_merge_definitions.register(list)
+@previous_merge_definitions.register(tuple)
+def previous_merge_lists(*definitions):
+    named_results = {}
+    unmerged_results = []
+    for definition in itertools.chain(*definitions):
+        if isinstance(definition, abc.Mapping) and 'name' in definition:
+            name = definition['name']
+            if name in named_results:
+                named_results[name].append(definition)
+            else:
+                new_result = [definition]
+                named_results[name] = new_result
+                unmerged_results.append(new_result)
+        else:
+            unmerged_results.append([definition])
+    return list(previous_merge_definitions(*results) for results in unmerged_results)
+
+
+def get_stateful_set(containers=4, variables=60, volumes=30):
+    return {
+        'apiVersion': 'apps/v1',
+        'kind': 'StatefulSet',
+        'metadata': {'name': 'database', 'labels': {'app': 'database'}},
+        'spec': {
+            'replicas': 3,
+            'template': {
+                'metadata': {'labels': {'app': 'database'}},
+                'spec': {
+                    'containers': [
+                        {
+                            'name': 'container-{}'.format(container),
+                            'image': 'database:latest',
+                            'env': [
+                                {'name': 'VARIABLE_{}'.format(variable), 'value': str(variable)}
+                                for variable in range(variables)
+                            ],
+                            'volumeMounts': [
+                                {'name': 'volume-{}'.format(volume), 'mountPath': '/mnt/{}'.format(volume)}
+                                for volume in range(volumes)
+                            ],
+                        }
+                        for container in range(containers)
+                    ],
+                    'volumes': [
+                        {'name': 'volume-{}'.format(volume), 'emptyDir': {}} for volume in range(volumes)
+                    ],
+                },
+            },
+        },
+    }
+
+
+def get_overlay(layer):
+    return {
+        'metadata': {'labels': {'layer': str(layer)}},
+        'spec': {
+            'replicas': layer,
+            'template': {
+                'spec': {
+                    'containers': [
+                        {
+                            'name': 'container-0',
+                            'env': [{'name': 'VARIABLE_{}'.format(layer), 'value': 'overridden'}],
+                        },
+                    ],
+                },
+            },
+        },
+    }
+
+
+def run_case(name, candidates, repeat):
+    print(name)
+    baseline = None
+    for label, function in candidates:
+        seconds = min(timeit.repeat(function, number=10, repeat=repeat)) / 10
+        baseline = baseline or seconds
+        print('  {:<40} {:>9.2f} ms  x{:.1f}'.format(label, seconds * 1000, baseline / seconds))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    full_layers = [get_stateful_set() for _ in range(4)]
+    sparse_layers = [get_stateful_set()] + [get_overlay(layer) for layer in range(1, 4)]
+    for layers in [full_layers, sparse_layers]:
+        assert definition_merger.merge_definitions(*layers) == previous_merge_definitions(*layers)
+    run_case('Merge 4 full stateful set layers', [
+        ('previous', lambda: previous_merge_definitions(*full_layers)),
+        ('definition_merger.merge_definitions', lambda: definition_merger.merge_definitions(*full_layers)),
+    ], args.repeat)
+    run_case('Merge stateful set with 3 sparse overlays', [
+        ('previous', lambda: previous_merge_definitions(*sparse_layers)),
+        ('definition_merger.merge_definitions', lambda: definition_merger.merge_definitions(*sparse_layers)),
+    ], args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+"""Run kubepy commands on generated definitions against fake kubectl and report where the time went.
+
+Usage: python benchmarks/end_to_end.py [--directories N] [--definitions M] [--latency SECONDS]
+                                       [--variant 'label=--batch --prefetch 4' ...]
+"""
+import argparse
+import collections
+import json
+import os
+import pathlib
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+KINDS = ['ConfigMap', 'Service', 'Deployment', 'StatefulSet', 'Secret', 'Job', 'CronJob', 'Deployment']
+COMMAND_MODULES = {
+    'apply-all': 'kubepy.commands.apply_all',
+    'apply-one': 'kubepy.commands.apply_one',
+}
+RUNNER = """
+import resource, runpy, sys
+module, rusage_path = sys.argv[1:3]
+sys.argv = [module, *sys.argv[3:]]
+try:
+    runpy.run_module(module, run_name='__main__')
+finally:
+    with open(rusage_path, 'w') as rusage_file:
+        rusage_file.write(str(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+"""
+
+
+def get_definition(kind, name, containers, variables, volumes, layer=0):
+    definition = {'apiVersion': 'v1', 'kind': kind, 'metadata': {'name': name, 'labels': {'layer': str(layer)}}}
+    if kind in ['ConfigMap', 'Secret']:
+        definition['data'] = {'key-{}'.format(variable): 'value-{}'.format(layer) for variable in range(variables)}
+    elif kind == 'Service':
+        definition['spec'] = {'selector': {'app': name}, 'ports': [{'name': 'http', 'port': 80 + layer}]}
+    else:
+        pod_spec = {
+            'containers': [
+                {
+                    'name': 'container-{}'.format(container),
+                    'image': 'example/{}'.format(name),
+                    'env': [
+                        {'name': 'VARIABLE_{}'.format(variable), 'value': '{}-{}'.format(variable, layer)}
+                        for variable in range(variables)
+                    ],
+                    'volumeMounts': [
+                        {'name': 'volume-{}'.format(volume), 'mountPath': '/mnt/{}'.format(volume)}
+                        for volume in range(volumes)
+                    ],
+                }
+                for container in range(containers)
+            ],
+            'volumes': [{'name': 'volume-{}'.format(volume), 'emptyDir': {}} for volume in range(volumes)],
+        }
+        if kind == 'Job':
+            pod_spec['restartPolicy'] = 'Never'
+            definition['spec'] = {'template': {'spec': pod_spec}}
+        elif kind == 'CronJob':
+            pod_spec['restartPolicy'] = 'Never'
+            definition['spec'] = {'schedule': '0 * * * *', 'jobTemplate': {'spec': {'template': {'spec': pod_spec}}}}
+        else:
+            definition['spec'] = {'replicas': layer + 1, 'template': {'spec': pod_spec}}
+    return definition
+
+
+def generate_definitions(root, args):
+    directories = []
+    names = []
+    for layer in range(args.directories):
+        directory = root / 'definitions-{}'.format(layer)
+        directory.mkdir()
+        directories.append(directory)
+        for index in range(args.definitions):
+            kind = KINDS[index % len(KINDS)]
+            name = '{}-{}'.format(kind.lower(), index)
+            if layer == 0:
+                names.append(name)
+                definition = get_definition(kind, name, args.containers, args.variables, args.volumes)
+            else:
+                definition = get_definition(kind, name, 1, 1, 0, layer=layer)
+            with (directory / (name + '.yml')).open('w') as definition_file:
+                yaml.safe_dump(definition, definition_file)
+    return directories, names
+
+
+def run_variant(label, kubepy_options, directories, names, root, args):
+    state = root / 'state-{}'.format(label)
+    state.mkdir()
+    log_path = root / 'kubectl-{}.log'.format(label)
+    log_path.touch()
+    rusage_path = root / 'rusage-{}'.format(label)
+    metrics_path = root / 'metrics-{}.json'.format(label)
+    environment = dict(
+        os.environ,
+        PATH='{}{}{}'.format(root / 'bin', os.pathsep, os.environ['PATH']),
+        FAKE_KUBECTL_STATE=str(state),
+        FAKE_KUBECTL_LOG=str(log_path),
+        FAKE_KUBECTL_LATENCY=str(args.latency),
+        FAKE_KUBECTL_JOB_DURATION=str(args.job_duration),
+    )
+    command = [sys.executable, '-c', RUNNER, COMMAND_MODULES[args.command], str(rusage_path)]
+    command += ['--directory={}'.format(directory) for directory in directories]
+    command += ['--metrics-file={}'.format(metrics_path), *kubepy_options]
+    if args.command == 'apply-one':
+        command += names[:args.names]
+    started = time.perf_counter()
+    subprocess.run(command, env=environment, check=True, stdout=subprocess.DEVNULL)
+    wall_time = time.perf_counter() - started
+    calls = [json.loads(line) for line in log_path.read_text().splitlines()]
+    stages = json.loads(metrics_path.read_text())['stages']
+    report(label, wall_time, calls, int(rusage_path.read_text()), stages)
+
+
+def report(label, wall_time, calls, peak_rss, stages):
+    durations = collections.defaultdict(float)
+    counts = collections.Counter()
+    for call in calls:
+        durations[call['argv'][0]] += call['duration']
+        counts[call['argv'][0]] += 1
+    kubectl_time = sum(durations.values())
+    print(label)
+    print('  {:<32} {:>9.2f} s'.format('wall time', wall_time))
+    print('  {:<32} {:>9}'.format('kubectl invocations', len(calls)))
+    print('  {:<32} {:>9.1f} MB'.format('peak RSS', peak_rss / 1024))
+    for verb, duration in sorted(durations.items()):
+        print('  {:<32} {:>9.2f} s  ({} calls)'.format('kubectl ' + verb, duration, counts[verb]))
+    print('  {:<32} {:>9.2f} s'.format('kubepy, waits and process start', max(wall_time - kubectl_time, 0)))
+    for stage, entry in stages.items():
+        print('  {:<32} {:>9.2f} s  ({} runs)'.format('stage ' + stage, entry['seconds'], entry['count']))
+
+
+def parse_variant(value):
+    label, _, options = value.partition('=')
+    return label, shlex.split(options)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--command', choices=sorted(COMMAND_MODULES), default='apply-all')
+    parser.add_argument('--directories', type=int, default=4, help='number of overlaid definition directories')
+    parser.add_argument('--definitions', type=int, default=100, help='number of definitions in each directory')
+    parser.add_argument('--containers', type=int, default=2)
+    parser.add_argument('--variables', type=int, default=30)
+    parser.add_argument('--volumes', type=int, default=10)
+    parser.add_argument('--names', type=int, default=10, help='number of definitions applied with apply-one')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to each kubectl call')
+    parser.add_argument('--job-duration', type=float, default=0.5, help='seconds until jobs and pods finish')
+    parser.add_argument('--variant', dest='variants', type=parse_variant, action='append',
+                        help='label=kubepy options, can be used multiple times. Default: baseline without options.')
+    parser.add_argument('--keep', action='store_true', help='keep generated files and kubectl logs')
+    args = parser.parse_args()
+    root = pathlib.Path(tempfile.mkdtemp(prefix='kubepy-benchmark-'))
+    try:
+        (root / 'bin').mkdir()
+        kubectl_path = root / 'bin' / 'kubectl'
+        kubectl_path.write_text('#!{}\n{}'.format(
+            sys.executable, (pathlib.Path(__file__).parent / 'fake_kubectl.py').read_text()))
+        kubectl_path.chmod(0o755)
+        directories, names = generate_definitions(root, args)
+        for label, kubepy_options in args.variants or [('baseline', [])]:
+            run_variant(label, kubepy_options, directories, names, root, args)
+    finally:
+        if args.keep:
+            print('Files kept in {}'.format(root))
+        else:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
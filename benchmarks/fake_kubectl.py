@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""Stand-in for kubectl used by benchmarks/end_to_end.py.
+
+Every invocation is appended to $FAKE_KUBECTL_LOG, sleeps $FAKE_KUBECTL_LATENCY seconds and
+reports jobs and pods as finished $FAKE_KUBECTL_JOB_DURATION seconds after they were created.
+"""
+import datetime
+import json
+import os
+import pathlib
+import sys
+import time
+
+JOB_KINDS = {'job': 'Job', 'jobs': 'Job', 'pod': 'Pod', 'pods': 'Pod'}
+
+
+def main(argv):
+    started = time.time()
+    stdin = sys.stdin.buffer.read() if '-f' in argv else b''
+    time.sleep(float(os.environ.get('FAKE_KUBECTL_LATENCY', '0')))
+    exit_code = handle(argv, stdin)
+    record(argv, started, stdin, exit_code)
+    return exit_code
+
+
+def handle(argv, stdin):
+    verb = argv[0] if argv else ''
+    if verb in ['apply', 'create', 'replace', 'rolling-update']:
+        for item in get_items(json.loads(stdin)):
+            if verb == 'create' and item['kind'] in JOB_KINDS.values():
+                get_state_path(item['kind'], item['metadata']['name']).write_text(json.dumps({
+                    'created': time.time(),
+                    'labels': item['metadata'].get('labels') or {},
+                }))
+            action = 'created' if verb == 'create' else 'configured'
+            print('{}/{} {}'.format(item['kind'].lower(), item['metadata']['name'], action))
+    elif verb == 'delete':
+        kind, name = JOB_KINDS.get(argv[1].lower(), argv[1]), argv[2]
+        get_state_path(kind, name).unlink(missing_ok=True)
+    elif verb == 'get':
+        return handle_get(argv)
+    elif verb in ['logs', 'diff']:
+        pass
+    else:
+        print('fake kubectl: unsupported command {}'.format(' '.join(argv)), file=sys.stderr)
+        return 1
+    return 0
+
+
+def handle_get(argv):
+    kind = JOB_KINDS.get(argv[1].lower())
+    name = argv[2] if len(argv) > 2 and not argv[2].startswith('-') else None
+    output = get_flag(argv, '-o')
+    if kind and output and output.startswith('jsonpath='):
+        objects = get_objects(kind)
+        if name:
+            print(json.dumps(objects[name]['status']) if name in objects else '', end='')
+        else:
+            selector = get_flag(argv, '-l')
+            for definition in objects.values():
+                if matches(definition, selector):
+                    print('{}\t{}'.format(definition['metadata']['name'], json.dumps(definition['status'])))
+    elif kind and name:
+        objects = get_objects(kind)
+        if name not in objects:
+            print('Error from server (NotFound): {} "{}" not found'.format(kind, name), file=sys.stderr)
+            return 1
+        while '--watch' in argv:
+            print(json.dumps(objects[name]), flush=True)
+            if is_finished(objects[name]):
+                break
+            time.sleep(0.1)
+            objects = get_objects(kind)
+        else:
+            print(json.dumps(objects[name]))
+    elif kind and '--field-selector' not in argv:
+        selector = get_flag(argv, '-l')
+        items = [definition for definition in get_objects(kind).values() if matches(definition, selector)]
+        print(json.dumps({'apiVersion': 'v1', 'kind': 'List', 'items': items}))
+    elif name:
+        print(json.dumps({'kind': argv[1], 'metadata': {'name': name}, 'status': {}}))
+    else:
+        print(json.dumps({'apiVersion': 'v1', 'kind': 'List', 'items': []}))
+    return 0
+
+
+def get_objects(kind):
+    objects = {}
+    for path in get_state_directory().glob('{}-*.json'.format(kind)):
+        state = json.loads(path.read_text())
+        name = path.stem[len(kind) + 1:]
+        objects[name] = {
+            'kind': kind,
+            'metadata': {'name': name, 'labels': state['labels']},
+            'status': get_status(kind, state['created']),
+        }
+    return objects
+
+
+def get_status(kind, created):
+    finished = time.time() - created >= float(os.environ.get('FAKE_KUBECTL_JOB_DURATION', '0'))
+    if kind == 'Job':
+        if finished:
+            completion_time = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            return {'succeeded': 1, 'completionTime': completion_time}
+        return {'active': 1}
+    if finished:
+        state = {'terminated': {'reason': 'Completed', 'exitCode': 0}}
+    else:
+        state = {'running': {}}
+    return {'phase': 'Succeeded' if finished else 'Running', 'containerStatuses': [{'name': 'main', 'state': state}]}
+
+
+def is_finished(definition):
+    status = definition['status']
+    return 'completionTime' in status or status.get('phase') == 'Succeeded'
+
+
+def matches(definition, selector):
+    if not selector:
+        return True
+    key, value = selector.split('=', 1)
+    return definition['metadata']['labels'].get(key) == value
+
+
+def get_items(definition):
+    if definition.get('kind') == 'List':
+        return definition['items']
+    return [definition]
+
+
+def get_flag(argv, flag):
+    if flag in argv:
+        return argv[argv.index(flag) + 1]
+
+
+def get_state_path(kind, name):
+    return get_state_directory() / '{}-{}.json'.format(kind, name)
+
+
+def get_state_directory():
+    return pathlib.Path(os.environ['FAKE_KUBECTL_STATE'])
+
+
+def record(argv, started, stdin, exit_code):
+    entry = json.dumps({
+        'argv': argv,
+        'started': started,
+        'duration': time.time() - started,
+        'stdin_bytes': len(stdin),
+        'exit_code': exit_code,
+    })
+    with open(os.environ['FAKE_KUBECTL_LOG'], 'a') as log_file:
+        log_file.write(entry + '\n')
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Compare serialization used to talk with kubectl and to read definitions.
+
+Usage: python benchmarks/wire_format.py [--repeat N]
+"""
+import argparse
+import json
+import timeit
+
+import yaml
+
+from kubepy import serialization
+
+
+def get_pod_list(pods=200, containers=3):
+    return {
+        'apiVersion': 'v1',
+        'kind': 'List',
+        'items': [
+            {
+                'apiVersion': 'v1',
+                'kind': 'Pod',
+                'metadata': {
+                    'name': 'migrate-{}'.format(pod),
+                    'labels': {'job-name': 'migrate', 'controller-uid': 'uid-{}'.format(pod)},
+                },
+                'status': {
+                    'phase': 'Failed',
+                    'containerStatuses': [
+                        {
+                            'name': 'container-{}'.format(container),
+                            'state': {'terminated': {'reason': 'Error', 'exitCode': 1, 'message': 'x' * 200}},
+                        }
+                        for container in range(containers)
+                    ],
+                },
+            }
+            for pod in range(pods)
+        ],
+    }
+
+
+def get_config_map(keys=200, value_size=2000):
+    return {
+        'apiVersion': 'v1',
+        'kind': 'ConfigMap',
+        'metadata': {'name': 'big-config'},
+        'data': {'key-{}'.format(key): 'v' * value_size for key in range(keys)},
+    }
+
+
+def run_case(name, candidates, repeat):
+    print(name)
+    baseline = None
+    for label, function in candidates:
+        seconds = min(timeit.repeat(function, number=1, repeat=repeat))
+        baseline = baseline or seconds
+        print('  {:<40} {:>9.2f} ms  x{:.1f}'.format(label, seconds * 1000, baseline / seconds))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    pod_list = get_pod_list()
+    pod_list_yaml = yaml.dump(pod_list)
+    pod_list_json = json.dumps(pod_list, indent=4)
+    config_map = get_config_map()
+    config_map_yaml = yaml.dump(config_map)
+    print('libyaml available: {}'.format(yaml.__with_libyaml__))
+    run_case('Parse kubectl get output (pod list)', [
+        ('yaml.safe_load (previous)', lambda: yaml.safe_load(pod_list_yaml)),
+        ('json.loads', lambda: json.loads(pod_list_json)),
+    ], args.repeat)
+    run_case('Serialize definition for kubectl (config map)', [
+        ('yaml.dump (previous)', lambda: yaml.dump(config_map)),
+        ('serialization.dump_json', lambda: serialization.dump_json(config_map)),
+    ], args.repeat)
+    run_case('Parse local definition (config map)', [
+        ('yaml.safe_load (previous)', lambda: yaml.safe_load(config_map_yaml)),
+        ('serialization.load_yaml', lambda: serialization.load_yaml(config_map_yaml)),
+    ], args.repeat)
+    run_case('Show definition (pod list)', [
+        ('yaml.dump (previous)', lambda: yaml.dump(pod_list)),
+        ('serialization.dump_yaml', lambda: serialization.dump_yaml(pod_list)),
+    ], args.repeat)
+
+
+if __name__ == '__main__':
+    main()
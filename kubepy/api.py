@@ -1,14 +1,36 @@
+import codecs
+import functools
+import json
+import math
+import re
 import subprocess
 import sys
+import threading
+import time
 
-import tenacity
-import yaml
+from kubepy import metrics
+from kubepy import serialization
+
+BACKEND_NAMES = ['kubectl', 'http', 'proxy']
+LOG_CHUNK_SIZE = 65536
+STATUSES_TEMPLATE = '{range .items[*]}{.metadata.name}{"\\t"}{.status}{"\\n"}{end}'
+DRY_RUN_OUTPUT_LINE = re.compile(r'^(?P<resource>[^/\s]+)/(?P<name>\S+) (?P<action>\w+)')
 
 
 class ApiError(Exception):
     pass
 
 
+def retry_api_errors(function):
+    @functools.wraps(function)
+    def retrying_function(*args, **kwargs):
+        import tenacity
+        retrying = tenacity.Retrying(reraise=True, retry=tenacity.retry_if_exception_type(ApiError),
+                                     stop=tenacity.stop_after_attempt(3))
+        return retrying(function, *args, **kwargs)
+    return retrying_function
+
+
 def kubectl_command_builder(basic_command, resource=None, name=None, container_name=None,
                             namespace=None, flags=None, with_definition=False):
     command = ['kubectl', basic_command]
@@ -27,67 +49,304 @@ def kubectl_command_builder(basic_command, resource=None, name=None, container_n
     return command
 
 
-@tenacity.retry(reraise=True, retry=tenacity.retry_if_exception_type(ApiError), stop=tenacity.stop_after_attempt(3))
-def get(kind, name=None, namespace=None):
-    command = kubectl_command_builder('get', resource=kind, name=name, namespace=namespace, flags=['-o', 'yaml'])
-    get_process = subprocess.Popen(
-        command, stdout=subprocess.PIPE, stderr=sys.stderr)
-    objects = yaml.safe_load(get_process.stdout)
-    if get_process.wait() != 0:
-        raise ApiError
-    return objects
+class KubectlBackend:
+    @retry_api_errors
+    def get(self, kind, name=None, namespace=None, selector=None):
+        flags = ['-o', 'json']
+        if selector:
+            flags += ['-l', selector]
+        command = kubectl_command_builder('get', resource=kind, name=name, namespace=namespace, flags=flags)
+        get_process = run_kubectl(command, stderr=sys.stderr)
+        if get_process.returncode != 0:
+            raise ApiError
+        return json.loads(get_process.stdout)
+
+    def get_status(self, kind, name, namespace=None):
+        output = self.get_jsonpath(kind, '{.status}', name=name, namespace=namespace)
+        return json.loads(output) if output.strip() else {}
+
+    def get_statuses(self, kind, namespace=None, selector=None):
+        output = self.get_jsonpath(kind, STATUSES_TEMPLATE, namespace=namespace, selector=selector)
+        statuses = {}
+        for line in output.splitlines():
+            name, _, status = line.partition('\t')
+            statuses[name] = json.loads(status) if status.strip() else {}
+        return statuses
+
+    @retry_api_errors
+    def get_jsonpath(self, kind, template, name=None, namespace=None, selector=None):
+        flags = ['-o', 'jsonpath={}'.format(template)]
+        if selector:
+            flags += ['-l', selector]
+        command = kubectl_command_builder('get', resource=kind, name=name, namespace=namespace, flags=flags)
+        get_process = run_kubectl(command, stderr=sys.stderr)
+        if get_process.returncode != 0:
+            raise ApiError
+        return get_process.stdout.decode()
+
+    def get_failed_pod_for_job(self, job_name, namespace=None):
+        command = kubectl_command_builder('get', resource='pod', namespace=namespace,
+                                          flags=['-o', 'json', '--field-selector', 'status.phase=Failed', '-l',
+                                                 'job-name={}'.format(job_name)])
+        get_process = run_kubectl(command, stderr=sys.stderr)
+        if get_process.returncode != 0:
+            raise ApiError
+        return json.loads(get_process.stdout)
+
+    def watch(self, kind, name, namespace=None, timeout=None):
+        flags = ['--watch', '-o', 'json']
+        if timeout is not None:
+            flags += ['--request-timeout', '{}s'.format(get_timeout_seconds(timeout))]
+        command = kubectl_command_builder('get', resource=kind, name=name, namespace=namespace, flags=flags)
+        started = time.perf_counter()
+        watch_process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=sys.stderr)
+        exit_code = None
+        try:
+            yield from iterate_json_stream(watch_process.stdout)
+            exit_code = watch_process.wait()
+            if exit_code != 0:
+                raise ApiError
+        finally:
+            if watch_process.poll() is None:
+                watch_process.terminate()
+                watch_process.wait()
+            metrics.add_api_call('watch', ' '.join(command), time.perf_counter() - started, exit_code,
+                                 bytes_out=None)
+
+    def logs(self, pod_name, container_name=None, namespace=None, limit_bytes=None, tail=None):
+        flags = ['--tail', str(tail)] if tail is not None else None
+        command = kubectl_command_builder('logs', name=pod_name, container_name=container_name, namespace=namespace,
+                                          flags=flags)
+        started = time.perf_counter()
+        import tempfile
+        with tempfile.TemporaryFile() as stderr_file:
+            log_process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file)
+            stdout = read_tail(iter(lambda: log_process.stdout.read1(LOG_CHUNK_SIZE), b''), limit_bytes)
+            exit_code = log_process.wait()
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+        metrics.add_api_call('logs', ' '.join(command), time.perf_counter() - started, exit_code,
+                             bytes_out=len(stdout))
+        if exit_code != 0:
+            raise ApiError
+        return stdout, stderr
+
+    def follow_logs(self, pod_name, container_name=None, namespace=None, since_time=None, timestamps=False):
+        flags = ['--follow']
+        if timestamps:
+            flags.append('--timestamps')
+        if since_time:
+            flags += ['--since-time', since_time]
+        command = kubectl_command_builder('logs', name=pod_name, container_name=container_name, namespace=namespace,
+                                          flags=flags)
+        return KubectlLogStream(command)
+
+    def create(self, definition, namespace=None):
+        command = kubectl_command_builder('create', namespace=namespace, with_definition=True)
+        run_command_with_definition_on_stdin(command, definition)
+
+    def apply(self, definition, namespace=None):
+        command = kubectl_command_builder('apply', namespace=namespace, flags=['--record'], with_definition=True)
+        run_command_with_definition_on_stdin(command, definition)
+
+    def replace(self, definition, namespace=None):
+        command = kubectl_command_builder('replace', namespace=namespace, flags=['--force', '--cascade'],
+                                          with_definition=True)
+        run_command_with_definition_on_stdin(command, definition)
+
+    def rolling_update(self, definition, name, namespace=None):
+        command = kubectl_command_builder('rolling-update', name=name, namespace=namespace, with_definition=True)
+        run_command_with_definition_on_stdin(command, definition)
+
+    def dry_run_apply(self, definition, namespace=None):
+        command = kubectl_command_builder('apply', namespace=namespace, flags=['--dry-run=server'],
+                                          with_definition=True)
+        dry_run_process = run_kubectl(command, input=serialization.dump_json(definition).encode())
+        errors = dry_run_process.stderr.decode(errors='replace').splitlines() if dry_run_process.returncode else []
+        return parse_dry_run_output(dry_run_process.stdout.decode(errors='replace')), errors
+
+    def diff(self, definition, namespace=None):
+        command = kubectl_command_builder('diff', namespace=namespace, with_definition=True)
+        diff_process = run_kubectl(command, input=serialization.dump_json(definition).encode())
+        if diff_process.returncode > 1:
+            raise ApiError(diff_process.stderr)
+        return diff_process.stdout.decode(errors='replace')
+
+    def delete(self, kind, name, namespace=None):
+        command = kubectl_command_builder('delete', resource=kind, name=name, namespace=namespace)
+        if run_kubectl(command, stdout=None, stderr=None).returncode != 0:
+            raise ApiError
+
+    def close(self):
+        pass
+
+
+class KubectlLogStream:
+    def __init__(self, command):
+        self.command = command
+        self.process = None
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def __iter__(self):
+        command = self.command
+        with self.lock:
+            if self.closed:
+                return
+            self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        started = time.perf_counter()
+        exit_code = None
+        try:
+            yield from self.process.stdout
+            exit_code = self.process.wait()
+            if exit_code != 0 and not self.closed:
+                raise ApiError(self.process.stderr.read())
+        finally:
+            self.close()
+            self.process.wait()
+            metrics.add_api_call('logs', ' '.join(command), time.perf_counter() - started, exit_code,
+                                 bytes_out=None)
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            if self.process is not None and self.process.poll() is None:
+                self.process.terminate()
+
+
+def run_command_with_definition_on_stdin(command, definition):
+    create_process = run_kubectl(command, input=serialization.dump_json(definition).encode(), stdout=None)
+    if create_process.returncode != 0:
+        raise ApiError(create_process.stderr)
+
+
+def run_kubectl(command, input=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE):
+    started = time.perf_counter()
+    process = subprocess.run(command, input=input, stdout=stdout, stderr=stderr)
+    metrics.add_api_call(command[1], ' '.join(command), time.perf_counter() - started, process.returncode,
+                         bytes_in=len(input or b''), bytes_out=len(process.stdout or b''))
+    return process
+
+
+def parse_dry_run_output(output):
+    actions = {}
+    for line in output.splitlines():
+        match = DRY_RUN_OUTPUT_LINE.match(line)
+        if match:
+            kind = match['resource'].split('.')[0]
+            actions[kind, match['name']] = match['action']
+    return actions
+
+
+def get_timeout_seconds(timeout):
+    return max(math.ceil(timeout), 1)
+
+
+def read_tail(chunks, limit_bytes=None):
+    tail = bytearray()
+    for chunk in chunks:
+        tail += chunk
+        if limit_bytes is not None and len(tail) > limit_bytes:
+            del tail[:len(tail) - limit_bytes]
+    return bytes(tail)
+
+
+def iterate_json_stream(stream, chunk_size=65536):
+    json_decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    while True:
+        chunk = stream.read1(chunk_size)
+        buffer = (buffer + text_decoder.decode(chunk, final=not chunk)).lstrip()
+        while buffer:
+            try:
+                value, end = json_decoder.raw_decode(buffer)
+            except ValueError:
+                break
+            yield value
+            buffer = buffer[end:].lstrip()
+        if not chunk:
+            break
+
+
+backend = KubectlBackend()
+
+
+def create_backend(name, force_conflicts=False):
+    if name == 'kubectl':
+        return KubectlBackend()
+    elif name == 'http':
+        from kubepy import http_api
+        return http_api.HttpBackend.from_kubeconfig(force_conflicts=force_conflicts)
+    elif name == 'proxy':
+        from kubepy import http_api
+        return http_api.KubectlProxyBackend.start(force_conflicts=force_conflicts)
+    else:
+        raise ApiError('Unknown backend: {}'.format(name))
+
+
+def use_backend(new_backend):
+    global backend
+    backend = new_backend
+
+
+def close_backend():
+    backend.close()
+
+
+def get(kind, name=None, namespace=None, selector=None):
+    return backend.get(kind, name=name, namespace=namespace, selector=selector)
+
+
+def get_status(kind, name, namespace=None):
+    return backend.get_status(kind, name, namespace=namespace)
+
+
+def get_statuses(kind, namespace=None, selector=None):
+    return backend.get_statuses(kind, namespace=namespace, selector=selector)
 
 
 def get_failed_pod_for_job(job_name, namespace=None):
-    command = kubectl_command_builder('get', resource='pod', namespace=namespace,
-                                      flags=['-o', 'yaml', '--field-selector', 'status.phase=Failed', '-l',
-                                             'job-name={}'.format(job_name)])
-    get_process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=sys.stderr)
-    objects = yaml.safe_load(get_process.stdout)
-    if get_process.wait() != 0:
-        raise ApiError
-    return objects
-
-
-def logs(pod_name, container_name=None, namespace=None):
-    command = kubectl_command_builder('logs', name=pod_name, container_name=container_name, namespace=namespace)
-    log_process = subprocess.Popen(
-        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout, stderr = log_process.communicate()
-    if log_process.returncode != 0:
-        raise ApiError
-    return stdout, stderr
+    return backend.get_failed_pod_for_job(job_name, namespace=namespace)
+
+
+def watch(kind, name, namespace=None, timeout=None):
+    return backend.watch(kind, name, namespace=namespace, timeout=timeout)
+
+
+def logs(pod_name, container_name=None, namespace=None, limit_bytes=None, tail=None):
+    return backend.logs(pod_name, container_name=container_name, namespace=namespace, limit_bytes=limit_bytes,
+                        tail=tail)
+
+
+def follow_logs(pod_name, container_name=None, namespace=None, since_time=None, timestamps=False):
+    return backend.follow_logs(pod_name, container_name=container_name, namespace=namespace, since_time=since_time,
+                               timestamps=timestamps)
 
 
 def create(definition, namespace=None):
-    command = kubectl_command_builder('create', namespace=namespace, with_definition=True)
-    run_command_with_yaml_on_stdin(command, definition)
+    backend.create(definition, namespace=namespace)
 
 
 def apply(definition, namespace=None):
-    command = kubectl_command_builder('apply', namespace=namespace, flags=['--record'], with_definition=True)
-    run_command_with_yaml_on_stdin(command, definition)
+    backend.apply(definition, namespace=namespace)
 
 
 def replace(definition, namespace=None):
-    command = kubectl_command_builder('replace', namespace=namespace, flags=['--force', '--cascade'],
-                                      with_definition=True)
-    run_command_with_yaml_on_stdin(command, definition)
+    backend.replace(definition, namespace=namespace)
 
 
 def rolling_update(definition, name, namespace=None):
-    command = kubectl_command_builder('rolling-update', name=name, namespace=namespace, with_definition=True)
-    run_command_with_yaml_on_stdin(command, definition)
+    backend.rolling_update(definition, name, namespace=namespace)
 
 
 def delete(kind, name, namespace=None):
-    command = kubectl_command_builder('delete', resource=kind, name=name, namespace=namespace)
-    subprocess.check_call(command)
+    backend.delete(kind, name, namespace=namespace)
+
+
+def dry_run_apply(definition, namespace=None):
+    return backend.dry_run_apply(definition, namespace=namespace)
 
 
-def run_command_with_yaml_on_stdin(command, definition):
-    create_process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout, stderr = create_process.communicate(yaml.dump(definition).encode())
-    create_process.stdin.close()
-    if create_process.wait() != 0:
-        raise ApiError(stderr)
+def diff(definition, namespace=None):
+    return backend.diff(definition, namespace=namespace)
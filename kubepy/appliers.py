@@ -1,14 +1,27 @@
 import collections
-import copy
+import contextlib
+import functools
 import logging
+import random
+import sys
+import threading
 import time
+import uuid
 
 from kubepy import api
+from kubepy import definition_hashes
 from kubepy import definition_manager
 from kubepy import definition_transformers
+from kubepy import metrics
+from kubepy import pipeline
+from kubepy import scheduler
 
 logger = logging.getLogger(__name__)
 
+LOG_FOLLOWER_STOP_TIMEOUT = 5
+LOG_FOLLOW_ATTEMPTS = 3
+APPLIER_ENTRY_POINT_GROUP = 'kubepy.appliers'
+
 
 class InstallError(Exception):
     pass
@@ -30,8 +43,12 @@ class DeadlineExceeded(JobError):
     pass
 
 
+class WaitTimeout(JobError):
+    pass
+
+
 def directory_applier(path, options):
-    manager = definition_manager.DefinitionManager(path)
+    manager = definition_manager.DefinitionManager(path, cache=get_definition_cache(options))
     return DefinitionsApplier(manager, options)
 
 
@@ -39,23 +56,69 @@ DirectoryApplier = directory_applier
 
 
 def directories_applier(paths, options):
-    manager = definition_manager.OverridenDefinitionManager(
-        *(definition_manager.DefinitionManager(path) for path in paths),
-    )
-    return DefinitionsApplier(manager, options)
+    return DefinitionsApplier(directories_manager(paths, options), options)
 
 
 DirectoriesApplier = directories_applier
 
 
+def directories_manager(paths, options):
+    cache = get_definition_cache(options)
+    return definition_manager.OverridenDefinitionManager(
+        *(definition_manager.DefinitionManager(path, cache=cache) for path in paths),
+        cache=cache,
+    )
+
+
+def get_definition_cache(options):
+    if options.cache_dir:
+        from kubepy import definition_cache
+        return definition_cache.DefinitionCache(options.cache_dir, options.cache_max_size * 1024 * 1024)
+
+
 class DefinitionsApplier:
     def __init__(self, manager, options):
         self.options = options
         self.manager = manager
 
     def apply_all(self):
-        for definition in self.manager.values():
-            UniversalDefinitionApplier(definition, self.options).apply()
+        if self.options.render_processes:
+            self.apply_names(list(self.manager))
+        else:
+            self.apply_definitions(self.manager.values())
+
+    def apply_names(self, names):
+        processes = min(self.options.render_processes or 1, len(names))
+        if processes > 1:
+            appliers = get_rendered_appliers(self.manager, self.options, names, processes)
+            with contextlib.closing(appliers):
+                self.apply_appliers(appliers)
+        else:
+            self.apply_definitions(self.manager[name] for name in names)
+
+    def apply_definitions(self, definitions):
+        appliers = self.get_appliers(definitions)
+        if self.options.prefetch:
+            appliers = pipeline.prefetch(render_appliers(appliers), self.options.prefetch)
+        with contextlib.closing(appliers):
+            self.apply_appliers(appliers)
+
+    def apply_appliers(self, appliers):
+        if self.options.skip_unchanged:
+            appliers = skip_unchanged(list(appliers))
+        if self.options.parallelism:
+            apply_scheduled(appliers, self.options)
+        else:
+            if self.options.concurrent_jobs:
+                appliers = group_consecutive_jobs(appliers)
+            if self.options.batch:
+                apply_in_batches(appliers)
+            else:
+                for applier in appliers:
+                    applier.apply()
+
+    def get_appliers(self, definitions):
+        return (UniversalDefinitionApplier(definition, self.options).get_applier() for definition in definitions)
 
     def apply_named(self, name):
         definition = self.manager[name]
@@ -67,10 +130,14 @@ class DefinitionsApplier:
 
 
 class BaseDefinitionApplier:
-    def __init__(self, definition, options, namespace=None):
+    batchable = False
+    skippable = False
+
+    def __init__(self, definition, options, namespace=None, rendered_definition=None):
         self.definition = definition
         self.options = options
         self.namespace = namespace
+        self.rendered_definition = rendered_definition
 
     def apply(self):
         raise NotImplementedError
@@ -79,8 +146,13 @@ class BaseDefinitionApplier:
     def usable_with(self):
         raise NotImplementedError
 
-    @property
+    @functools.cached_property
     def new_definition(self):
+        if self.rendered_definition is not None:
+            return self.rendered_definition
+        return self.render()
+
+    def render(self):
         raise NotImplementedError
 
 
@@ -90,22 +162,51 @@ class ResourceApplier(BaseDefinitionApplier):
                    'PersistentVolumeClaim', 'Ingress', 'PodDisruptionBudget', 'ServiceAccount', 'Role', 'RoleBinding',
                    'HorizontalPodAutoscaler',
                    *custom_resource_definitions]
+    batchable = True
+    skippable = True
 
     def apply(self):
         try:
-            api.apply(self.definition, namespace=self.namespace)
+            api.apply(self.new_definition, namespace=self.namespace)
         except api.ApiError as e:
-            for crd in self.custom_resource_definitions:
-                if 'no matches for kind "{}"'.format(crd) in str(e):
-                    logger.warning('Custom Resource named "{}" not found! '
-                                   'Please install it first, skipping for now.'.format(crd))
-                    break
-            else:
-                raise
+            skip_missing_custom_resources(e)
+
+    def render(self):
+        return finalize_definition(self.definition, self.options)
+
+
+def skip_missing_custom_resources(error):
+    missing_resources = []
+    for line in get_error_lines(error):
+        for crd in ResourceApplier.custom_resource_definitions:
+            if 'no matches for kind "{}"'.format(crd) in line:
+                missing_resources.append(crd)
+                break
+        else:
+            if line.lower().startswith('error'):
+                raise error
+    if not missing_resources:
+        raise error
+    for crd in missing_resources:
+        logger.warning('Custom Resource named "{}" not found! '
+                       'Please install it first, skipping for now.'.format(crd))
+    return missing_resources
+
+
+def get_error_lines(error):
+    message = error.args[0] if error.args else ''
+    if isinstance(message, bytes):
+        message = message.decode(errors='replace')
+    return str(message).splitlines()
 
 
 class ReplicatedTemplateResourceApplier(BaseDefinitionApplier):
     usable_with = ['Deployment', 'StatefulSet']
+    skippable = True
+
+    @property
+    def batchable(self):
+        return not self.options.replace
 
     def apply(self):
         if self.options.replace:
@@ -113,44 +214,218 @@ class ReplicatedTemplateResourceApplier(BaseDefinitionApplier):
         else:
             api.apply(self.new_definition, namespace=self.namespace)
 
-    @property
-    def new_definition(self):
-        return transform_pod_definition(self.definition, self.options)
+    def render(self):
+        return finalize_definition(transform_pod_definition(self.definition, self.options), self.options)
 
 
 class CronJobApplier(BaseDefinitionApplier):
     usable_with = ['CronJob']
+    batchable = True
+    skippable = True
 
     def apply(self):
         api.apply(self.new_definition, namespace=self.namespace)
 
-    @property
-    def new_definition(self):
-        return transform_pod_definition(self.definition, self.options)
+    def render(self):
+        return finalize_definition(transform_pod_definition(self.definition, self.options), self.options)
+
+
+def get_rendered_appliers(manager, options, names, processes):
+    for definition, new_definition in render_in_processes(manager, options, names, processes, render_named_definition):
+        yield UniversalDefinitionApplier(definition, options, rendered_definition=new_definition).get_applier()
+
+
+def render_named_definition(definitions_applier, name):
+    definition = definitions_applier.manager[name]
+    return definition, UniversalDefinitionApplier(definition, definitions_applier.options).new_definition
+
+
+def render_in_processes(manager, options, names, processes, render):
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes, initializer=initialize_render_worker,
+                                                initargs=(manager, options)) as executor:
+        chunk_size = max(1, len(names) // (processes * 4))
+        yield from executor.map(functools.partial(render_with_worker_applier, render), names, chunksize=chunk_size)
+
+
+render_worker_applier = None
+
+
+def initialize_render_worker(manager, options):
+    global render_worker_applier
+    render_worker_applier = DefinitionsApplier(manager, options)
+
+
+def render_with_worker_applier(render, name):
+    return render(render_worker_applier, name)
+
+
+def render_appliers(appliers):
+    for applier in appliers:
+        applier.new_definition
+        yield applier
+
+
+def skip_unchanged(appliers):
+    namespaced_kinds = collections.defaultdict(set)
+    for applier in appliers:
+        if applier.skippable:
+            namespaced_kinds[applier.namespace].add(applier.definition['kind'])
+    live_hashes = {
+        namespace: definition_hashes.get_live_hashes(kinds, namespace=namespace)
+        for namespace, kinds in namespaced_kinds.items()
+    }
+    for applier in appliers:
+        if applier.skippable:
+            key = (applier.definition['kind'], applier.definition['metadata']['name'])
+            current_hash = definition_hashes.read_definition_hash(applier.new_definition)
+            if live_hashes[applier.namespace].get(key) == current_hash:
+                logger.info('Skipping unchanged {} {}.'.format(*key))
+                continue
+        yield applier
+
+
+def apply_in_batches(appliers):
+    batch = []
+    for applier in appliers:
+        if applier.batchable:
+            batch.append(applier)
+        else:
+            if batch:
+                BatchApplier(batch).apply()
+                batch = []
+            applier.apply()
+    if batch:
+        BatchApplier(batch).apply()
+
+
+def apply_scheduled(appliers, options):
+    for stage in scheduler.get_stages(appliers, lambda applier: applier.definition):
+        if options.batch:
+            batch = [applier for applier in stage if applier.batchable]
+            stage = [applier for applier in stage if not applier.batchable]
+            if batch:
+                stage.append(BatchApplier(batch))
+        if options.concurrent_jobs:
+            jobs = [applier for applier in stage if isinstance(applier, BaseJobApplier)]
+            stage = [applier for applier in stage if not isinstance(applier, BaseJobApplier)]
+            if jobs:
+                stage.append(JobGroupApplier(jobs))
+        scheduler.run_concurrently([applier.apply for applier in stage], options.parallelism)
+
+
+class BatchApplier:
+    def __init__(self, appliers):
+        self.appliers = appliers
+
+    def apply(self):
+        for namespace, definitions in self.get_namespaced_definitions().items():
+            apply_list(definitions, namespace)
+
+    def get_namespaced_definitions(self):
+        namespaced_definitions = collections.defaultdict(list)
+        for applier in self.appliers:
+            namespaced_definitions[applier.namespace].append(applier.new_definition)
+        return dict(namespaced_definitions)
+
+
+def apply_list(definitions, namespace=None):
+    while definitions:
+        try:
+            api.apply(list_definition(definitions), namespace=namespace)
+            return
+        except api.ApiError as e:
+            missing_resources = skip_missing_custom_resources(e)
+        remaining = [definition for definition in definitions if definition['kind'] not in missing_resources]
+        if len(remaining) == len(definitions):
+            return
+        definitions = remaining
+
+
+def list_definition(definitions):
+    return {'apiVersion': 'v1', 'kind': 'List', 'items': list(definitions)}
 
 
 class BaseJobApplier(BaseDefinitionApplier):
     def apply(self):
-        api.create(self.new_definition, namespace=self.namespace)
+        self.start()
         try:
-            while True:
-                status = self._get_status()
-                status.raise_if_failed()
-                if status.succeeded:
-                    break
+            with metrics.measure('wait'), self.following_logs():
+                if self.options.watch:
+                    self.wait_with_watch()
                 else:
-                    time.sleep(1)
+                    self.wait_with_polling()
         finally:
-            api.delete(self.definition_type, self.name, namespace=self.namespace)
+            self.cleanup()
+
+    @contextlib.contextmanager
+    def following_logs(self):
+        if not self.options.follow_logs:
+            yield
+            return
+        follower = LogFollower(self, self.options.log_file)
+        follower.start()
+        try:
+            yield
+        finally:
+            follower.stop()
+
+    def get_pods(self):
+        raise NotImplementedError
+
+    @property
+    def log_parallelism(self):
+        return 1
+
+    def start(self, labels=None):
+        definition = self.new_definition
+        if labels:
+            definition = definition_transformers.DefinitionTransformer(labels=labels)(definition)
+        api.create(definition, namespace=self.namespace)
+
+    def cleanup(self):
+        api.delete(self.definition_type, self.name, namespace=self.namespace)
+
+    def wait_with_polling(self):
+        backoff = PollingBackoff.from_options(self.options, '{} {}'.format(self.definition_type, self.name))
+        while True:
+            raw_status = self._get_raw_status()
+            status = self._create_status(raw_status)
+            status.raise_if_failed()
+            if status.succeeded:
+                break
+            else:
+                backoff.wait(raw_status)
+
+    def wait_with_watch(self):
+        backoff = PollingBackoff.from_options(self.options, '{} {}'.format(self.definition_type, self.name))
+        while True:
+            states = api.watch(self.definition_type, self.name, namespace=self.namespace,
+                               timeout=backoff.get_remaining())
+            try:
+                with contextlib.closing(states):
+                    for definition in states:
+                        status = self._create_status(definition.get('status', {}))
+                        status.raise_if_failed()
+                        if status.succeeded:
+                            return
+                        backoff.raise_if_timed_out()
+            except api.ApiError:
+                backoff.raise_if_timed_out()
+                raise
+            backoff.wait()
 
     def _get_status(self):
-        return self.status_class(self.name, self._get_raw_status())
+        return self._create_status(self._get_raw_status())
+
+    def _create_status(self, raw_status):
+        return self.status_class(self.name, raw_status, namespace=self.namespace,
+                                 log_limit_bytes=self.options.log_limit_bytes, log_tail=self.options.log_tail)
 
     def _get_raw_status(self):
-        return api.get(self.definition_type, self.name, namespace=self.namespace)['status']
+        return api.get_status(self.definition_type, self.name, namespace=self.namespace)
 
-    @property
-    def new_definition(self):
+    def render(self):
         return transform_pod_definition(self.definition, self.options)
 
     @property
@@ -166,11 +441,204 @@ class BaseJobApplier(BaseDefinitionApplier):
         raise NotImplementedError
 
 
+class PollingBackoff:
+    def __init__(self, min_interval=1, max_interval=1, deadline=None, name='job'):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.interval = min_interval
+        self.deadline = deadline
+        self.name = name
+        self.previous_state = None
+
+    @classmethod
+    def from_options(cls, options, name):
+        deadlines = []
+        if options.timeout is not None:
+            deadlines.append(options.start_time + options.timeout)
+        if options.job_timeout is not None:
+            deadlines.append(time.monotonic() + options.job_timeout)
+        max_interval = options.max_poll_interval or options.poll_interval
+        return cls(options.poll_interval, max_interval, min(deadlines, default=None), name)
+
+    def wait(self, state=None):
+        self.raise_if_timed_out()
+        time.sleep(self.get_delay(state))
+        self.raise_if_timed_out()
+
+    def get_delay(self, state=None):
+        if state != self.previous_state:
+            self.interval = self.min_interval
+            self.previous_state = state
+        delay = random.uniform(self.min_interval, self.interval)
+        if self.deadline is not None:
+            delay = min(delay, max(self.deadline - time.monotonic(), 0))
+        self.interval = min(self.interval * 2, self.max_interval)
+        return delay
+
+    def get_remaining(self):
+        if self.deadline is not None:
+            return max(self.deadline - time.monotonic(), 0)
+
+    def raise_if_timed_out(self):
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise WaitTimeout('Timed out waiting for {}.'.format(self.name))
+
+
+class LogFollower:
+    def __init__(self, applier, log_file=None):
+        self.applier = applier
+        self.log_file = log_file
+        self.stopped = threading.Event()
+        self.changed = threading.Event()
+        self.lock = threading.Lock()
+        self.output_lock = threading.Lock()
+        self.streams = {}
+        self.threads = []
+        self.finished = set()
+        self.failures = collections.Counter()
+        self.pending_pods = set()
+        self.last_timestamps = {}
+        self.thread = threading.Thread(target=self.follow, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.changed.set()
+        with self.lock:
+            streams = list(self.streams.values())
+        for stream in streams:
+            stream.close()
+        self.thread.join(LOG_FOLLOWER_STOP_TIMEOUT)
+
+    def follow(self):
+        options = self.applier.options
+        backoff = PollingBackoff(options.poll_interval, options.max_poll_interval or options.poll_interval)
+        with open_log_output(self.log_file) as output:
+            while not self.stopped.is_set():
+                self.changed.clear()
+                timeout = None
+                if self.is_listing_needed():
+                    self.follow_new_containers(output)
+                    timeout = backoff.get_delay(self.get_state())
+                self.changed.wait(timeout)
+            for thread in self.threads:
+                thread.join(LOG_FOLLOWER_STOP_TIMEOUT)
+
+    def is_listing_needed(self):
+        with self.lock:
+            followed_pods = {pod_name for pod_name, _ in self.streams}
+        return bool(self.pending_pods) or len(followed_pods) < self.applier.log_parallelism
+
+    def get_state(self):
+        with self.lock:
+            return frozenset(self.streams), frozenset(self.finished), frozenset(self.pending_pods)
+
+    def follow_new_containers(self, output):
+        try:
+            pods = self.applier.get_pods()
+        except api.ApiError:
+            return
+        self.pending_pods = set()
+        for pod in pods:
+            pod_name = pod['metadata']['name']
+            container_names = get_container_names(pod)
+            started_container_names = get_started_container_names(pod)
+            for container_name in container_names:
+                key = pod_name, container_name
+                if key in self.finished or key in self.streams:
+                    continue
+                elif container_name not in started_container_names:
+                    if pod.get('status', {}).get('phase') not in ('Succeeded', 'Failed'):
+                        self.pending_pods.add(pod_name)
+                    continue
+                if len(container_names) == 1:
+                    prefix = '[{}] '.format(pod_name)
+                else:
+                    prefix = '[{}/{}] '.format(pod_name, container_name)
+                with self.lock:
+                    self.streams[key] = None
+                thread = threading.Thread(target=self.follow_container_until_end,
+                                          args=(pod_name, container_name, prefix.encode(), output), daemon=True)
+                self.threads.append(thread)
+                thread.start()
+
+    def follow_container_until_end(self, pod_name, container_name, prefix, output):
+        key = pod_name, container_name
+        try:
+            if self.follow_container(pod_name, container_name, prefix, output):
+                self.finished.add(key)
+            else:
+                self.failures[key] += 1
+                if self.failures[key] >= LOG_FOLLOW_ATTEMPTS:
+                    logger.warning('Stopped following logs of {} container in {} pod.'.format(container_name,
+                                                                                              pod_name))
+                    self.finished.add(key)
+        finally:
+            with self.lock:
+                del self.streams[key]
+            self.changed.set()
+
+    def follow_container(self, pod_name, container_name, prefix, output):
+        key = pod_name, container_name
+        last_timestamp = self.last_timestamps.get(key)
+        lines = api.follow_logs(pod_name, container_name=container_name, namespace=self.applier.namespace,
+                                since_time=last_timestamp, timestamps=True)
+        with self.lock:
+            self.streams[key] = lines
+        if self.stopped.is_set():
+            lines.close()
+        try:
+            for line in lines:
+                timestamp, _, message = line.partition(b' ')
+                timestamp = timestamp.decode(errors='replace')
+                if last_timestamp and get_timestamp_key(timestamp) <= get_timestamp_key(last_timestamp):
+                    continue
+                with self.output_lock:
+                    output.write(prefix + message)
+                    output.flush()
+                last_timestamp = self.last_timestamps[key] = timestamp
+        except api.ApiError:
+            return False
+        return True
+
+
+def get_container_names(pod):
+    spec = pod['spec']
+    return [container['name'] for container in spec.get('initContainers', []) + spec['containers']]
+
+
+def get_started_container_names(pod):
+    status = pod.get('status', {})
+    return {
+        container_status['name']
+        for container_status in status.get('initContainerStatuses', []) + status.get('containerStatuses', [])
+        if 'running' in container_status.get('state', {}) or 'terminated' in container_status.get('state', {})
+    }
+
+
+def get_timestamp_key(timestamp):
+    seconds, _, fraction = timestamp.rstrip('Z').partition('.')
+    return seconds, fraction.ljust(9, '0')
+
+
+@contextlib.contextmanager
+def open_log_output(log_file):
+    if log_file:
+        with open(log_file, 'ab') as output:
+            yield output
+    else:
+        yield sys.stdout.buffer
+
+
 class BaseJobStatus:
-    def __init__(self, definition_name, status, namespace=None):
+    def __init__(self, definition_name, status, namespace=None, log_limit_bytes=None, log_tail=None):
         self.definition_name = definition_name
         self.status = status
         self.namespace = namespace
+        self.log_limit_bytes = log_limit_bytes
+        self.log_tail = log_tail
 
     def raise_if_failed(self):
         raise NotImplementedError
@@ -180,9 +648,9 @@ class BaseJobStatus:
 
 
 class JobStatus(BaseJobStatus):
-    def __init__(self, definition_name, status, max_retires=0, namespace=None):
-        super().__init__(definition_name, status, namespace)
-        self.max_retries = max_retires
+    def __init__(self, definition_name, status, max_retires=0, namespace=None, log_limit_bytes=None, log_tail=None):
+        super().__init__(definition_name, status, namespace, log_limit_bytes=log_limit_bytes, log_tail=log_tail)
+        self.max_retries = max_retires or 0
 
     def raise_if_failed(self):
         if 'conditions' in self.status:
@@ -206,7 +674,13 @@ class JobStatus(BaseJobStatus):
                 return 'Container failed! ' + str(container_status['state']['terminated']['message'])
         name = failed_pod['metadata']['name']
         namespace = failed_pod['metadata'].get('namespace')
-        return api.logs(name, namespace=namespace)[0].decode()
+        container_names = get_container_names(failed_pod)
+        logs = get_container_logs(name, container_names, namespace=namespace, limit_bytes=self.log_limit_bytes,
+                                  tail=self.log_tail)
+        if len(logs) == 1:
+            return logs[container_names[0]].decode(errors='replace')
+        return ''.join('==> {} <==\n{}\n'.format(container_name, log.decode(errors='replace'))
+                       for container_name, log in logs.items())
 
     def _raise_for_failed_condition(self, condition):
         if condition['reason'] == 'DeadlineExceeded':
@@ -228,6 +702,23 @@ class JobStatus(BaseJobStatus):
         return pods[0]
 
 
+def get_container_logs(pod_name, container_names, namespace=None, limit_bytes=None, tail=None):
+    import concurrent.futures
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(len(container_names), 1)) as executor:
+        futures = {
+            container_name: executor.submit(get_container_log, pod_name, container_name, namespace, limit_bytes, tail)
+            for container_name in container_names
+        }
+    return {container_name: future.result() for container_name, future in futures.items()}
+
+
+def get_container_log(pod_name, container_name, namespace, limit_bytes, tail):
+    try:
+        return api.logs(pod_name, container_name, namespace=namespace, limit_bytes=limit_bytes, tail=tail)[0]
+    except api.ApiError:
+        return 'Cannot read logs of {} container.'.format(container_name).encode()
+
+
 ContainerInfo = collections.namedtuple('ContainerInfo', ['name', 'state'])
 
 
@@ -240,7 +731,10 @@ class PodStatus(BaseJobStatus):
 
     @property
     def succeeded(self):
-        for container in self.containers:
+        containers = list(self.containers)
+        if not containers:
+            return False
+        for container in containers:
             terminated = 'terminated' in container.state
             completed = terminated and container.state['terminated']['reason'] == 'Completed'
             if not completed:
@@ -250,11 +744,12 @@ class PodStatus(BaseJobStatus):
 
     @property
     def containers(self):
-        for container_status in self.status['containerStatuses']:
+        for container_status in self.status.get('containerStatuses', []):
             yield ContainerInfo(container_status['name'], container_status['state'])
 
     def raise_with_log(self, container_name):
-        stdout, stderr = api.logs(self.definition_name, container_name)
+        stdout, stderr = api.logs(self.definition_name, container_name, namespace=self.namespace,
+                                  limit_bytes=self.log_limit_bytes, tail=self.log_tail)
         raise PodError('Failure in {}'.format(container_name), container_name, stdout, stderr)
 
 
@@ -263,9 +758,18 @@ class JobApplier(BaseJobApplier):
     usable_with = [definition_type]
     status_class = JobStatus
 
-    def _get_status(self):
-        return self.status_class(self.name, self._get_raw_status(), self.options.max_job_retries,
-                                 namespace=self.namespace)
+    def _create_status(self, raw_status):
+        return self.status_class(self.name, raw_status, self.options.max_job_retries, namespace=self.namespace,
+                                 log_limit_bytes=self.options.log_limit_bytes, log_tail=self.options.log_tail)
+
+    def get_pods(self):
+        pods = api.get('Pod', namespace=self.namespace, selector='job-name={}'.format(self.name))['items']
+        pods.sort(key=lambda pod: pod['metadata'].get('creationTimestamp', ''))
+        return pods
+
+    @property
+    def log_parallelism(self):
+        return self.definition.get('spec', {}).get('parallelism') or 1
 
 
 class PodApplier(BaseJobApplier):
@@ -273,10 +777,84 @@ class PodApplier(BaseJobApplier):
     usable_with = [definition_type]
     status_class = PodStatus
 
-    def apply(self):
+    def start(self, labels=None):
         if self.definition['spec']['restartPolicy'] != 'Never':
             raise JobError('Pod has to have restartPolicy = Never')
-        super().apply()
+        super().start(labels)
+
+    def get_pods(self):
+        return [api.get('Pod', self.name, namespace=self.namespace)]
+
+
+def group_consecutive_jobs(appliers):
+    jobs = []
+    for applier in appliers:
+        if isinstance(applier, BaseJobApplier):
+            jobs.append(applier)
+        else:
+            if jobs:
+                yield JobGroupApplier(jobs)
+                jobs = []
+            yield applier
+    if jobs:
+        yield JobGroupApplier(jobs)
+
+
+class JobGroupApplier:
+    batchable = False
+    run_label = 'kubepy/run'
+
+    def __init__(self, appliers):
+        self.appliers = appliers
+        self.run_id = uuid.uuid4().hex
+
+    def apply(self):
+        started = []
+        try:
+            for applier in self.appliers:
+                applier.start(labels={self.run_label: self.run_id})
+                started.append(applier)
+            with metrics.measure('wait'), contextlib.ExitStack() as stack:
+                for applier in started:
+                    stack.enter_context(applier.following_logs())
+                self.wait()
+        finally:
+            for applier in started:
+                try:
+                    applier.cleanup()
+                except api.ApiError:
+                    logger.warning('Cannot delete {} {}.'.format(applier.definition_type, applier.name))
+
+    def wait(self):
+        pending = list(self.appliers)
+        backoff = PollingBackoff.from_options(self.appliers[0].options, ', '.join(self.get_names()))
+        while True:
+            all_states = {}
+            for (definition_type, namespace), appliers in self.get_groups(pending).items():
+                states = self.get_raw_statuses(definition_type, namespace)
+                all_states[definition_type, namespace] = states
+                for applier in appliers:
+                    status = applier._create_status(states.get(applier.name, {}))
+                    status.raise_if_failed()
+                    if status.succeeded:
+                        pending.remove(applier)
+            if pending:
+                backoff.wait(all_states)
+            else:
+                break
+
+    def get_names(self):
+        return ['{} {}'.format(applier.definition_type, applier.name) for applier in self.appliers]
+
+    def get_groups(self, appliers):
+        groups = collections.defaultdict(list)
+        for applier in appliers:
+            groups[applier.definition_type, applier.namespace].append(applier)
+        return dict(groups)
+
+    def get_raw_statuses(self, definition_type, namespace):
+        selector = '{}={}'.format(self.run_label, self.run_id)
+        return api.get_statuses(definition_type, namespace=namespace, selector=selector)
 
 
 class UniversalDefinitionApplier(BaseDefinitionApplier):
@@ -288,11 +866,7 @@ class UniversalDefinitionApplier(BaseDefinitionApplier):
 
     @property
     def kind_map(self):
-        kind_map = UniqueDict()
-        for applier_class in self.applier_classes:
-            for kind in applier_class.usable_with:
-                kind_map[kind] = applier_class
-        return dict(kind_map)
+        return dict(registry.kind_map)
 
     @property
     def new_definition(self):
@@ -305,11 +879,52 @@ class UniversalDefinitionApplier(BaseDefinitionApplier):
             raise InstallError('Cannot find resource kind in definition: {}'.format(self.definition))
         namespace = self.definition['metadata'].get('namespace')
         try:
-            applier_class = self.kind_map[kind]
+            applier_class = registry.get(kind)
         except KeyError:
             raise InstallError('Unknown resource kind: {}'.format(kind))
         else:
-            return applier_class(self.definition, self.options, namespace=namespace)
+            return applier_class(self.definition, self.options, namespace=namespace,
+                                 rendered_definition=self.rendered_definition)
+
+
+class ApplierRegistry:
+    def __init__(self, applier_classes, entry_point_group=None):
+        self.kind_map = UniqueDict()
+        for applier_class in applier_classes:
+            for kind in applier_class.usable_with:
+                self.kind_map[kind] = applier_class
+        self.entry_point_group = entry_point_group
+        self.entry_points = None
+        self.lock = threading.Lock()
+
+    def get(self, kind):
+        try:
+            return self.kind_map[kind]
+        except KeyError:
+            pass
+        with self.lock:
+            if kind not in self.kind_map:
+                entry_point = self.get_entry_points().get(kind)
+                if entry_point is None:
+                    raise KeyError(kind)
+                self.kind_map[kind] = entry_point.load()
+            return self.kind_map[kind]
+
+    def get_entry_points(self):
+        if self.entry_points is None:
+            self.entry_points = {}
+            if self.entry_point_group:
+                for entry_point in get_entry_points(self.entry_point_group):
+                    self.entry_points.setdefault(entry_point.name, entry_point)
+        return self.entry_points
+
+
+def get_entry_points(group):
+    import importlib.metadata
+    entry_points = importlib.metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return entry_points.select(group=group)
+    return entry_points.get(group, [])
 
 
 class UniqueDictException(Exception):
@@ -324,12 +939,16 @@ class UniqueDict(dict):
             raise UniqueDictException(key)
 
 
+registry = ApplierRegistry(UniversalDefinitionApplier.applier_classes, APPLIER_ENTRY_POINT_GROUP)
+
+
 def transform_pod_definition(definition, options):
-    new_definition = copy.deepcopy(definition)
-    new_definition = definition_transformers.tag_untaged_images(new_definition, options.build_tag)
-    new_definition = definition_transformers.set_environment(new_definition, options.environment)
-    new_definition = definition_transformers.add_host_volumes(new_definition, options.host_volumes)
-    new_definition = definition_transformers.add_labels(new_definition, options.labels, options.pod_labels)
-    new_definition = definition_transformers.add_annotations(
-        new_definition, options.annotations, options.pod_annotations)
-    return new_definition
+    with metrics.measure('transform'):
+        return options.definition_transformer(definition)
+
+
+def finalize_definition(definition, options):
+    if options.skip_unchanged:
+        return definition_hashes.add_definition_hash(definition)
+    else:
+        return definition
@@ -1,3 +1,9 @@
+import functools
+import time
+
+from kubepy import definition_transformers
+
+
 def parse_dict_options_callback(option, opt_str, value, parser):
     name, path = value.split('=', 1)
     getattr(parser.values, option.dest)[name] = path
@@ -61,10 +67,113 @@ class Options:
             'type': 'int',
             'help': 'When applying job fail if job fails n times.',
         }),
+        ('--batch', {
+            'dest': 'batch',
+            'action': 'store_true',
+            'help': 'apply consecutive non job definitions with single kubectl call per namespace',
+        }),
+        ('--parallelism', {
+            'dest': 'parallelism',
+            'action': 'store',
+            'type': 'int',
+            'help': 'apply definitions in dependency order of their kinds, running up to n independent ones at once.',
+        }),
+        ('--watch', {
+            'dest': 'watch',
+            'action': 'store_true',
+            'help': 'wait for jobs and pods by watching their status instead of checking it every second.',
+        }),
+        ('--concurrent-jobs', {
+            'dest': 'concurrent_jobs',
+            'action': 'store_true',
+            'help': 'start independent jobs and pods at once and wait for all of them, '
+                    'checking their status with single request per namespace.',
+        }),
+        ('--cache-dir', {
+            'dest': 'cache_dir',
+            'action': 'store',
+            'help': 'store parsed and merged definitions in this directory to skip parsing unchanged files.',
+        }),
+        ('--cache-max-size', {
+            'dest': 'cache_max_size',
+            'action': 'store',
+            'type': 'int',
+            'help': 'maximum size of --cache-dir in megabytes, least recently used entries are removed first.',
+        }),
+        ('--skip-unchanged', {
+            'dest': 'skip_unchanged',
+            'action': 'store_true',
+            'help': 'annotate definitions with hash of their content and do not apply definitions '
+                    'with the same hash as the current object. Jobs and pods are always applied.',
+        }),
+        ('--prefetch', {
+            'dest': 'prefetch',
+            'action': 'store',
+            'type': 'int',
+            'help': 'load and render up to n next definitions in background while the current one is applied.',
+        }),
+        ('--poll-interval', {
+            'dest': 'poll_interval',
+            'action': 'store',
+            'type': 'float',
+            'help': 'seconds between first checks of job and pod status. Default: 1.',
+        }),
+        ('--max-poll-interval', {
+            'dest': 'max_poll_interval',
+            'action': 'store',
+            'type': 'float',
+            'help': 'maximum seconds between checks of job and pod status. Interval doubles while status does not '
+                    'change and is reset when it changes. Default: --poll-interval, so interval does not grow.',
+        }),
+        ('--timeout', {
+            'dest': 'timeout',
+            'action': 'store',
+            'type': 'float',
+            'help': 'fail when waiting for jobs and pods is not finished n seconds after the command started.',
+        }),
+        ('--job-timeout', {
+            'dest': 'job_timeout',
+            'action': 'store',
+            'type': 'float',
+            'help': 'fail when a job or pod is not finished n seconds after kubepy started waiting for it.',
+        }),
+        ('--render-processes', {
+            'dest': 'render_processes',
+            'action': 'store',
+            'type': 'int',
+            'help': 'load, merge and render definitions in n processes, leaving only calls to the cluster '
+                    'to the main process.',
+        }),
+        ('--follow-logs', {
+            'dest': 'follow_logs',
+            'action': 'store_true',
+            'help': 'stream logs of jobs and pods while waiting for them.',
+        }),
+        ('--log-file', {
+            'dest': 'log_file',
+            'action': 'store',
+            'help': 'append logs followed with --follow-logs to this file instead of printing them.',
+        }),
+        ('--log-limit-bytes', {
+            'dest': 'log_limit_bytes',
+            'action': 'store',
+            'type': 'int',
+            'help': 'keep only last n bytes of logs of failed jobs and pods. Default: 1048576.',
+        }),
+        ('--log-tail', {
+            'dest': 'log_tail',
+            'action': 'store',
+            'type': 'int',
+            'help': 'read only last n lines of logs of failed jobs and pods.',
+        }),
     ]
 
     def __init__(self, *, build_tag='latest', labels=None, pod_labels=None, annotations=None, pod_annotations=None,
-                 replace=False, host_volumes=None, environment=None, max_job_retries=None):
+                 replace=False, host_volumes=None, environment=None, max_job_retries=None, batch=False,
+                 parallelism=None, watch=False, concurrent_jobs=False, cache_dir=None, cache_max_size=64,
+                 skip_unchanged=False, prefetch=None, follow_logs=False, log_file=None, log_limit_bytes=1048576,
+                 log_tail=None, poll_interval=1, max_poll_interval=None, timeout=None, job_timeout=None,
+                 render_processes=None):
         self.build_tag = build_tag
         self.labels = labels or {}
         self.pod_labels = pod_labels or {}
@@ -74,6 +183,36 @@ class Options:
         self.host_volumes = host_volumes or {}
         self.environment = environment or {}
         self.max_job_retries = max_job_retries
+        self.batch = batch
+        self.parallelism = parallelism
+        self.watch = watch
+        self.concurrent_jobs = concurrent_jobs
+        self.cache_dir = cache_dir
+        self.cache_max_size = cache_max_size
+        self.skip_unchanged = skip_unchanged
+        self.prefetch = prefetch
+        self.follow_logs = follow_logs
+        self.log_file = log_file
+        self.log_limit_bytes = log_limit_bytes
+        self.log_tail = log_tail
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+        self.job_timeout = job_timeout
+        self.render_processes = render_processes
+        self.start_time = time.monotonic()
+
+    @functools.cached_property
+    def definition_transformer(self):
+        return definition_transformers.DefinitionTransformer(
+            tag=self.build_tag,
+            environment=self.environment,
+            host_volumes=self.host_volumes,
+            labels=self.labels,
+            pod_labels=self.pod_labels,
+            annotations=self.annotations,
+            pod_annotations=self.pod_annotations,
+        )
 
     @classmethod
     def add_applier_options(cls, parser):
@@ -1,5 +1,9 @@
+import contextlib
 import sys
 
+from kubepy import api
+from kubepy import metrics
+
 
 class CommandError(Exception):
     def __init__(self, message):
@@ -8,15 +12,130 @@ class CommandError(Exception):
 
 
 class BaseCommand:
+    name = None
+
+    def __init__(self, server=None):
+        self.server = server
+
     def run(self):
+        sys.exit(self.main(sys.argv[1:]))
+
+    def main(self, args):
         parser = self.get_optparser()
-        (options, names) = parser.parse_args()
+        self.add_common_options(parser)
+        if self.server is not None:
+            parser.prog = 'kubepy-{}'.format(self.name)
+        (options, names) = parser.parse_args(args)
+        if options.server and self.server is None:
+            from kubepy import client
+            return client.run_command(options.server, self.name, args)
         try:
-            self.handle(names, options)
+            self.setup(options)
+            with self.get_profiler(options), metrics.measure('command'):
+                exit_code = self.handle(names, options)
         except CommandError as e:
             print(e.message)
             parser.print_usage()
-            sys.exit(1)
+            return 1
+        finally:
+            self.teardown(options)
+        return exit_code or 0
+
+    def add_common_options(self, parser):
+        parser.add_option(
+            '--backend',
+            dest='backend',
+            type='choice',
+            choices=api.BACKEND_NAMES,
+            default='kubectl',
+            help='how to talk to the cluster: "kubectl" runs kubectl for each call, '
+                 '"http" uses kubeconfig to call API server directly, '
+                 '"proxy" starts single kubectl proxy and calls API server through it. Default: kubectl. '
+                 'Unlike "kubectl", which uses client-side kubectl apply, "http" and "proxy" use server-side apply, '
+                 'which keeps fields removed from definitions that are managed by other field managers and does not '
+                 'update the last-applied-configuration annotation.',
+        )
+        parser.add_option(
+            '--force-conflicts',
+            dest='force_conflicts',
+            action='store_true',
+            default=False,
+            help='with "http" and "proxy" backends, take over fields managed by others (for example by earlier '
+                 'kubectl apply) instead of failing on server-side apply conflicts.',
+        )
+        parser.add_option(
+            '--metrics-file',
+            dest='metrics_file',
+            help='write time spent in each stage and calls to the cluster to this file, '
+                 'in Prometheus text format if it ends with .prom or as JSON otherwise.',
+        )
+        parser.add_option(
+            '--profile',
+            dest='profile',
+            help='profile the command, writing pstats to this file and sampled stacks for flame graphs '
+                 'to the same path with .collapsed suffix. Top functions are printed at the end.',
+        )
+        parser.add_option(
+            '--server',
+            dest='server',
+            help='send the command to kubepy-server listening on this Unix socket instead of running it here.',
+        )
+
+    def add_selection_options(self, parser):
+        parser.add_option(
+            '--kind',
+            dest='kinds',
+            action='append',
+            help='only definitions of this kind, can be defined multiple times or as comma separated list.',
+        )
+        parser.add_option(
+            '--selector',
+            dest='selector',
+            help='only definitions with labels matching this selector, '
+                 'for example "tier=backend,environment in (staging,production)".',
+        )
+
+    def get_definition_filter(self, options):
+        from kubepy import definition_index
+        try:
+            return definition_index.DefinitionFilter(kinds=options.kinds, selector=options.selector)
+        except definition_index.SelectorError as e:
+            raise CommandError(str(e))
+
+    def select_names(self, manager, patterns, definition_filter):
+        from kubepy import definition_index
+        names = definition_filter.select(manager, definition_index.expand_names(manager, patterns))
+        if not names:
+            raise CommandError('No definitions match given names and filters.')
+        return names
+
+    def setup(self, options):
+        if self.server is not None:
+            metrics.reset()
+            return
+        try:
+            api.use_backend(api.create_backend(options.backend, force_conflicts=options.force_conflicts))
+        except api.ApiError as e:
+            raise CommandError(str(e))
+
+    def teardown(self, options):
+        if self.server is None:
+            api.close_backend()
+        if options.metrics_file:
+            metrics.write(options.metrics_file)
+
+    def get_definitions_applier(self, directories, options):
+        from kubepy import appliers
+        if self.server is None:
+            return appliers.DirectoriesApplier(directories, options)
+        return appliers.DefinitionsApplier(self.server.get_definition_manager(directories, options), options)
+
+    def get_profiler(self, options):
+        if options.profile:
+            from kubepy import profiling
+            return profiling.Profiler(options.profile)
+        else:
+            return contextlib.nullcontext()
 
     def handle(self, args, options):
         raise NotImplementedError
@@ -0,0 +1,27 @@
+import json
+import os
+import socket
+import sys
+
+
+def run_command(socket_path, command, args):
+    request = {'command': command, 'args': args, 'cwd': os.getcwd()}
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(socket_path)
+            socket.send_fds(connection, [json.dumps(request).encode() + b'\n'],
+                            [sys.stdout.fileno(), sys.stderr.fileno()])
+            with connection.makefile('rb') as response_file:
+                response_line = response_file.readline()
+    except OSError as e:
+        print('Cannot send command to kubepy server at {}: {}'.format(socket_path, e), file=sys.stderr)
+        return 1
+    if not response_line:
+        print('Kubepy server at {} closed connection before finishing command.'.format(socket_path), file=sys.stderr)
+        return 1
+    response = json.loads(response_line)
+    if 'error' in response:
+        print(response['error'], file=sys.stderr)
+    return response['exit_code']
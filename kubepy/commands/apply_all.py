@@ -2,17 +2,22 @@
 import optparse
 import pathlib
 
-from kubepy import appliers
 from kubepy import appliers_options
 from kubepy import base_commands
 
 
 class InstallAllCommand(base_commands.BaseCommand):
+    name = 'apply-all'
+
     def handle(self, args, options):
         directory_strings = options.directories or ['.']
         directories = [pathlib.Path(directory_string).resolve() for directory_string in directory_strings]
-        applier = appliers.DirectoriesApplier(directories, appliers_options.Options.from_parsed_options(options))
-        applier.apply_all()
+        applier = self.get_definitions_applier(directories, appliers_options.Options.from_parsed_options(options))
+        definition_filter = self.get_definition_filter(options)
+        if options.name_patterns or definition_filter:
+            applier.apply_names(self.select_names(applier.manager, options.name_patterns or ['*'], definition_filter))
+        else:
+            applier.apply_all()
 
     def get_optparser(self):
         parser = optparse.OptionParser(
@@ -25,6 +30,13 @@ class InstallAllCommand(base_commands.BaseCommand):
             action='append',
             help='installs definitions from this directory, can be defined multiple times to override definitions.',
         )
+        parser.add_option(
+            '--name',
+            dest='name_patterns',
+            action='append',
+            help='only definitions with names matching this glob pattern, can be defined multiple times.',
+        )
+        self.add_selection_options(parser)
         appliers_options.Options.add_applier_options(parser)
         return parser
 
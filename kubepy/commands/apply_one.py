@@ -3,11 +3,9 @@
 import optparse
 import pathlib
 
-import yaml
-
-from kubepy import appliers
 from kubepy import appliers_options
 from kubepy import base_commands
+from kubepy import serialization
 
 
 class InstallError(Exception):
@@ -15,9 +13,11 @@ class InstallError(Exception):
 
 
 class ApplyOneCommand(base_commands.BaseCommand):
+    name = 'apply-one'
+
     def get_optparser(self):
         parser = optparse.OptionParser(
-            usage="usage: %prog [options] [job_name ...]",
+            usage="usage: %prog [options] [job_name_or_pattern ...]",
             epilog="Installs or Executes selected definition",
         )
         parser.add_option(
@@ -33,19 +33,22 @@ class ApplyOneCommand(base_commands.BaseCommand):
             default=False,
             help='shows definition instead of applying them.',
         )
+        self.add_selection_options(parser)
         appliers_options.Options.add_applier_options(parser)
         return parser
 
     def handle(self, args, options):
         directory_strings = options.directories or ['.']
         directories = [pathlib.Path(directory_string).resolve() for directory_string in directory_strings]
-        runner = appliers.DirectoriesApplier(directories, appliers_options.Options.from_parsed_options(options))
-        if args:
-            for job_name in args:
-                if options.show_definition:
-                    print(yaml.dump(runner.get_named_definition(job_name)))
-                else:
-                    runner.apply_named(job_name)
+        runner = self.get_definitions_applier(directories, appliers_options.Options.from_parsed_options(options))
+        definition_filter = self.get_definition_filter(options)
+        if args or definition_filter:
+            names = self.select_names(runner.manager, args or ['*'], definition_filter)
+            if options.show_definition:
+                for job_name in names:
+                    print(serialization.dump_yaml(runner.get_named_definition(job_name)))
+            else:
+                runner.apply_names(names)
         else:
             raise base_commands.CommandError('Provide definition names.')
 
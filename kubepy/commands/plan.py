@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+import datetime
+import optparse
+import pathlib
+
+from kubepy import appliers_options
+from kubepy import base_commands
+from kubepy import planner
+
+
+class PlanCommand(base_commands.BaseCommand):
+    name = 'plan'
+
+    def get_optparser(self):
+        parser = optparse.OptionParser(
+            usage="usage: %prog [options] [name ...]",
+            epilog="Shows what applying definitions would change, without changing anything and running jobs. "
+                   "Checks all definitions if no names are given.",
+        )
+        parser.add_option(
+            '--directory',
+            dest='directories',
+            action='append',
+            help='installs definitions from this directory, can be defined multiple times to override definitions.',
+        )
+        parser.add_option(
+            '--diff',
+            dest='diff',
+            action='store_true',
+            default=False,
+            help='shows differences between current objects and definitions.',
+        )
+        appliers_options.Options.add_applier_options(parser)
+        return parser
+
+    def handle(self, args, options):
+        directory_strings = options.directories or ['.']
+        directories = [pathlib.Path(directory_string).resolve() for directory_string in directory_strings]
+        runner = self.get_definitions_applier(directories, appliers_options.Options.from_parsed_options(options))
+        if args:
+            definitions = (runner.manager[name] for name in args)
+        else:
+            definitions = runner.manager.values()
+        plan = planner.Planner(runner, with_diff=options.diff).plan_definitions(definitions)
+        self.print_plan(plan)
+        if plan.failed:
+            return 1
+
+    def print_plan(self, plan):
+        for diff in plan.diffs:
+            print(diff, end='')
+        for change in plan.changes:
+            namespace = ' (namespace {})'.format(change.namespace) if change.namespace else ''
+            print('{}/{}{}: {}'.format(change.kind, change.name, namespace, change.action))
+        for error in plan.errors:
+            print(error)
+        print('Summary: {}.'.format(plan.get_summary() or 'nothing to apply'))
+        print('Expected time of waiting for jobs: {}.'.format(datetime.timedelta(seconds=plan.expected_duration)))
+        if plan.jobs_without_expected_duration:
+            print('Jobs without {} annotation: {}.'.format(
+                planner.EXPECTED_DURATION_ANNOTATION, ', '.join(plan.jobs_without_expected_duration)))
+
+
+def run():
+    PlanCommand().run()
+
+
+if __name__ == '__main__':
+    run()
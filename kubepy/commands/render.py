@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+import optparse
+import pathlib
+import sys
+
+from kubepy import appliers_options
+from kubepy import base_commands
+from kubepy import rendering
+
+
+class RenderCommand(base_commands.BaseCommand):
+    name = 'render'
+
+    def get_optparser(self):
+        parser = optparse.OptionParser(
+            usage="usage: %prog [options] [name ...]",
+            epilog="Renders definitions the same way they would be applied, without calling the cluster. "
+                   "Renders all definitions if no names are given.",
+        )
+        parser.add_option(
+            '--directory',
+            dest='directories',
+            action='append',
+            help='renders definitions from this directory, can be defined multiple times to override definitions.',
+        )
+        parser.add_option(
+            '--output',
+            dest='output',
+            help='write all definitions to this file as a multi-document YAML stream. Default: standard output.',
+        )
+        parser.add_option(
+            '--output-directory',
+            dest='output_directory',
+            help='write each definition to a separate file with the same name in this directory.',
+        )
+        parser.add_option(
+            '--processes',
+            dest='processes',
+            type='int',
+            help='number of processes rendering definitions. Default: number of CPUs.',
+        )
+        appliers_options.Options.add_applier_options(parser)
+        return parser
+
+    def handle(self, args, options):
+        if options.output and options.output_directory:
+            raise base_commands.CommandError('Use either --output or --output-directory.')
+        directory_strings = options.directories or ['.']
+        directories = [pathlib.Path(directory_string).resolve() for directory_string in directory_strings]
+        applier_options = appliers_options.Options.from_parsed_options(options)
+        processes = options.processes
+        if self.server is not None and processes is None:
+            processes = 1
+        rendered_definitions = rendering.render_definitions(
+            directories, applier_options, names=args or None, processes=processes,
+            definitions_applier=self.get_definitions_applier(directories, applier_options))
+        if options.output_directory:
+            rendering.write_directory(rendered_definitions, pathlib.Path(options.output_directory))
+        elif options.output:
+            with open(options.output, 'w') as output:
+                rendering.write_stream(rendered_definitions, output)
+        else:
+            rendering.write_stream(rendered_definitions, sys.stdout)
+
+
+def run():
+    RenderCommand().run()
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+import optparse
+import pathlib
+
+from kubepy import appliers_options
+from kubepy import base_commands
+from kubepy import server
+
+
+class ServerCommand(base_commands.BaseCommand):
+    name = 'server'
+
+    def get_optparser(self):
+        parser = optparse.OptionParser(
+            usage="usage: %prog [options]",
+            epilog="Keeps definitions loaded and connections to the cluster open and runs commands sent by "
+                   "kubepy-apply-all, kubepy-apply-one, kubepy-plan and kubepy-render with --server option. "
+                   "Commands run one at a time, later ones wait until earlier ones finish. A command whose client "
+                   "disconnects is aborted.",
+        )
+        parser.add_option(
+            '--socket',
+            dest='socket',
+            help='path of Unix socket to listen on.',
+        )
+        parser.add_option(
+            '--directory',
+            dest='directories',
+            action='append',
+            help='loads definitions from this directory at start, can be defined multiple times '
+                 'to override definitions.',
+        )
+        parser.add_option(
+            '--watch-interval',
+            dest='watch_interval',
+            type='float',
+            default=1,
+            help='seconds between checks of loaded directories for changed definitions. Default: 1.',
+        )
+        return parser
+
+    def add_common_options(self, parser):
+        super().add_common_options(parser)
+        parser.remove_option('--server')
+        parser.set_default('server', None)
+
+    def handle(self, args, options):
+        if not options.socket:
+            raise base_commands.CommandError('Provide --socket.')
+        kubepy_server = server.KubepyServer(options.socket, watch_interval=options.watch_interval)
+        with kubepy_server:
+            if options.directories:
+                directories = [pathlib.Path(directory_string).resolve() for directory_string in options.directories]
+                server.load_definitions(kubepy_server.get_definition_manager(directories, appliers_options.Options()))
+            try:
+                kubepy_server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+
+
+def run():
+    ServerCommand().run()
+
+
+if __name__ == '__main__':
+    run()
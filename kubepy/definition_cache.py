@@ -0,0 +1,107 @@
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+import tempfile
+import threading
+
+from kubepy import serialization
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = '1'
+ENTRY_SUFFIX = '.pickle'
+INDEX_SUFFIX = '.index.json'
+
+
+class DefinitionCache:
+    def __init__(self, directory, max_size):
+        self.directory = pathlib.Path(directory)
+        self.max_size = max_size
+        self.file_keys = {}
+        self.size = None
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def load_yaml(self, path):
+        return self.get_or_create(self.get_file_key(path), lambda: serialization.load_yaml(path.read_bytes()))
+
+    def get_file_key(self, path):
+        stat = path.stat()
+        cached_stat, key = self.file_keys.get(path, (None, None))
+        if cached_stat != (stat.st_mtime_ns, stat.st_size):
+            content_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+            key = self.get_key('file', str(path), stat.st_mtime_ns, stat.st_size, content_hash)
+            self.file_keys[path] = ((stat.st_mtime_ns, stat.st_size), key)
+        return key
+
+    def get_index_path(self, definitions_directory):
+        return self.directory / (self.get_key('index', str(definitions_directory)) + INDEX_SUFFIX)
+
+    def get_key(self, *parts):
+        return hashlib.sha256('\0'.join(str(part) for part in (CACHE_VERSION, *parts)).encode()).hexdigest()
+
+    def get_or_create(self, key, create):
+        entry_path = self.directory / (key + ENTRY_SUFFIX)
+        try:
+            with entry_path.open('rb') as entry_file:
+                value = pickle.load(entry_file)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.warning('Ignoring broken cache entry {}.'.format(entry_path))
+        else:
+            try:
+                os.utime(entry_path)
+            except OSError:
+                pass
+            return value
+        value = create()
+        self.store(entry_path, value)
+        return value
+
+    def store(self, entry_path, value):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('wb', dir=self.directory, suffix='.tmp', delete=False) as entry_file:
+                pickle.dump(value, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(entry_file.name, entry_path)
+        except OSError as e:
+            logger.warning('Cannot write cache entry {}: {}'.format(entry_path, e))
+            return
+        with self.lock:
+            if self.size is None:
+                self.size = sum(size for _, size, _ in self.get_entries())
+            else:
+                self.size += entry_path.stat().st_size
+            if self.size > self.max_size:
+                self.evict()
+
+    def evict(self):
+        entries = sorted(self.get_entries())
+        while entries and self.size > self.max_size:
+            _, size, path = entries.pop(0)
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self.size -= size
+
+    def get_entries(self):
+        entries = []
+        for path in self.directory.glob('*' + ENTRY_SUFFIX):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return entries
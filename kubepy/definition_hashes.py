@@ -0,0 +1,41 @@
+import hashlib
+import json
+import logging
+
+from kubepy import api
+from kubepy import definition_transformers
+
+logger = logging.getLogger(__name__)
+
+DEFINITION_HASH_ANNOTATION = 'kubepy/definition-hash'
+
+
+def add_definition_hash(definition):
+    annotations = {DEFINITION_HASH_ANNOTATION: get_definition_hash(definition)}
+    return definition_transformers.DefinitionTransformer(annotations=annotations)(definition)
+
+
+def get_definition_hash(definition):
+    content = json.dumps(definition, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def read_definition_hash(definition):
+    annotations = definition.get('metadata', {}).get('annotations') or {}
+    return annotations.get(DEFINITION_HASH_ANNOTATION)
+
+
+def get_live_hashes(kinds, namespace=None):
+    try:
+        objects = api.get(','.join(sorted(kinds)), namespace=namespace)['items']
+    except api.ApiError:
+        objects = []
+        for kind in kinds:
+            try:
+                objects += api.get(kind, namespace=namespace)['items']
+            except api.ApiError:
+                logger.warning('Cannot get current {} objects, applying all of them.'.format(kind))
+    return {
+        (definition['kind'], definition['metadata']['name']): read_definition_hash(definition)
+        for definition in objects
+    }
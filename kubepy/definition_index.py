@@ -0,0 +1,169 @@
+import collections
+import fnmatch
+import json
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+PATTERN_CHARACTERS = frozenset('*?[')
+SELECTOR_SEPARATOR = re.compile(r',(?![^()]*\))')
+SET_REQUIREMENT = re.compile(r'^(?P<key>[^\s!=()]+)\s+(?P<operator>in|notin)\s*\((?P<values>[^()]*)\)$')
+EQUALITY_REQUIREMENT = re.compile(r'^(?P<key>[^\s!=()]+)\s*(?P<operator>==|=|!=)\s*(?P<value>[^\s!=(),]*)$')
+EXISTENCE_REQUIREMENT = re.compile(r'^(?P<operator>!?)\s*(?P<key>[^\s!=(),]+)$')
+
+DefinitionSummary = collections.namedtuple('DefinitionSummary', ['kind', 'namespace', 'labels'])
+Requirement = collections.namedtuple('Requirement', ['key', 'operator', 'values'])
+
+
+class SelectorError(Exception):
+    pass
+
+
+class DefinitionIndex:
+    def __init__(self, path):
+        self.path = path
+        self.entries = None
+
+    def get_summaries(self, index, names, load_definition):
+        if self.entries is None:
+            self.entries = self.read()
+        entries = {name: entry for name, entry in self.entries.items() if name in index}
+        summaries = {}
+        for name in names:
+            path, = index[name]
+            stat = os.stat(path)
+            entry = entries.get(name)
+            if entry is None or (entry['mtime_ns'], entry['size']) != (stat.st_mtime_ns, stat.st_size):
+                entry = create_entry(load_definition(name), stat)
+                entries[name] = entry
+            summaries[name] = DefinitionSummary(entry['kind'], entry['namespace'], entry['labels'])
+        if entries != self.entries:
+            self.entries = entries
+            self.write()
+        return summaries
+
+    def read(self):
+        if self.path is None:
+            return {}
+        try:
+            with self.path.open() as index_file:
+                content = json.load(index_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            logger.warning('Ignoring broken definition index {}.'.format(self.path))
+            return {}
+        if not isinstance(content, dict) or content.get('version') != INDEX_VERSION:
+            return {}
+        return content.get('definitions') or {}
+
+    def write(self):
+        if self.path is None:
+            return
+        import tempfile
+        content = json.dumps({'version': INDEX_VERSION, 'definitions': self.entries}, sort_keys=True)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=self.path.parent, prefix=self.path.name, suffix='.tmp',
+                                             delete=False) as index_file:
+                index_file.write(content)
+            os.replace(index_file.name, self.path)
+        except OSError as e:
+            logger.warning('Cannot write definition index {}: {}'.format(self.path, e))
+
+
+def create_entry(definition, stat):
+    summary = get_summary(definition)
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'kind': summary.kind,
+        'namespace': summary.namespace,
+        'labels': summary.labels,
+    }
+
+
+def get_summary(definition):
+    if not isinstance(definition, dict):
+        return DefinitionSummary(None, None, {})
+    metadata = definition.get('metadata') or {}
+    labels = {key: str(value) for key, value in (metadata.get('labels') or {}).items()}
+    return DefinitionSummary(definition.get('kind'), metadata.get('namespace'), labels)
+
+
+def merge_summaries(summary, override):
+    if summary is None:
+        return override
+    return DefinitionSummary(
+        override.kind or summary.kind,
+        override.namespace or summary.namespace,
+        {**summary.labels, **override.labels},
+    )
+
+
+def expand_names(names, patterns):
+    expanded_names = []
+    for pattern in patterns:
+        if PATTERN_CHARACTERS.isdisjoint(pattern):
+            expanded_names.append(pattern)
+        else:
+            expanded_names += [name for name in names if fnmatch.fnmatchcase(name, pattern)]
+    return expanded_names
+
+
+class DefinitionFilter:
+    def __init__(self, kinds=None, selector=None):
+        self.kinds = {kind.strip().lower() for value in kinds or [] for kind in value.split(',') if kind.strip()}
+        self.requirements = parse_selector(selector) if selector else []
+
+    def __bool__(self):
+        return bool(self.kinds or self.requirements)
+
+    def select(self, manager, names):
+        if not self:
+            return names
+        summaries = manager.get_summaries([name for name in names if name in manager])
+        return [name for name in names if name not in summaries or self.matches(summaries[name])]
+
+    def matches(self, summary):
+        if self.kinds and (summary.kind or '').lower() not in self.kinds:
+            return False
+        return all(matches_requirement(summary.labels, requirement) for requirement in self.requirements)
+
+
+def parse_selector(selector):
+    requirements = []
+    for requirement_string in SELECTOR_SEPARATOR.split(selector):
+        requirement_string = requirement_string.strip()
+        match = (
+            SET_REQUIREMENT.match(requirement_string) or
+            EQUALITY_REQUIREMENT.match(requirement_string) or
+            EXISTENCE_REQUIREMENT.match(requirement_string)
+        )
+        if match is None:
+            raise SelectorError('Invalid selector requirement: "{}".'.format(requirement_string))
+        groups = match.groupdict()
+        if 'values' in groups:
+            values = frozenset(value.strip() for value in groups['values'].split(',') if value.strip())
+        elif 'value' in groups:
+            values = frozenset([groups['value']])
+        else:
+            values = frozenset()
+        operator = {'==': '=', '': 'exists', '!': '!exists'}.get(groups['operator'], groups['operator'])
+        requirements.append(Requirement(groups['key'], operator, values))
+    return requirements
+
+
+def matches_requirement(labels, requirement):
+    value = labels.get(requirement.key)
+    if requirement.operator in ('=', 'in'):
+        return value in requirement.values
+    elif requirement.operator in ('!=', 'notin'):
+        return value not in requirement.values
+    elif requirement.operator == 'exists':
+        return requirement.key in labels
+    else:
+        return requirement.key not in labels
@@ -1,62 +1,150 @@
 import collections.abc
-import contextlib
-import itertools
+import os
 import pathlib
 
-import yaml
-
+from kubepy import definition_index
 from kubepy import definition_merger
+from kubepy import metrics
+from kubepy import serialization
+
+DEFINITION_SUFFIX = '.yml'
 
 
 class BaseDefinitionManager(collections.abc.Mapping):
     def __len__(self):
-        return len(list(self))
+        return len(self.get_index())
+
+    def __iter__(self):
+        return iter(self.get_index())
+
+    def __contains__(self, name):
+        return name in self.get_index()
 
     def __or__(self, other):
         return OverridenDefinitionManager(self, other)
 
+    def get_index(self):
+        raise NotImplementedError
+
+    def get_summaries(self, names):
+        raise NotImplementedError
+
 
 class OverridenDefinitionManager(BaseDefinitionManager):
-    def __init__(self, *managers):
+    def __init__(self, *managers, cache=None):
         self.managers = managers
+        self.cache = cache
+        self.index = None
+        self.inner_indexes = None
+        self.definitions = {}
 
     def __getitem__(self, name):
+        paths = self.get_index()[name]
+        try:
+            stat_key = get_stat_key(paths)
+        except FileNotFoundError:
+            raise KeyError(name)
+        memoized_key, definition = self.definitions.get(name, (None, None))
+        if memoized_key != stat_key:
+            if self.cache is None:
+                definition = self.merge_inner_definitions(name)
+            else:
+                key = self.cache.get_key('merged', *(self.cache.get_file_key(path) for path in paths))
+                definition = self.cache.get_or_create(key, lambda: self.merge_inner_definitions(name))
+            self.definitions[name] = (stat_key, definition)
+        return definition
+
+    def merge_inner_definitions(self, name):
         definitions = list(self.get_inner_definitions(name))
         if not definitions:
             raise KeyError
         else:
-            return definition_merger.merge_definitions(*definitions)
+            with metrics.measure('merge'):
+                return definition_merger.merge_definitions(*definitions)
 
     def get_inner_definitions(self, name):
         for manager in self.managers:
-            with contextlib.suppress(KeyError):
+            if name in manager:
                 yield manager[name]
 
-    def __iter__(self):
-        yield from sorted(set(itertools.chain(*(manager.keys() for manager in self.managers))))
+    def get_index(self):
+        inner_indexes = [manager.get_index() for manager in self.managers]
+        if self.inner_indexes is None or any(new is not old for new, old in zip(inner_indexes, self.inner_indexes)):
+            index = {}
+            for inner_index in inner_indexes:
+                for name, paths in inner_index.items():
+                    index[name] = index.get(name, ()) + paths
+            self.index = dict(sorted(index.items()))
+            self.inner_indexes = inner_indexes
+        return self.index
+
+    def get_summaries(self, names):
+        summaries = {}
+        for manager in self.managers:
+            for name, summary in manager.get_summaries(names).items():
+                summaries[name] = definition_index.merge_summaries(summaries.get(name), summary)
+        return summaries
 
 
 class DefinitionManager(BaseDefinitionManager):
-    def __init__(self, directory: pathlib.Path):
+    def __init__(self, directory: pathlib.Path, cache=None):
         self.directory = directory
+        self.cache = cache
+        self.index = None
+        self.directory_key = None
+        self.definitions = {}
+        self.definition_index = definition_index.DefinitionIndex(
+            cache.get_index_path(directory) if cache is not None else None)
 
     def __getitem__(self, name):
-        path = self.get_path_from_name(name)
-        if path.exists():
-            return self.get_yaml_from_file(path)
-        else:
-            raise KeyError('{} does not exist'.format(path))
-
-    def __iter__(self):
-        for path in sorted(self.directory.glob('*.yml')):
-            yield path.name[:-4]
-
-    def __len__(self):
-        return len(list(self))
+        try:
+            path, = self.get_index()[name]
+            stat_key = get_stat_key([path])
+        except (KeyError, FileNotFoundError):
+            raise KeyError('{} does not exist'.format(self.get_path_from_name(name)))
+        memoized_key, definition = self.definitions.get(name, (None, None))
+        if memoized_key != stat_key:
+            definition = self.get_yaml_from_file(path)
+            self.definitions[name] = (stat_key, definition)
+        return definition
+
+    def get_index(self):
+        try:
+            directory_key = get_stat_key([self.directory])
+        except FileNotFoundError:
+            directory_key = None
+        if self.index is None or directory_key != self.directory_key:
+            self.index = dict(sorted(self.scan_directory()))
+            self.directory_key = directory_key
+        return self.index
+
+    def get_summaries(self, names):
+        index = self.get_index()
+        return self.definition_index.get_summaries(index, [name for name in names if name in index], self.__getitem__)
+
+    def scan_directory(self):
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.name.endswith(DEFINITION_SUFFIX) and entry.is_file():
+                yield entry.name[:-len(DEFINITION_SUFFIX)], (pathlib.Path(entry.path),)
 
     def get_path_from_name(self, name):
-        return self.directory / (name + '.yml')
+        return self.directory / (name + DEFINITION_SUFFIX)
 
     def get_yaml_from_file(self, path):
-        with path.open() as yaml_file:
-            return yaml.safe_load(yaml_file)
+        with metrics.measure('load'):
+            if self.cache is not None:
+                return self.cache.load_yaml(path)
+            with path.open() as yaml_file:
+                return serialization.load_yaml(yaml_file)
+
+
+def get_stat_key(paths):
+    key = []
+    for path in paths:
+        stat = os.stat(path)
+        key.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(key)
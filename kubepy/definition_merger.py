@@ -1,30 +1,39 @@
-import functools
 import itertools
 
 from collections import abc
 
 
-@functools.singledispatch
 def merge_definitions(*definitions):
-    return definitions[-1]
+    first = definitions[0]
+    if isinstance(first, dict):
+        return merge_dicts(*definitions)
+    elif isinstance(first, (list, tuple)):
+        return merge_lists(*definitions)
+    else:
+        return definitions[-1]
 
 
-@merge_definitions.register(dict)
 def merge_dicts(*definitions):
     if definitions[-1] is None:
         return None
-    keys = set(itertools.chain(*(definition.keys() for definition in definitions if definition is not None)))
+    definitions = [definition for definition in definitions if definition is not None]
+    if len(definitions) == 1:
+        return normalize_dict(definitions[0])
+    values = {}
+    for definition in definitions:
+        for key, value in definition.items():
+            if key in values:
+                values[key].append(value)
+            else:
+                values[key] = [value]
     result = {}
-    for key in keys:
-        value = merge_definitions(*(definition[key] for definition in definitions
-                                    if definition is not None and key in definition))
+    for key, key_values in values.items():
+        value = merge_definitions(*key_values) if len(key_values) > 1 else normalize(key_values[0])
         if value is not None:
             result[key] = value
     return result
 
 
-@merge_definitions.register(list)
-@merge_definitions.register(tuple)
 def merge_lists(*definitions):
     named_results = {}
     unmerged_results = []
@@ -39,4 +48,38 @@ def merge_lists(*definitions):
                 unmerged_results.append(new_result)
         else:
             unmerged_results.append([definition])
-    return list(merge_definitions(*results) for results in unmerged_results)
+    return [merge_definitions(*results) if len(results) > 1 else normalize(results[0]) for results in unmerged_results]
+
+
+def normalize(definition):
+    if isinstance(definition, dict):
+        return normalize_dict(definition)
+    elif isinstance(definition, (list, tuple)):
+        return normalize_list(definition)
+    else:
+        return definition
+
+
+def normalize_dict(definition):
+    result = None
+    for index, (key, value) in enumerate(definition.items()):
+        new_value = normalize(value)
+        if result is None and (new_value is None or new_value is not value):
+            result = dict(itertools.islice(definition.items(), index))
+        if result is not None and new_value is not None:
+            result[key] = new_value
+    return definition if result is None else result
+
+
+def normalize_list(definition):
+    names = set()
+    for item in definition:
+        if isinstance(item, abc.Mapping) and 'name' in item:
+            if item['name'] in names:
+                return merge_lists(definition)
+            names.add(item['name'])
+    result = [normalize(item) for item in definition]
+    if isinstance(definition, list) and all(new is old for new, old in zip(result, definition)):
+        return definition
+    else:
+        return result
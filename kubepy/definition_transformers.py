@@ -1,4 +1,5 @@
 import copy
+import functools
 
 
 def tag_untaged_images(definition, tag):
@@ -63,6 +64,101 @@ def add_annotations_to_metadata(metadata, annotations):
     metadata['annotations'] = new_annotations
 
 
+class DefinitionTransformer:
+    def __init__(self, *, tag=None, environment=None, host_volumes=None, labels=None, pod_labels=None,
+                 annotations=None, pod_annotations=None):
+        self.operations = []
+        if tag:
+            self.operations.append(functools.partial(tag_copied_images, tag=tag))
+        if environment:
+            self.operations.append(functools.partial(set_copied_environment, new_environment=environment))
+        if host_volumes:
+            self.operations.append(functools.partial(add_copied_host_volumes, host_volumes=host_volumes))
+        if labels:
+            self.operations.append(functools.partial(update_copied_metadata, key='labels', values=labels))
+        if pod_labels:
+            self.operations.append(functools.partial(update_copied_pod_metadata, key='labels', values=pod_labels))
+        if annotations:
+            self.operations.append(functools.partial(update_copied_metadata, key='annotations', values=annotations))
+        if pod_annotations:
+            self.operations.append(
+                functools.partial(update_copied_pod_metadata, key='annotations', values=pod_annotations))
+
+    def __call__(self, definition):
+        definition_copy = DefinitionCopy(definition)
+        for operation in self.operations:
+            operation(definition_copy)
+        return definition_copy.definition
+
+
+class DefinitionCopy:
+    def __init__(self, definition):
+        self.definition = dict(definition)
+        self.copied_nodes = {(): self.definition}
+        self.copied_containers = None
+        self.copied_volumes = None
+
+    def get_node(self, path):
+        if path not in self.copied_nodes:
+            parent = self.get_node(path[:-1])
+            parent[path[-1]] = dict(parent.get(path[-1]) or {})
+            self.copied_nodes[path] = parent[path[-1]]
+        return self.copied_nodes[path]
+
+    def get_metadata(self):
+        return self.get_node(('metadata',))
+
+    def get_pod_metadata(self):
+        return self.get_node(self.get_pod_template_path() + ('metadata',))
+
+    def get_pod_spec(self):
+        return self.get_node(self.get_pod_template_path() + ('spec',))
+
+    def get_pod_template_path(self):
+        return POD_TEMPLATE_PATHS[self.definition['kind']]
+
+    def get_containers(self):
+        if self.copied_containers is None:
+            pod_spec = self.get_pod_spec()
+            self.copied_containers = pod_spec['containers'] = [dict(container) for container in pod_spec['containers']]
+        return self.copied_containers
+
+    def get_volumes(self):
+        if self.copied_volumes is None:
+            pod_spec = self.get_pod_spec()
+            self.copied_volumes = pod_spec['volumes'] = list(pod_spec.get('volumes') or [])
+        return self.copied_volumes
+
+
+def tag_copied_images(definition_copy, tag):
+    for container in definition_copy.get_containers():
+        container['image'] = tag_untaged_image(container['image'], tag)
+
+
+def set_copied_environment(definition_copy, new_environment):
+    for container in definition_copy.get_containers():
+        env_definition = [env for env in container.get('env', []) if env['name'] not in new_environment]
+        for name, value in new_environment.items():
+            env_definition.append({'name': name, 'value': value})
+        container['env'] = env_definition
+
+
+def add_copied_host_volumes(definition_copy, host_volumes):
+    volumes = definition_copy.get_volumes()
+    for name, path in host_volumes.items():
+        volumes.append({'name': name, 'hostPath': {'path': str(path)}})
+
+
+def update_copied_metadata(definition_copy, key, values):
+    metadata = definition_copy.get_metadata()
+    metadata[key] = dict(metadata.get(key) or {}, **values)
+
+
+def update_copied_pod_metadata(definition_copy, key, values):
+    metadata = definition_copy.get_pod_metadata()
+    metadata[key] = dict(metadata.get(key) or {}, **values)
+
+
 def get_crawler(definition):
     return CRAWLER_CLASS_MAP[definition['kind']](definition)
 
@@ -134,3 +230,11 @@ CRAWLER_CLASS_MAP = {
     'StatefulSet': DefinitionWithPodTemplateCrawler,
     'Pod': PodCrawler,
 }
+
+POD_TEMPLATE_PATHS = {
+    'Job': ('spec', 'template'),
+    'CronJob': ('spec', 'jobTemplate', 'spec', 'template'),
+    'Deployment': ('spec', 'template'),
+    'StatefulSet': ('spec', 'template'),
+    'Pod': (),
+}
@@ -0,0 +1,701 @@
+import base64
+import collections
+import contextlib
+import datetime
+import difflib
+import http.client
+import json
+import os
+import pathlib
+import queue
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from kubepy import api
+from kubepy import metrics
+from kubepy import serialization
+
+FIELD_MANAGER = 'kubepy'
+DELETION_TIMEOUT = 300
+REQUEST_TIMEOUT = 60
+EXEC_CREDENTIAL_REFRESH_MARGIN = 30
+PROXY_START_TIMEOUT = 30
+UNIX_SOCKET_SCHEME = 'http+unix'
+
+KNOWN_API_VERSIONS = {
+    'Pod': 'v1',
+    'Service': 'v1',
+    'Secret': 'v1',
+    'ConfigMap': 'v1',
+    'Namespace': 'v1',
+    'PersistentVolume': 'v1',
+    'PersistentVolumeClaim': 'v1',
+    'ServiceAccount': 'v1',
+    'Job': 'batch/v1',
+    'CronJob': 'batch/v1',
+    'Deployment': 'apps/v1',
+    'StatefulSet': 'apps/v1',
+    'Ingress': 'networking.k8s.io/v1',
+    'StorageClass': 'storage.k8s.io/v1',
+    'PodDisruptionBudget': 'policy/v1',
+    'Role': 'rbac.authorization.k8s.io/v1',
+    'RoleBinding': 'rbac.authorization.k8s.io/v1',
+    'HorizontalPodAutoscaler': 'autoscaling/v2',
+}
+
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.CannotSendRequest, BrokenPipeError,
+                           ConnectionResetError)
+
+
+class HttpError(api.ApiError):
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+class NotFoundError(HttpError):
+    pass
+
+
+class Resource(collections.namedtuple('Resource', ['api_version', 'name', 'namespaced'])):
+    def get_path(self, namespace, name=None, subresource=None):
+        parts = [get_api_version_path(self.api_version)]
+        if self.namespaced:
+            parts += ['namespaces', namespace]
+        parts.append(self.name)
+        if name:
+            parts.append(urllib.parse.quote(name, safe=''))
+        if subresource:
+            parts.append(subresource)
+        return '/'.join(parts)
+
+
+def get_api_version_path(api_version):
+    if '/' in api_version:
+        return '/apis/' + api_version
+    else:
+        return '/api/' + api_version
+
+
+class ConnectionPool:
+    def __init__(self, connection_factory, size=8):
+        self.connection_factory = connection_factory
+        self.connections = queue.LifoQueue(size)
+
+    @contextlib.contextmanager
+    def connection(self):
+        try:
+            connection = self.connections.get_nowait()
+        except queue.Empty:
+            connection = self.connection_factory()
+        try:
+            yield connection
+        except BaseException:
+            connection.close()
+            raise
+        try:
+            self.connections.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def clear(self):
+        while True:
+            try:
+                self.connections.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class HttpBackend:
+    def __init__(self, server, namespace='default', headers=None, ssl_context=None, pool_size=8,
+                 timeout=REQUEST_TIMEOUT, force_conflicts=False, exec_credential=None):
+        url = urllib.parse.urlsplit(server)
+        self.base_path = url.path.rstrip('/')
+        self.namespace = namespace
+        self.headers = headers or {}
+        self.exec_credential = exec_credential
+        self.timeout = timeout
+        self.force_conflicts = force_conflicts
+        self.pool = ConnectionPool(self.get_connection_factory(url, ssl_context), size=pool_size)
+        self.api_resources = {}
+        self.discovered_api_versions = {}
+
+    @classmethod
+    def from_kubeconfig(cls, path=None, force_conflicts=False):
+        return cls(**load_kubeconfig(path), force_conflicts=force_conflicts)
+
+    def get_connection_factory(self, url, ssl_context):
+        if url.scheme == 'https':
+            return lambda: http.client.HTTPSConnection(url.hostname, url.port, timeout=self.timeout,
+                                                       context=ssl_context)
+        elif url.scheme == 'http':
+            return lambda: http.client.HTTPConnection(url.hostname, url.port, timeout=self.timeout)
+        elif url.scheme == UNIX_SOCKET_SCHEME:
+            return lambda: UnixHTTPConnection(urllib.parse.unquote(url.netloc), timeout=self.timeout)
+        else:
+            raise api.ApiError('Unsupported api server url: {}'.format(url.geturl()))
+
+    def close(self):
+        self.pool.clear()
+
+    def get_headers(self, **headers):
+        if self.exec_credential is not None:
+            headers.update(self.exec_credential.get_headers())
+        return dict(self.headers, **headers)
+
+    def open_stream_connection(self, read_timeout=None):
+        connection = self.pool.connection_factory()
+        try:
+            connection.connect()
+        except socket.timeout:
+            connection.close()
+            raise api.ApiError('Timed out connecting to api server after {} seconds.'.format(self.timeout))
+        connection.sock.settimeout(read_timeout)
+        return connection
+
+    @api.retry_api_errors
+    def get(self, kind, name=None, namespace=None, selector=None):
+        if ',' in kind:
+            items = []
+            for single_kind in kind.split(','):
+                items += self.get(single_kind, name=name, namespace=namespace, selector=selector)['items']
+            return {'kind': 'List', 'items': items}
+        resource = self.get_resource(kind)
+        query = {'labelSelector': selector} if selector else None
+        objects = self.request_json('GET', resource.get_path(namespace or self.namespace, name), query=query)
+        if name is None:
+            fill_item_kinds(objects)
+        return objects
+
+    def get_status(self, kind, name, namespace=None):
+        return self.get(kind, name, namespace=namespace).get('status', {})
+
+    def get_statuses(self, kind, namespace=None, selector=None):
+        objects = self.get(kind, namespace=namespace, selector=selector)['items']
+        return {definition['metadata']['name']: definition.get('status', {}) for definition in objects}
+
+    def get_failed_pod_for_job(self, job_name, namespace=None):
+        path = self.get_resource('Pod').get_path(namespace or self.namespace)
+        query = {'fieldSelector': 'status.phase=Failed', 'labelSelector': 'job-name={}'.format(job_name)}
+        return self.request_json('GET', path, query=query)
+
+    def watch(self, kind, name, namespace=None, timeout=None):
+        path = self.get_resource(kind).get_path(namespace or self.namespace)
+        query = {'watch': 'true', 'fieldSelector': 'metadata.name={}'.format(name)}
+        if timeout is not None:
+            query['timeoutSeconds'] = api.get_timeout_seconds(timeout)
+        url = '{}{}?{}'.format(self.base_path, path, urllib.parse.urlencode(query))
+        connection = self.open_stream_connection(timeout + self.timeout if timeout is not None else None)
+        started = time.perf_counter()
+        received = 0
+        try:
+            connection.request('GET', url, headers=self.get_headers(Accept='application/json'))
+            response = connection.getresponse()
+            if response.status >= 400:
+                raise create_http_error(response.status, response.read())
+            for line in response:
+                received += len(line)
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event['type'] == 'ERROR':
+                    raise create_http_error(event['object'].get('code', 500), json.dumps(event['object']).encode())
+                elif event['type'] == 'DELETED':
+                    raise api.ApiError('{} {} was deleted.'.format(kind, name))
+                yield event['object']
+        except socket.timeout:
+            raise api.ApiError('Timed out watching {} {}.'.format(kind, name))
+        finally:
+            connection.close()
+            metrics.add_api_call('WATCH', 'GET {}'.format(url), time.perf_counter() - started, None,
+                                 bytes_out=received)
+
+    def logs(self, pod_name, container_name=None, namespace=None, limit_bytes=None, tail=None):
+        query = {'container': container_name} if container_name else {}
+        if tail is not None:
+            query['tailLines'] = tail
+        with self.open_log_stream(pod_name, namespace, query) as response:
+            return api.read_tail(iter(lambda: response.read1(api.LOG_CHUNK_SIZE), b''), limit_bytes), b''
+
+    def follow_logs(self, pod_name, container_name=None, namespace=None, since_time=None, timestamps=False):
+        query = {'container': container_name, 'follow': 'true'} if container_name else {'follow': 'true'}
+        if timestamps:
+            query['timestamps'] = 'true'
+        if since_time:
+            query['sinceTime'] = since_time
+        return HttpLogStream(self, pod_name, namespace, query)
+
+    @contextlib.contextmanager
+    def open_log_stream(self, pod_name, namespace, query, connection=None):
+        path = self.get_resource('Pod').get_path(namespace or self.namespace, pod_name, subresource='log')
+        url = self.base_path + path
+        if query:
+            url += '?' + urllib.parse.urlencode(query)
+        connection = connection or self.pool.connection_factory()
+        started = time.perf_counter()
+        status = None
+        try:
+            connection.request('GET', url, headers=self.get_headers())
+            response = connection.getresponse()
+            status = response.status
+            if status >= 400:
+                raise create_http_error(status, response.read())
+            yield response
+        except socket.timeout:
+            raise api.ApiError('Timed out reading logs of {}.'.format(pod_name))
+        finally:
+            connection.close()
+            metrics.add_api_call('GET', 'GET {}'.format(url), time.perf_counter() - started,
+                                 0 if status is not None and status < 400 else status, bytes_out=None)
+
+    def create(self, definition, namespace=None):
+        self.for_each_definition(definition, self.create_one, namespace)
+
+    def create_one(self, definition, namespace):
+        resource, namespace = self.get_definition_resource(definition, namespace)
+        self.request_json('POST', resource.get_path(namespace), body=definition)
+
+    def apply(self, definition, namespace=None):
+        self.for_each_definition(definition, self.apply_one, namespace)
+
+    def apply_one(self, definition, namespace):
+        resource, namespace = self.get_definition_resource(definition, namespace)
+        path = resource.get_path(namespace, definition['metadata']['name'])
+        try:
+            self.request_json('PATCH', path, query=self.get_apply_query(), body=definition,
+                              content_type='application/apply-patch+yaml')
+        except HttpError as e:
+            if e.status != 409:
+                raise
+            raise HttpError('{}\nUse --force-conflicts to take over fields managed by others.'.format(e), e.status)
+
+    def get_apply_query(self, **query):
+        query['fieldManager'] = FIELD_MANAGER
+        if self.force_conflicts:
+            query['force'] = 'true'
+        return query
+
+    def dry_run_apply(self, definition, namespace=None):
+        actions = {}
+        errors = []
+        for item in iterate_definitions(definition):
+            try:
+                live_definition, new_definition = self.get_dry_run_result(item, namespace)
+            except api.ApiError as e:
+                errors.append(str(e))
+                continue
+            if live_definition is None:
+                action = 'created'
+            elif clean_definition(live_definition) == clean_definition(new_definition):
+                action = 'unchanged'
+            else:
+                action = 'configured'
+            actions[item['kind'].lower(), item['metadata']['name']] = action
+        return actions, errors
+
+    def diff(self, definition, namespace=None):
+        lines = []
+        for item in iterate_definitions(definition):
+            live_definition, new_definition = self.get_dry_run_result(item, namespace)
+            name = '{}/{}'.format(item['kind'].lower(), item['metadata']['name'])
+            lines += difflib.unified_diff(
+                serialization.dump_yaml(clean_definition(live_definition or {})).splitlines(keepends=True),
+                serialization.dump_yaml(clean_definition(new_definition)).splitlines(keepends=True),
+                fromfile='live/' + name,
+                tofile='merged/' + name,
+            )
+        return ''.join(lines)
+
+    def get_dry_run_result(self, definition, namespace):
+        resource, namespace = self.get_definition_resource(definition, namespace)
+        path = resource.get_path(namespace, definition['metadata']['name'])
+        try:
+            live_definition = self.request_json('GET', path)
+        except NotFoundError:
+            live_definition = None
+        new_definition = self.request_json('PATCH', path, query=self.get_apply_query(dryRun='All'), body=definition,
+                                           content_type='application/apply-patch+yaml')
+        return live_definition, new_definition
+
+    def replace(self, definition, namespace=None):
+        self.for_each_definition(definition, self.replace_one, namespace)
+
+    def replace_one(self, definition, namespace):
+        resource, namespace = self.get_definition_resource(definition, namespace)
+        path = resource.get_path(namespace, definition['metadata']['name'])
+        with contextlib.suppress(NotFoundError):
+            self.request_json('DELETE', path, query={'propagationPolicy': 'Background'})
+            self.wait_until_deleted(path)
+        self.request_json('POST', resource.get_path(namespace), body=definition)
+
+    def wait_until_deleted(self, path):
+        deadline = time.monotonic() + DELETION_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                self.request('GET', path)
+            except NotFoundError:
+                return
+            time.sleep(0.5)
+        raise api.ApiError('Timed out waiting for deletion of {}'.format(path))
+
+    def rolling_update(self, definition, name, namespace=None):
+        raise api.ApiError('rolling-update is not supported by http backend.')
+
+    def delete(self, kind, name, namespace=None):
+        path = self.get_resource(kind).get_path(namespace or self.namespace, name)
+        self.request_json('DELETE', path, query={'propagationPolicy': 'Background'})
+
+    def for_each_definition(self, definition, function, namespace):
+        errors = []
+        for item in iterate_definitions(definition):
+            try:
+                function(item, namespace)
+            except api.ApiError as e:
+                errors.append(str(e))
+        if errors:
+            raise api.ApiError('\n'.join(errors))
+
+    def get_definition_resource(self, definition, namespace):
+        resource = self.get_resource(definition['kind'], definition.get('apiVersion'))
+        namespace = definition.get('metadata', {}).get('namespace') or namespace or self.namespace
+        return resource, namespace
+
+    def get_resource(self, kind, api_version=None):
+        api_version = api_version or get_known_api_version(kind) or self.discover_api_version(kind)
+        for resource in self.get_api_resources(kind, api_version):
+            if matches_kind(resource, kind):
+                return Resource(api_version, resource['name'], resource['namespaced'])
+        raise api.ApiError(get_no_matches_message(kind, api_version))
+
+    def discover_api_version(self, kind):
+        if kind.lower() not in self.discovered_api_versions:
+            groups = self.request_json('GET', '/apis')['groups']
+            for api_version in ['v1'] + [group['preferredVersion']['groupVersion'] for group in groups]:
+                resources = self.get_api_resources(kind, api_version)
+                if any(matches_kind(resource, kind) for resource in resources):
+                    self.discovered_api_versions[kind.lower()] = api_version
+                    break
+            else:
+                raise api.ApiError('error: the server doesn\'t have a resource type "{}"'.format(kind))
+        return self.discovered_api_versions[kind.lower()]
+
+    def get_api_resources(self, kind, api_version):
+        if api_version not in self.api_resources:
+            try:
+                resource_list = self.request_json('GET', get_api_version_path(api_version))
+            except NotFoundError:
+                raise api.ApiError(get_no_matches_message(kind, api_version))
+            self.api_resources[api_version] = [
+                resource for resource in resource_list['resources'] if '/' not in resource['name']
+            ]
+        return self.api_resources[api_version]
+
+    def request_json(self, method, path, query=None, body=None, content_type='application/json'):
+        data = self.request(method, path, query=query, body=body, content_type=content_type)
+        return json.loads(data) if data else None
+
+    def request(self, method, path, query=None, body=None, content_type='application/json'):
+        url = self.base_path + path
+        if query:
+            url += '?' + urllib.parse.urlencode(query)
+        headers = self.get_headers(Accept='application/json')
+        if body is not None:
+            body = serialization.dump_json(body).encode()
+            headers['Content-Type'] = content_type
+        started = time.perf_counter()
+        status, data = self.send(method, url, body, headers)
+        metrics.add_api_call(method, '{} {}'.format(method, url), time.perf_counter() - started,
+                             0 if status < 400 else status, bytes_in=len(body or b''), bytes_out=len(data))
+        if status >= 400:
+            raise create_http_error(status, data)
+        return data
+
+    def send(self, method, url, body, headers):
+        for retry in (True, False):
+            with self.pool.connection() as connection:
+                try:
+                    connection.request(method, url, body=body, headers=headers)
+                    response = connection.getresponse()
+                    return response.status, response.read()
+                except STALE_CONNECTION_ERRORS:
+                    if not retry:
+                        raise
+                    connection.close()
+                except socket.timeout:
+                    raise api.ApiError('Timed out after {} seconds waiting for api server: {} {}'.format(
+                        self.timeout, method, url))
+
+
+class HttpLogStream:
+    def __init__(self, backend, pod_name, namespace, query):
+        self.backend = backend
+        self.pod_name = pod_name
+        self.namespace = namespace
+        self.query = query
+        self.sock = None
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def __iter__(self):
+        connection = self.backend.open_stream_connection()
+        try:
+            with self.lock:
+                if self.closed:
+                    return
+                self.sock = connection.sock
+            with self.backend.open_log_stream(self.pod_name, self.namespace, self.query, connection) as response:
+                yield from response
+        except (http.client.HTTPException, OSError, ValueError) as e:
+            if not self.closed:
+                raise api.ApiError('Cannot read logs of {}: {}'.format(self.pod_name, e))
+        finally:
+            connection.close()
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            if self.sock is not None:
+                with contextlib.suppress(OSError):
+                    self.sock.shutdown(socket.SHUT_RDWR)
+
+
+class ExecCredential:
+    def __init__(self, config, base_directory):
+        self.config = config
+        self.base_directory = base_directory
+        self.token = None
+        self.expiration = None
+        self.lock = threading.Lock()
+
+    def get_headers(self):
+        with self.lock:
+            if self.token is None or (
+                    self.expiration is not None and time.time() > self.expiration - EXEC_CREDENTIAL_REFRESH_MARGIN):
+                self.refresh()
+            return {'Authorization': 'Bearer {}'.format(self.token)}
+
+    def refresh(self):
+        command = self.config['command']
+        if os.sep in command and not os.path.isabs(command):
+            command = str(self.base_directory / command)
+        environment = dict(os.environ, KUBERNETES_EXEC_INFO=json.dumps({
+            'apiVersion': self.config.get('apiVersion'),
+            'kind': 'ExecCredential',
+            'spec': {'interactive': False},
+        }))
+        environment.update((variable['name'], variable['value']) for variable in self.config.get('env') or [])
+        try:
+            process = subprocess.run([command, *(self.config.get('args') or [])], env=environment,
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            raise api.ApiError('Cannot run kubeconfig exec credential plugin {}: {}'.format(command, e))
+        if process.returncode != 0:
+            raise api.ApiError('Kubeconfig exec credential plugin {} failed: {}'.format(
+                command, process.stderr.decode(errors='replace').strip()))
+        try:
+            status = json.loads(process.stdout)['status']
+        except (ValueError, KeyError, TypeError):
+            raise api.ApiError('Kubeconfig exec credential plugin {} returned invalid output.'.format(command))
+        if not status.get('token'):
+            raise api.ApiError('Kubeconfig exec credential plugin {} returned no token, client certificates '
+                               'are not supported by http backend, use --backend=proxy.'.format(command))
+        self.token = status['token']
+        self.expiration = parse_timestamp(status['expirationTimestamp']) if status.get('expirationTimestamp') else None
+
+
+def parse_timestamp(timestamp):
+    return datetime.datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class KubectlProxyBackend(HttpBackend):
+    def __init__(self, proxy_process, directory, namespace='default', pool_size=8, force_conflicts=False):
+        socket_path = os.path.join(directory, 'proxy.sock')
+        server = '{}://{}'.format(UNIX_SOCKET_SCHEME, urllib.parse.quote(socket_path, safe=''))
+        super().__init__(server, namespace=namespace, pool_size=pool_size, force_conflicts=force_conflicts)
+        self.proxy_process = proxy_process
+        self.directory = directory
+
+    @classmethod
+    def start(cls, force_conflicts=False):
+        directory = tempfile.mkdtemp(prefix='kubepy-proxy-')
+        socket_path = os.path.join(directory, 'proxy.sock')
+        try:
+            proxy_process = subprocess.Popen(['kubectl', 'proxy', '--unix-socket', socket_path],
+                                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except OSError as e:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise api.ApiError('Cannot start kubectl proxy: {}'.format(e))
+        backend = cls(proxy_process, directory, force_conflicts=force_conflicts)
+        try:
+            backend.namespace = get_kubectl_namespace()
+            backend.wait_for_proxy(socket_path)
+        except BaseException:
+            backend.close()
+            raise
+        return backend
+
+    def wait_for_proxy(self, socket_path):
+        deadline = time.monotonic() + PROXY_START_TIMEOUT
+        while not os.path.exists(socket_path):
+            if self.proxy_process.poll() is not None:
+                raise api.ApiError('kubectl proxy failed: {}'.format(
+                    self.proxy_process.stderr.read().decode(errors='replace').strip()))
+            if time.monotonic() > deadline:
+                raise api.ApiError('kubectl proxy did not start in {} seconds.'.format(PROXY_START_TIMEOUT))
+            time.sleep(0.05)
+
+    def close(self):
+        super().close()
+        if self.proxy_process.poll() is None:
+            self.proxy_process.terminate()
+            self.proxy_process.wait()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def get_kubectl_namespace():
+    command = ['kubectl', 'config', 'view', '--minify', '-o', 'jsonpath={..namespace}']
+    namespace_process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return namespace_process.stdout.decode().strip() or 'default'
+
+
+def create_http_error(status, data):
+    try:
+        response_status = json.loads(data)
+        message = 'Error from server ({}): {}'.format(response_status['reason'], response_status['message'])
+    except (ValueError, KeyError, TypeError):
+        message = 'Error from server ({}): {}'.format(status, data.decode(errors='replace'))
+    error_class = NotFoundError if status == 404 else HttpError
+    return error_class(message, status)
+
+
+def clean_definition(definition):
+    metadata = {
+        key: value for key, value in definition.get('metadata', {}).items()
+        if key not in ('managedFields', 'resourceVersion', 'generation')
+    }
+    return dict(definition, metadata=metadata)
+
+
+def fill_item_kinds(object_list):
+    list_kind = object_list.get('kind', '')
+    if list_kind.endswith('List'):
+        for item in object_list.get('items') or []:
+            item.setdefault('kind', list_kind[:-len('List')])
+            item.setdefault('apiVersion', object_list.get('apiVersion'))
+
+
+def iterate_definitions(definition):
+    if definition.get('kind') == 'List':
+        yield from definition.get('items') or []
+    else:
+        yield definition
+
+
+def get_known_api_version(kind):
+    lowered_kind = kind.lower()
+    for known_kind, api_version in KNOWN_API_VERSIONS.items():
+        if lowered_kind in (known_kind.lower(), known_kind.lower() + 's', known_kind.lower() + 'es'):
+            return api_version
+
+
+def matches_kind(resource, kind):
+    names = {resource['kind'].lower(), resource['name'], resource.get('singularName'), *resource.get('shortNames', [])}
+    return kind.lower() in names
+
+
+def get_no_matches_message(kind, api_version):
+    return 'error: resource mapping not found: no matches for kind "{}" in version "{}"'.format(kind, api_version)
+
+
+def load_kubeconfig(path=None):
+    path = pathlib.Path(path or get_default_kubeconfig_path()).expanduser()
+    try:
+        with path.open() as config_file:
+            config = serialization.load_yaml(config_file) or {}
+    except OSError as e:
+        raise api.ApiError('Cannot read kubeconfig: {}'.format(e))
+    context = get_named_entry(config, 'contexts', config.get('current-context'))
+    cluster = get_named_entry(config, 'clusters', context.get('cluster'))
+    user = get_named_entry(config, 'users', context['user']) if context.get('user') else {}
+    base_directory = path.parent
+    return {
+        'server': cluster['server'],
+        'namespace': context.get('namespace', 'default'),
+        'headers': get_authorization_headers(user, base_directory),
+        'ssl_context': get_ssl_context(cluster, user, base_directory),
+        'exec_credential': ExecCredential(user['exec'], base_directory) if user.get('exec') else None,
+    }
+
+
+def get_default_kubeconfig_path():
+    paths = [path for path in os.environ.get('KUBECONFIG', '').split(os.pathsep) if path]
+    return paths[0] if paths else '~/.kube/config'
+
+
+def get_named_entry(config, section, name):
+    for entry in config.get(section) or []:
+        if entry.get('name') == name:
+            return entry[section[:-1]] or {}
+    raise api.ApiError('Cannot find {} "{}" in kubeconfig.'.format(section[:-1], name))
+
+
+def get_authorization_headers(user, base_directory):
+    if user.get('auth-provider'):
+        raise api.ApiError('Kubeconfig auth-provider "{}" is not supported by http backend, use exec credential '
+                           'plugin or --backend=proxy.'.format(user['auth-provider'].get('name')))
+    token = user.get('token')
+    if not token and user.get('tokenFile'):
+        token = (base_directory / user['tokenFile']).read_text().strip()
+    if token:
+        return {'Authorization': 'Bearer {}'.format(token)}
+    elif user.get('username'):
+        credentials = '{}:{}'.format(user['username'], user.get('password', ''))
+        return {'Authorization': 'Basic {}'.format(base64.b64encode(credentials.encode()).decode())}
+    else:
+        return {}
+
+
+def get_ssl_context(cluster, user, base_directory):
+    ssl_context = ssl.create_default_context()
+    if cluster.get('insecure-skip-tls-verify'):
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+    elif cluster.get('certificate-authority-data'):
+        ssl_context.load_verify_locations(cadata=base64.b64decode(cluster['certificate-authority-data']).decode())
+    elif cluster.get('certificate-authority'):
+        ssl_context.load_verify_locations(cafile=str(base_directory / cluster['certificate-authority']))
+    with get_key_file(user, 'client-certificate', base_directory) as certificate_file:
+        with get_key_file(user, 'client-key', base_directory) as key_file:
+            if certificate_file:
+                ssl_context.load_cert_chain(certificate_file, key_file)
+    return ssl_context
+
+
+@contextlib.contextmanager
+def get_key_file(user, key, base_directory):
+    if user.get(key + '-data'):
+        with tempfile.NamedTemporaryFile(suffix='.pem') as data_file:
+            data_file.write(base64.b64decode(user[key + '-data']))
+            data_file.flush()
+            yield data_file.name
+    elif user.get(key):
+        yield str(base_directory / user[key])
+    else:
+        yield None
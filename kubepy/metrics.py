@@ -0,0 +1,120 @@
+import collections
+import contextlib
+import json
+import os
+import pathlib
+import threading
+import time
+
+PROMETHEUS_SUFFIX = '.prom'
+
+ApiCall = collections.namedtuple('ApiCall', ['name', 'command', 'duration', 'exit_code', 'bytes_in', 'bytes_out'])
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stage_durations = collections.defaultdict(float)
+        self.stage_counts = collections.Counter()
+        self.api_calls = []
+
+    @contextlib.contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(stage, time.perf_counter() - started)
+
+    def add_stage(self, stage, duration):
+        with self.lock:
+            self.stage_durations[stage] += duration
+            self.stage_counts[stage] += 1
+
+    def add_api_call(self, name, command, duration, exit_code, bytes_in=0, bytes_out=0):
+        with self.lock:
+            self.api_calls.append(ApiCall(name, command, duration, exit_code, bytes_in, bytes_out))
+
+    def get_stages(self):
+        return {
+            stage: {'count': self.stage_counts[stage], 'seconds': duration}
+            for stage, duration in sorted(self.stage_durations.items())
+        }
+
+    def get_api_summary(self):
+        summary = collections.defaultdict(lambda: {
+            'count': 0, 'failures': 0, 'seconds': 0.0, 'bytes_in': 0, 'bytes_out': 0,
+        })
+        for call in self.api_calls:
+            entry = summary[call.name]
+            entry['count'] += 1
+            entry['failures'] += is_failure(call.exit_code)
+            entry['seconds'] += call.duration
+            entry['bytes_in'] += call.bytes_in or 0
+            entry['bytes_out'] += call.bytes_out or 0
+        return dict(sorted(summary.items()))
+
+    def to_json(self):
+        return json.dumps({
+            'stages': self.get_stages(),
+            'api': self.get_api_summary(),
+            'api_calls': [call._asdict() for call in self.api_calls],
+        }, indent=2)
+
+    def to_prometheus(self):
+        lines = []
+        stages = self.get_stages()
+        api_summary = self.get_api_summary()
+        add_prometheus_metric(lines, 'kubepy_stage_duration_seconds', 'Time spent in each stage of a kubepy run.',
+                              'stage', {stage: entry['seconds'] for stage, entry in stages.items()})
+        add_prometheus_metric(lines, 'kubepy_stage_runs_total', 'Number of times each stage was run.',
+                              'stage', {stage: entry['count'] for stage, entry in stages.items()})
+        for name, key, help_text in [
+            ('kubepy_api_calls_total', 'count', 'Number of calls to the cluster.'),
+            ('kubepy_api_failures_total', 'failures', 'Number of failed calls to the cluster.'),
+            ('kubepy_api_duration_seconds', 'seconds', 'Time spent in calls to the cluster.'),
+            ('kubepy_api_sent_bytes_total', 'bytes_in', 'Bytes sent to the cluster.'),
+            ('kubepy_api_received_bytes_total', 'bytes_out', 'Bytes received from the cluster.'),
+        ]:
+            add_prometheus_metric(lines, name, help_text, 'call',
+                                  {call: entry[key] for call, entry in api_summary.items()})
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        path = pathlib.Path(path)
+        content = self.to_prometheus() if path.suffix == PROMETHEUS_SUFFIX else self.to_json()
+        import tempfile
+        with tempfile.NamedTemporaryFile('w', dir=path.parent, suffix='.tmp', delete=False) as metrics_file:
+            metrics_file.write(content)
+        os.replace(metrics_file.name, path)
+
+
+def is_failure(exit_code):
+    return exit_code not in (0, None)
+
+
+def add_prometheus_metric(lines, name, help_text, label, values):
+    lines.append('# HELP {} {}'.format(name, help_text))
+    lines.append('# TYPE {} counter'.format(name))
+    for label_value, value in values.items():
+        lines.append('{}{{{}="{}"}} {}'.format(name, label, label_value, value))
+
+
+collector = Metrics()
+
+
+def measure(stage):
+    return collector.measure(stage)
+
+
+def add_api_call(name, command, duration, exit_code, bytes_in=0, bytes_out=0):
+    collector.add_api_call(name, command, duration, exit_code, bytes_in=bytes_in, bytes_out=bytes_out)
+
+
+def write(path):
+    collector.write(path)
+
+
+def reset():
+    global collector
+    collector = Metrics()
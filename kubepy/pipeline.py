@@ -0,0 +1,44 @@
+import queue
+import threading
+
+FINISHED = object()
+
+
+def prefetch(items, size):
+    buffer = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+    worker = threading.Thread(target=fill_buffer, args=(items, buffer, stopped), daemon=True)
+    worker.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            elif item is FINISHED:
+                return
+            yield item
+    finally:
+        stopped.set()
+        worker.join()
+
+
+def fill_buffer(items, buffer, stopped):
+    try:
+        for item in items:
+            if not put(buffer, (item, None), stopped):
+                return
+    except BaseException as e:
+        put(buffer, (None, e), stopped)
+    else:
+        put(buffer, (FINISHED, None), stopped)
+
+
+def put(buffer, entry, stopped):
+    while not stopped.is_set():
+        try:
+            buffer.put(entry, timeout=0.1)
+        except queue.Full:
+            continue
+        else:
+            return True
+    return False
@@ -0,0 +1,106 @@
+import collections
+
+from kubepy import api
+from kubepy import appliers
+from kubepy import scheduler
+
+EXPECTED_DURATION_ANNOTATION = 'kubepy/expected-duration'
+
+PlannedChange = collections.namedtuple('PlannedChange', ['kind', 'name', 'namespace', 'action'])
+
+
+def parse_duration(value):
+    duration = int(str(value).strip())
+    if duration < 0:
+        raise ValueError(value)
+    return duration
+
+
+class Plan:
+    def __init__(self):
+        self.changes = []
+        self.errors = []
+        self.diffs = []
+        self.expected_duration = 0
+        self.jobs_without_expected_duration = []
+
+    @property
+    def failed(self):
+        return bool(self.errors) or any(change.action == 'failed' for change in self.changes)
+
+    def get_summary(self):
+        counter = collections.Counter(change.action for change in self.changes)
+        return ', '.join('{} {}'.format(count, action) for action, count in sorted(counter.items()))
+
+
+class Planner:
+    def __init__(self, definitions_applier, with_diff=False):
+        self.definitions_applier = definitions_applier
+        self.options = definitions_applier.options
+        self.with_diff = with_diff
+
+    def plan_definitions(self, definitions):
+        plan = Plan()
+        all_appliers = list(self.definitions_applier.get_appliers(definitions))
+        remaining_appliers = all_appliers
+        if self.options.skip_unchanged:
+            remaining_appliers = list(appliers.skip_unchanged(all_appliers))
+        resource_appliers = [
+            applier for applier in remaining_appliers if not isinstance(applier, appliers.BaseJobApplier)
+        ]
+        resource_actions = self.plan_resources(plan, resource_appliers)
+        for applier in all_appliers:
+            if isinstance(applier, appliers.BaseJobApplier):
+                action = 'run'
+            else:
+                action = resource_actions.get(applier, 'unchanged')
+            plan.changes.append(PlannedChange(
+                applier.definition['kind'], applier.definition['metadata']['name'], applier.namespace, action))
+        self.estimate_duration(plan, all_appliers)
+        return plan
+
+    def plan_resources(self, plan, resource_appliers):
+        resource_actions = {}
+        namespaced_appliers = collections.defaultdict(list)
+        for applier in resource_appliers:
+            namespaced_appliers[applier.namespace].append(applier)
+        for namespace, namespace_appliers in namespaced_appliers.items():
+            definition = appliers.list_definition(applier.new_definition for applier in namespace_appliers)
+            actions, errors = api.dry_run_apply(definition, namespace=namespace)
+            plan.errors += errors
+            for applier in namespace_appliers:
+                key = (applier.definition['kind'].lower(), applier.definition['metadata']['name'])
+                resource_actions[applier] = actions.get(key, 'failed')
+            if self.with_diff:
+                plan.diffs.append(api.diff(definition, namespace=namespace))
+        return resource_actions
+
+    def estimate_duration(self, plan, all_appliers):
+        for group in self.get_concurrent_job_groups(all_appliers):
+            durations = []
+            for applier in group:
+                annotations = applier.definition['metadata'].get('annotations') or {}
+                if EXPECTED_DURATION_ANNOTATION not in annotations:
+                    plan.jobs_without_expected_duration.append(applier.name)
+                    continue
+                try:
+                    durations.append(parse_duration(annotations[EXPECTED_DURATION_ANNOTATION]))
+                except ValueError:
+                    plan.errors.append('Invalid {} annotation of {}: {!r} is not a number of seconds.'.format(
+                        EXPECTED_DURATION_ANNOTATION, applier.name, annotations[EXPECTED_DURATION_ANNOTATION]))
+            plan.expected_duration += max(durations, default=0)
+
+    def get_concurrent_job_groups(self, all_appliers):
+        if self.options.parallelism:
+            stages = scheduler.get_stages(all_appliers, lambda applier: applier.definition)
+        elif self.options.concurrent_jobs:
+            stages = [
+                group.appliers for group in appliers.group_consecutive_jobs(all_appliers)
+                if isinstance(group, appliers.JobGroupApplier)
+            ]
+        else:
+            stages = [[applier] for applier in all_appliers]
+        for stage in stages:
+            jobs = [applier for applier in stage if isinstance(applier, appliers.BaseJobApplier)]
+            if jobs:
+                yield jobs
@@ -0,0 +1,114 @@
+import collections
+import concurrent.futures.thread
+import cProfile
+import pathlib
+import sys
+import threading
+import time
+
+from kubepy import api
+
+SAMPLING_INTERVAL = 0.005
+COLLAPSED_SUFFIX = '.collapsed'
+TOP_FUNCTIONS = 15
+
+
+class Profiler:
+    def __init__(self, path, interval=SAMPLING_INTERVAL, output=None):
+        self.path = pathlib.Path(path)
+        self.interval = interval
+        self.output = output or sys.stderr
+        self.profile = cProfile.Profile()
+        self.samples = collections.Counter()
+        self.stopped = threading.Event()
+        self.ticks = 0
+        self.started = None
+        self.duration = None
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.sampler.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        self.stopped.set()
+        self.sampler.join()
+        self.duration = time.perf_counter() - self.started
+        self.write()
+        self.print_summary()
+
+    def sample(self):
+        sampler_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != sampler_id and frame.f_code not in WAITING_CODES:
+                    self.samples[get_stack(frame)] += 1
+            self.ticks += 1
+
+    def write(self):
+        self.profile.dump_stats(self.path)
+        with self.get_collapsed_path().open('w') as collapsed_file:
+            for (codes, kubectl_command), count in sorted(self.samples.items(), key=lambda item: -item[1]):
+                labels = [get_label(code) for code in codes]
+                if kubectl_command:
+                    labels.append('[{}]'.format(kubectl_command))
+                collapsed_file.write('{} {}\n'.format(';'.join(labels), count))
+
+    def get_collapsed_path(self):
+        return self.path.with_name(self.path.name + COLLAPSED_SUFFIX)
+
+    def print_summary(self):
+        sample_time = self.duration / max(self.ticks, 1)
+        python_functions = collections.Counter()
+        kubectl_commands = collections.Counter()
+        for (codes, kubectl_command), count in self.samples.items():
+            if kubectl_command:
+                kubectl_commands[kubectl_command] += count * sample_time
+            elif codes:
+                python_functions[get_label(codes[-1])] += count * sample_time
+        print('Profile written to {} and {}.'.format(self.path, self.get_collapsed_path()), file=self.output)
+        print('Time summed over threads in Python (including sleeps): {:.2f} s, waiting for kubectl: {:.2f} s.'.format(
+            sum(python_functions.values()), sum(kubectl_commands.values())), file=self.output)
+        print_top('Top functions in Python:', python_functions, self.output)
+        print_top('Top kubectl calls:', kubectl_commands, self.output)
+
+
+def get_stack(frame):
+    codes = []
+    kubectl_command = None
+    while frame is not None:
+        codes.append(frame.f_code)
+        if kubectl_command is None and frame.f_code in KUBECTL_CODES:
+            command = frame.f_locals.get('command')
+            kubectl_command = ' '.join(command[:2]) if command else 'kubectl'
+        frame = frame.f_back
+    return tuple(reversed(codes)), kubectl_command
+
+
+def get_label(code):
+    return '{} ({}:{})'.format(getattr(code, 'co_qualname', code.co_name), code.co_filename, code.co_firstlineno)
+
+
+def print_top(title, durations, output):
+    if durations:
+        print(title, file=output)
+        for label, duration in durations.most_common(TOP_FUNCTIONS):
+            print('  {:>8.2f} s  {}'.format(duration, label), file=output)
+
+
+KUBECTL_CODES = {
+    api.run_kubectl.__code__,
+    api.KubectlBackend.watch.__code__,
+    api.KubectlBackend.logs.__code__,
+    api.KubectlLogStream.__iter__.__code__,
+}
+WAITING_CODES = {
+    threading.Condition.wait.__code__,
+    threading.Thread.join.__code__,
+    concurrent.futures.thread._worker.__code__,
+}
+if hasattr(threading.Thread, '_wait_for_tstate_lock'):
+    WAITING_CODES.add(threading.Thread._wait_for_tstate_lock.__code__)
@@ -0,0 +1,37 @@
+import os
+
+from kubepy import appliers
+from kubepy import serialization
+
+DOCUMENT_SEPARATOR = '---\n'
+
+
+def render_definitions(directories, options, names=None, processes=None, definitions_applier=None):
+    if definitions_applier is None:
+        definitions_applier = appliers.directories_applier(directories, options)
+    if names is None:
+        names = list(definitions_applier.manager)
+    processes = min(processes or os.cpu_count() or 1, len(names))
+    if processes <= 1:
+        for name in names:
+            yield name, render_definition(definitions_applier, name)
+        return
+    yield from zip(names, appliers.render_in_processes(definitions_applier.manager, options, names, processes,
+                                                       render_definition))
+
+
+def render_definition(definitions_applier, name):
+    return serialization.dump_yaml(definitions_applier.get_named_definition(name))
+
+
+def write_stream(rendered_definitions, output):
+    for index, (_, rendered_definition) in enumerate(rendered_definitions):
+        if index:
+            output.write(DOCUMENT_SEPARATOR)
+        output.write(rendered_definition)
+
+
+def write_directory(rendered_definitions, directory):
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, rendered_definition in rendered_definitions:
+        (directory / (name + '.yml')).write_text(rendered_definition)
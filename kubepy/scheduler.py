@@ -0,0 +1,57 @@
+import collections
+
+ORDER_ANNOTATION = 'kubepy/order'
+
+KIND_STAGES = {
+    'Namespace': 10,
+    'CustomResourceDefinition': 10,
+    'StorageClass': 10,
+    'PersistentVolume': 10,
+    'ServiceAccount': 10,
+    'Role': 10,
+    'RoleBinding': 10,
+    'ConfigMap': 20,
+    'Secret': 20,
+    'PersistentVolumeClaim': 20,
+    'Service': 20,
+    'Job': 30,
+    'Pod': 30,
+    'Deployment': 40,
+    'StatefulSet': 40,
+    'CronJob': 40,
+}
+DEFAULT_STAGE = 50
+
+
+class SchedulerError(Exception):
+    pass
+
+
+def get_stage(definition):
+    annotations = definition.get('metadata', {}).get('annotations') or {}
+    if ORDER_ANNOTATION in annotations:
+        try:
+            return int(annotations[ORDER_ANNOTATION])
+        except ValueError:
+            raise SchedulerError('{} annotation has to be an integer, got: {}'.format(
+                ORDER_ANNOTATION, annotations[ORDER_ANNOTATION]))
+    return KIND_STAGES.get(definition.get('kind'), DEFAULT_STAGE)
+
+
+def get_stages(items, get_definition=lambda item: item):
+    stages = collections.defaultdict(list)
+    for item in items:
+        stages[get_stage(get_definition(item))].append(item)
+    return [stages[stage] for stage in sorted(stages)]
+
+
+def run_concurrently(tasks, parallelism):
+    import concurrent.futures
+    with concurrent.futures.ThreadPoolExecutor(max_workers=parallelism) as executor:
+        futures = [executor.submit(task) for task in tasks]
+        _, not_done = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_EXCEPTION)
+        for future in not_done:
+            future.cancel()
+    for future in futures:
+        if not future.cancelled() and future.exception() is not None:
+            raise future.exception()
@@ -0,0 +1,32 @@
+import functools
+import json
+
+
+@functools.cache
+def get_yaml():
+    import yaml
+    return yaml
+
+
+@functools.cache
+def get_safe_loader():
+    yaml = get_yaml()
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@functools.cache
+def get_safe_dumper():
+    yaml = get_yaml()
+    return getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+def load_yaml(stream):
+    return get_yaml().load(stream, Loader=get_safe_loader())
+
+
+def dump_yaml(definition):
+    return get_yaml().dump(definition, Dumper=get_safe_dumper())
+
+
+def dump_json(definition):
+    return json.dumps(definition, default=str)
@@ -0,0 +1,205 @@
+import contextlib
+import ctypes
+import json
+import logging
+import os
+import select
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+
+from kubepy import appliers
+from kubepy.commands import apply_all
+from kubepy.commands import apply_one
+from kubepy.commands import plan
+from kubepy.commands import render
+
+logger = logging.getLogger(__name__)
+
+MAX_REQUEST_SIZE = 1024 * 1024
+OUTPUT_FDS = (1, 2)
+HANG_UP_CHECK_INTERVAL = 0.1
+ABORTED_EXIT_CODE = 130
+
+COMMANDS = {
+    command_class.name: command_class
+    for command_class in [
+        apply_all.InstallAllCommand, apply_one.ApplyOneCommand, plan.PlanCommand, render.RenderCommand,
+    ]
+}
+
+
+class ClientDisconnected(BaseException):
+    pass
+
+
+class KubepyServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, watch_interval=1):
+        self.socket_path = str(socket_path)
+        super().__init__(self.socket_path, RequestHandler)
+        self.watch_interval = watch_interval
+        self.lock = threading.RLock()
+        self.definition_managers = {}
+        self.stopped = threading.Event()
+
+    def get_definition_manager(self, directories, options):
+        key = (tuple(directories), options.cache_dir, options.cache_max_size)
+        with self.lock:
+            if key not in self.definition_managers:
+                self.definition_managers[key] = appliers.directories_manager(directories, options)
+            return self.definition_managers[key]
+
+    def serve_forever(self, poll_interval=0.5):
+        watcher = threading.Thread(target=self.watch_definitions, daemon=True)
+        watcher.start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self.stopped.set()
+            watcher.join()
+
+    def watch_definitions(self):
+        while not self.stopped.wait(self.watch_interval):
+            with self.lock:
+                for manager in list(self.definition_managers.values()):
+                    load_definitions(manager)
+
+    def run_command(self, request, output_fds, connection):
+        command_class = COMMANDS.get(request.get('command'))
+        if command_class is None:
+            return {'exit_code': 1, 'error': 'Unknown command: {}'.format(request.get('command'))}
+        try:
+            with HangUpMonitor(connection):
+                while not self.lock.acquire(timeout=HANG_UP_CHECK_INTERVAL):
+                    pass
+                try:
+                    with redirected_output(output_fds), working_directory(request['cwd']):
+                        exit_code = run_command(command_class(server=self), request['args'])
+                finally:
+                    self.lock.release()
+        except ClientDisconnected:
+            logger.warning('Client of {} command disconnected, command aborted.'.format(request['command']))
+            return {'exit_code': ABORTED_EXIT_CODE}
+        return {'exit_code': exit_code}
+
+    def server_close(self):
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+
+
+class RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        message, fds, _, _ = socket.recv_fds(self.request, MAX_REQUEST_SIZE, len(OUTPUT_FDS))
+        try:
+            while message and not message.endswith(b'\n'):
+                chunk = self.request.recv(MAX_REQUEST_SIZE)
+                if not chunk:
+                    return
+                message += chunk
+            if len(fds) != len(OUTPUT_FDS):
+                response = {'exit_code': 1, 'error': 'Send standard output and error with the command.'}
+            else:
+                response = self.server.run_command(json.loads(message), fds, self.request)
+        except ClientDisconnected:
+            return
+        finally:
+            for fd in fds:
+                os.close(fd)
+        with contextlib.suppress(OSError):
+            self.request.sendall(json.dumps(response).encode() + b'\n')
+
+
+class HangUpMonitor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.thread_id = threading.get_ident()
+        self.lock = threading.Lock()
+        self.active = True
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.watch, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        with self.lock:
+            self.active = False
+            set_async_exception(self.thread_id, None)
+        self.stopped.set()
+        self.thread.join()
+
+    def watch(self):
+        while not self.stopped.wait(HANG_UP_CHECK_INTERVAL):
+            if is_hung_up(self.connection):
+                with self.lock:
+                    if self.active:
+                        set_async_exception(self.thread_id, ClientDisconnected)
+                return
+
+
+def is_hung_up(connection):
+    readable, _, _ = select.select([connection], [], [], 0)
+    if not readable:
+        return False
+    try:
+        return connection.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b''
+    except BlockingIOError:
+        return False
+    except OSError:
+        return True
+
+
+def set_async_exception(thread_id, exception_class):
+    exception = ctypes.py_object(exception_class) if exception_class is not None else None
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), exception)
+
+
+def run_command(command, args):
+    try:
+        return command.main(args)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else int(e.code is not None)
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+
+def load_definitions(manager):
+    for name in manager:
+        try:
+            manager[name]
+        except Exception as e:
+            logger.debug('Cannot load {}: {}'.format(name, e))
+
+
+@contextlib.contextmanager
+def redirected_output(fds):
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = [os.dup(target_fd) for target_fd in OUTPUT_FDS]
+    try:
+        for fd, target_fd in zip(fds, OUTPUT_FDS):
+            os.dup2(fd, target_fd)
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for saved_fd, target_fd in zip(saved_fds, OUTPUT_FDS):
+            os.dup2(saved_fd, target_fd)
+            os.close(saved_fd)
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous_path = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous_path)
@@ -30,6 +30,9 @@ setup(
         'console_scripts': [
             'kubepy-apply-all = kubepy.commands.apply_all:run',
             'kubepy-apply-one = kubepy.commands.apply_one:run',
+            'kubepy-plan = kubepy.commands.plan:run',
+            'kubepy-render = kubepy.commands.render:run',
+            'kubepy-server = kubepy.commands.server:run',
         ],
     },
     license='BSD',
@@ -0,0 +1,32 @@
+import pytest
+
+from kubepy import definition_cache
+from kubepy import definition_manager
+
+
+def write_definition(directory, name, content):
+    directory.mkdir(exist_ok=True)
+    path = directory / (name + '.yml')
+    path.write_text(content)
+    return path
+
+
+@pytest.fixture(name='write_definition')
+def write_definition_fixture():
+    return write_definition
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return definition_cache.DefinitionCache(tmp_path / 'cache', max_size=1024 * 1024)
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    def make(cache=None):
+        return definition_manager.OverridenDefinitionManager(
+            definition_manager.DefinitionManager(tmp_path / 'base', cache=cache),
+            definition_manager.DefinitionManager(tmp_path / 'override', cache=cache),
+            cache=cache,
+        )
+    return make
@@ -0,0 +1,83 @@
+import io
+import threading
+import time
+
+from unittest import mock
+
+from kubepy import api
+
+
+class TestIterateJsonStream:
+    def test_if_concatenated_objects_are_parsed(self):
+        stream = io.BytesIO(b'{\n  "status": {}\n}\n{\n  "status": {"succeeded": 1}\n}\n')
+
+        assert list(api.iterate_json_stream(stream)) == [{'status': {}}, {'status': {'succeeded': 1}}]
+
+    def test_if_objects_split_between_chunks_are_parsed(self):
+        stream = io.BytesIO('{"name": "zażółć"}{"name": "gęślą"}'.encode())
+
+        assert list(api.iterate_json_stream(stream, chunk_size=3)) == [{'name': 'zażółć'}, {'name': 'gęślą'}]
+
+
+class TestParseDryRunOutput:
+    def test_if_actions_are_parsed(self):
+        output = (
+            'configmap/config created (server dry run)\n'
+            'deployment.apps/web configured (server dry run)\n'
+            'service/api unchanged (server dry run)\n'
+        )
+
+        assert api.parse_dry_run_output(output) == {
+            ('configmap', 'config'): 'created',
+            ('deployment', 'web'): 'configured',
+            ('service', 'api'): 'unchanged',
+        }
+
+
+class TestReadTail:
+    def test_if_only_last_bytes_are_kept(self):
+        assert api.read_tail([b'abc', b'def', b'gh'], limit_bytes=4) == b'efgh'
+
+    def test_if_everything_is_kept_without_limit(self):
+        assert api.read_tail([b'abc', b'def']) == b'abcdef'
+
+
+class TestGetStatuses:
+    def test_if_statuses_are_parsed_from_jsonpath_output(self):
+        output = 'first\t{"active":1}\nsecond\t\n'
+
+        with mock.patch.object(api.KubectlBackend, 'get_jsonpath', return_value=output):
+            statuses = api.KubectlBackend().get_statuses('Job', selector='kubepy/run=abc')
+
+        assert statuses == {'first': {'active': 1}, 'second': {}}
+
+
+class TestWatch:
+    def test_if_watch_is_limited_by_timeout(self):
+        process = mock.Mock(stdout=io.BytesIO(b'{"status": {}}'))
+        process.wait.return_value = 0
+
+        with mock.patch('subprocess.Popen', return_value=process) as popen_mock:
+            states = list(api.KubectlBackend().watch('Job', 'migrate', timeout=2.5))
+
+        assert states == [{'status': {}}]
+        assert popen_mock.call_args.args[0] == [
+            'kubectl', 'get', 'Job', 'migrate', '--watch', '-o', 'json', '--request-timeout', '3s',
+        ]
+
+
+class TestKubectlLogStream:
+    def test_if_closing_stream_stops_following_process(self):
+        stream = api.KubectlLogStream(['sleep', '30'])
+        lines = []
+        thread = threading.Thread(target=lambda: lines.extend(stream), daemon=True)
+        thread.start()
+        while stream.process is None:
+            time.sleep(0.01)
+
+        stream.close()
+        thread.join(5)
+
+        assert not thread.is_alive()
+        assert lines == []
+        assert stream.process.returncode is not None
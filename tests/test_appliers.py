@@ -0,0 +1,470 @@
+import io
+import json
+import subprocess
+import threading
+
+from unittest import mock
+
+import pytest
+import yaml
+
+from kubepy import api
+from kubepy import appliers
+from kubepy import appliers_options
+from kubepy import definition_hashes
+
+
+def get_definition(kind, name, namespace=None):
+    definition = {
+        'kind': kind,
+        'metadata': {
+            'name': name,
+        },
+    }
+    if namespace:
+        definition['metadata']['namespace'] = namespace
+    return definition
+
+
+def get_job_definition(name):
+    definition = get_definition('Job', name)
+    definition['spec'] = {
+        'template': {
+            'spec': {
+                'containers': [{'name': 'python-container', 'image': 'python'}],
+                'restartPolicy': 'Never',
+            },
+        },
+    }
+    return definition
+
+
+def get_applier(definition, **options):
+    options = appliers_options.Options(**options)
+    return appliers.UniversalDefinitionApplier(definition, options).get_applier()
+
+
+class TestApplyInBatches:
+    def test_if_resources_are_applied_with_one_call_per_namespace(self):
+        definitions = [
+            get_definition('ConfigMap', 'config'),
+            get_definition('Service', 'service', namespace='other'),
+            get_definition('Secret', 'secret'),
+        ]
+
+        with mock.patch.object(api, 'apply') as apply_mock:
+            appliers.apply_in_batches(get_applier(definition) for definition in definitions)
+
+        assert apply_mock.call_args_list == [
+            mock.call(appliers.list_definition([definitions[0], definitions[2]]), namespace=None),
+            mock.call(appliers.list_definition([definitions[1]]), namespace='other'),
+        ]
+
+    def test_if_jobs_split_batches(self):
+        calls = []
+        job_applier = mock.Mock(batchable=False)
+        job_applier.apply.side_effect = lambda: calls.append('job')
+        resource_appliers = [get_applier(get_definition('ConfigMap', name)) for name in ['before', 'after']]
+
+        with mock.patch.object(api, 'apply', side_effect=lambda definition, namespace: calls.append(definition)):
+            appliers.apply_in_batches([resource_appliers[0], job_applier, resource_appliers[1]])
+
+        assert calls == [
+            appliers.list_definition([get_definition('ConfigMap', 'before')]),
+            'job',
+            appliers.list_definition([get_definition('ConfigMap', 'after')]),
+        ]
+
+    def test_if_replaced_deployments_are_not_batched(self):
+        applier = get_applier(get_definition('Deployment', 'web'), replace=True)
+
+        assert not applier.batchable
+
+    def test_if_missing_custom_resources_are_skipped(self):
+        error = api.ApiError(
+            b'error: unable to recognize "STDIN": no matches for kind "ServiceMonitor" in version "v1"\n'
+            b'ensure CRDs are installed first\n',
+        )
+        applier = get_applier(get_definition('ServiceMonitor', 'monitor'))
+
+        with mock.patch.object(api, 'apply', side_effect=error):
+            appliers.apply_in_batches([applier])
+
+    def test_if_resources_after_missing_custom_resource_are_applied(self):
+        applied = []
+
+        def run_kubectl(command, input=None, stdout=None, stderr=None):
+            for item in json.loads(input)['items']:
+                if item['kind'] == 'ServiceMonitor':
+                    stderr = 'error: unable to recognize "STDIN": no matches for kind "ServiceMonitor" in version "v1"'
+                    return subprocess.CompletedProcess(command, 1, stderr=stderr.encode())
+                applied.append(item['metadata']['name'])
+            return subprocess.CompletedProcess(command, 0, stderr=b'')
+
+        definitions = [
+            get_definition('ConfigMap', 'before'),
+            get_definition('ServiceMonitor', 'monitor'),
+            get_definition('Service', 'after'),
+        ]
+
+        with mock.patch.object(api, 'run_kubectl', side_effect=run_kubectl):
+            appliers.apply_in_batches([get_applier(definition) for definition in definitions])
+
+        assert applied == ['before', 'before', 'after']
+
+    def test_if_other_errors_are_raised(self):
+        error = api.ApiError(
+            b'error: unable to recognize "STDIN": no matches for kind "ServiceMonitor" in version "v1"\n'
+            b'Error from server (Invalid): Service "service" is invalid\n',
+        )
+        applier = get_applier(get_definition('Service', 'service'))
+
+        with mock.patch.object(api, 'apply', side_effect=error):
+            with pytest.raises(api.ApiError):
+                appliers.apply_in_batches([applier])
+
+
+class TestWaitWithWatch:
+    def test_if_job_waits_until_completion(self):
+        states = [
+            {'status': {}},
+            {'status': {'active': 1}},
+            {'status': {'succeeded': 1, 'completionTime': '2024-01-01T00:00:00Z'}},
+        ]
+        applier = get_applier(get_job_definition('migrate'), watch=True)
+
+        with mock.patch.object(api, 'create'), mock.patch.object(api, 'delete') as delete_mock:
+            with mock.patch.object(api, 'watch', return_value=(state for state in states)) as watch_mock:
+                applier.apply()
+
+        watch_mock.assert_called_once_with('Job', 'migrate', namespace=None, timeout=None)
+        delete_mock.assert_called_once_with('Job', 'migrate', namespace=None)
+
+    def test_if_failed_job_raises(self):
+        states = [
+            {'status': {'conditions': [{'type': 'Failed', 'reason': 'BackoffLimitExceeded', 'message': 'failed'}]}},
+        ]
+        applier = get_applier(get_job_definition('migrate'), watch=True)
+
+        with mock.patch.object(api, 'create'), mock.patch.object(api, 'delete'):
+            with mock.patch.object(api, 'watch', return_value=(state for state in states)):
+                with pytest.raises(appliers.JobError):
+                    applier.apply()
+
+    def test_if_watch_without_events_times_out(self):
+        timeouts = []
+
+        def watch(kind, name, namespace=None, timeout=None):
+            timeouts.append(timeout)
+            threading.Event().wait(timeout)
+            return (state for state in [])
+
+        applier = get_applier(get_job_definition('migrate'), watch=True, job_timeout=0.2, poll_interval=0)
+
+        with mock.patch.object(api, 'create'), mock.patch.object(api, 'delete'):
+            with mock.patch.object(api, 'watch', side_effect=watch):
+                with pytest.raises(appliers.WaitTimeout):
+                    applier.apply()
+
+        assert 0 < timeouts[0] <= 0.2
+
+    def test_if_pending_pod_is_not_succeeded(self):
+        status = appliers.PodStatus('check', {'phase': 'Pending'})
+
+        status.raise_if_failed()
+        assert not status.succeeded
+
+
+class TestJobGroupApplier:
+    def test_if_all_jobs_are_started_before_waiting(self):
+        job_appliers = [get_applier(get_job_definition(name)) for name in ['first', 'second']]
+        group = appliers.JobGroupApplier(job_appliers)
+        finished = {'completionTime': '2024-01-01T00:00:00Z'}
+        statuses = [
+            {'first': {'active': 1}, 'second': {'active': 1}},
+            {'first': finished, 'second': {'active': 1}},
+            {'second': finished},
+        ]
+
+        with mock.patch.object(api, 'create') as create_mock, mock.patch.object(api, 'delete') as delete_mock:
+            with mock.patch.object(api, 'get_statuses', side_effect=statuses) as get_mock, mock.patch('time.sleep'):
+                group.apply()
+
+        created_labels = [call.args[0]['metadata']['labels'] for call in create_mock.call_args_list]
+        assert created_labels == [{'kubepy/run': group.run_id}] * 2
+        assert get_mock.call_args_list == [
+            mock.call('Job', namespace=None, selector='kubepy/run={}'.format(group.run_id)),
+        ] * 3
+        assert delete_mock.call_args_list == [
+            mock.call('Job', 'first', namespace=None),
+            mock.call('Job', 'second', namespace=None),
+        ]
+
+    def test_if_failure_cleans_up_all_jobs(self):
+        job_appliers = [get_applier(get_job_definition(name)) for name in ['first', 'second']]
+        failed = {'conditions': [{'type': 'Failed', 'reason': 'BackoffLimitExceeded', 'message': 'failed'}]}
+
+        with mock.patch.object(api, 'create'), mock.patch.object(api, 'delete') as delete_mock:
+            with mock.patch.object(api, 'get_statuses', return_value={'first': {'active': 1}, 'second': failed}):
+                with pytest.raises(appliers.JobError):
+                    appliers.JobGroupApplier(job_appliers).apply()
+
+        assert delete_mock.call_count == 2
+
+    def test_if_consecutive_jobs_are_grouped(self):
+        config = get_applier(get_definition('ConfigMap', 'config'))
+        jobs = [get_applier(get_job_definition(name)) for name in ['first', 'second']]
+
+        grouped = list(appliers.group_consecutive_jobs([jobs[0], config, *jobs]))
+
+        assert [type(applier) for applier in grouped] == [
+            appliers.JobGroupApplier,
+            appliers.ResourceApplier,
+            appliers.JobGroupApplier,
+        ]
+        assert grouped[2].appliers == jobs
+
+
+class TestSkipUnchanged:
+    def test_if_unchanged_definitions_are_skipped(self):
+        changed, unchanged = [
+            get_applier(get_definition('ConfigMap', name), skip_unchanged=True) for name in ['changed', 'unchanged']
+        ]
+        live_objects = {'items': [
+            {'kind': 'ConfigMap', 'metadata': {'name': 'unchanged'}, **unchanged.new_definition},
+            {'kind': 'ConfigMap', 'metadata': {'name': 'changed', 'annotations': {
+                definition_hashes.DEFINITION_HASH_ANNOTATION: 'old-hash',
+            }}},
+        ]}
+
+        with mock.patch.object(api, 'get', return_value=live_objects) as get_mock:
+            remaining = list(appliers.skip_unchanged([changed, unchanged]))
+
+        assert remaining == [changed]
+        get_mock.assert_called_once_with('ConfigMap', namespace=None)
+
+    def test_if_hash_is_added_to_applied_definition(self):
+        applier = get_applier(get_definition('Service', 'service'), skip_unchanged=True)
+
+        annotations = applier.new_definition['metadata']['annotations']
+
+        assert annotations == {
+            definition_hashes.DEFINITION_HASH_ANNOTATION: definition_hashes.get_definition_hash(
+                get_definition('Service', 'service')),
+        }
+
+    def test_if_jobs_are_never_skipped(self):
+        job = get_applier(get_job_definition('migrate'), skip_unchanged=True)
+
+        with mock.patch.object(api, 'get') as get_mock:
+            remaining = list(appliers.skip_unchanged([job]))
+
+        assert remaining == [job]
+        get_mock.assert_not_called()
+
+
+class TestPolling:
+    def test_if_interval_grows_until_status_changes(self):
+        backoff = appliers.PollingBackoff(min_interval=1, max_interval=4)
+
+        with mock.patch('time.sleep') as sleep_mock, mock.patch('random.uniform', side_effect=lambda a, b: b):
+            for state in ['active', 'active', 'active', 'active', 'failed', 'failed']:
+                backoff.wait(state)
+
+        assert [call.args[0] for call in sleep_mock.call_args_list] == [1, 2, 4, 4, 1, 2]
+
+    def test_if_interval_does_not_grow_by_default(self):
+        backoff = appliers.PollingBackoff.from_options(appliers_options.Options(poll_interval=2), 'Job migrate')
+
+        assert (backoff.min_interval, backoff.max_interval) == (2, 2)
+
+    def test_if_job_times_out(self):
+        applier = get_applier(get_job_definition('migrate'), job_timeout=0, poll_interval=0)
+
+        with mock.patch.object(api, 'create'), mock.patch.object(api, 'delete') as delete_mock:
+            with mock.patch.object(api, 'get_status', return_value={'active': 1}) as get_status_mock:
+                with pytest.raises(appliers.WaitTimeout):
+                    applier.apply()
+
+        get_status_mock.assert_called_once_with('Job', 'migrate', namespace=None)
+        delete_mock.assert_called_once_with('Job', 'migrate', namespace=None)
+
+
+class FakeLogStream:
+    def __init__(self, lines=(), error=None):
+        self.lines = lines
+        self.error = error
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        yield from self.lines
+        if self.error is None:
+            self.closed.wait(5)
+        elif not self.closed.is_set():
+            raise self.error
+
+    def close(self):
+        self.closed.set()
+
+
+def get_running_pod(name, *container_names):
+    return {
+        'metadata': {'name': name},
+        'spec': {'containers': [{'name': container_name} for container_name in container_names]},
+        'status': {'containerStatuses': [
+            {'name': container_name, 'state': {'running': {}}} for container_name in container_names
+        ]},
+    }
+
+
+class TestLogs:
+    def test_if_pod_logs_are_followed_to_file(self, tmp_path):
+        log_file = tmp_path / 'jobs.log'
+        applier = get_applier(get_job_definition('migrate'), follow_logs=True, log_file=str(log_file))
+        stream = FakeLogStream([b'2024-01-01T00:00:00.5Z migrating\n'])
+
+        pods = {'items': [get_running_pod('migrate-abc', 'main')]}
+        with mock.patch.object(api, 'get', return_value=pods) as get_mock:
+            with mock.patch.object(api, 'follow_logs', return_value=stream):
+                with applier.following_logs():
+                    while not log_file.exists() or not log_file.read_bytes():
+                        stream.closed.wait(0.01)
+
+        get_mock.assert_called_with('Pod', namespace=None, selector='job-name=migrate')
+        assert log_file.read_bytes() == b'[migrate-abc] migrating\n'
+        assert stream.closed.is_set()
+
+    def test_if_every_container_is_followed_without_listing_pods_again(self):
+        applier = get_applier(get_job_definition('migrate'), poll_interval=0.01)
+        streams = {'main': FakeLogStream(), 'sidecar': FakeLogStream()}
+        follower = appliers.LogFollower(applier)
+
+        def follow_logs(pod_name, container_name=None, namespace=None, since_time=None, timestamps=False):
+            return streams[container_name]
+
+        pods = {'items': [get_running_pod('migrate-abc', 'main', 'sidecar')]}
+        with mock.patch.object(api, 'get', return_value=pods) as get_mock:
+            with mock.patch.object(api, 'follow_logs', side_effect=follow_logs) as follow_logs_mock:
+                follower.start()
+                while follow_logs_mock.call_count < 2:
+                    follower.stopped.wait(0.01)
+                follower.stopped.wait(0.1)
+                follower.stop()
+
+        assert get_mock.call_count == 1
+        assert [call.kwargs['container_name'] for call in follow_logs_mock.call_args_list] == ['main', 'sidecar']
+        assert all(stream.closed.is_set() for stream in streams.values())
+        assert not follower.thread.is_alive()
+
+    def test_if_failing_container_is_not_followed_forever(self):
+        applier = get_applier(get_job_definition('migrate'), poll_interval=0.01)
+        follower = appliers.LogFollower(applier)
+
+        pods = {'items': [get_running_pod('migrate-abc', 'main')]}
+        with mock.patch.object(api, 'get', return_value=pods):
+            with mock.patch.object(api, 'follow_logs', side_effect=lambda *args, **kwargs: FakeLogStream(
+                    error=api.ApiError('container not found'))) as follow_logs_mock:
+                follower.start()
+                while ('migrate-abc', 'main') not in follower.finished:
+                    follower.stopped.wait(0.01)
+                follower.stopped.wait(0.1)
+                follower.stop()
+
+        assert follow_logs_mock.call_count == appliers.LOG_FOLLOW_ATTEMPTS
+
+    def test_if_followed_logs_are_resumed_after_reconnect(self):
+        output = io.BytesIO()
+        calls = []
+
+        def follow_logs(pod_name, container_name=None, namespace=None, since_time=None, timestamps=False):
+            calls.append(since_time)
+            if since_time is None:
+                yield b'2024-01-01T00:00:01.1Z first\n'
+                yield b'2024-01-01T00:00:01.25Z second\n'
+                raise api.ApiError('connection lost')
+            yield b'2024-01-01T00:00:01.1Z first\n'
+            yield b'2024-01-01T00:00:01.25Z second\n'
+            yield b'2024-01-01T00:00:01.3Z third\n'
+
+        follower = appliers.LogFollower(get_applier(get_job_definition('migrate')))
+        with mock.patch.object(api, 'follow_logs', side_effect=follow_logs):
+            assert not follower.follow_container('migrate-abc', 'main', b'[migrate-abc] ', output)
+            assert follower.follow_container('migrate-abc', 'main', b'[migrate-abc] ', output)
+
+        assert calls == [None, '2024-01-01T00:00:01.25Z']
+        assert output.getvalue() == b'[migrate-abc] first\n[migrate-abc] second\n[migrate-abc] third\n'
+
+    def test_if_logs_of_all_containers_of_failed_pod_are_collected(self):
+        status = appliers.JobStatus('migrate', {'failed': 1}, log_limit_bytes=100, log_tail=10)
+        failed_pod = {
+            'metadata': {'name': 'migrate-abc'},
+            'spec': {'initContainers': [{'name': 'init'}], 'containers': [{'name': 'main'}]},
+            'status': {},
+        }
+
+        def logs(pod_name, container_name, namespace=None, limit_bytes=None, tail=None):
+            return 'log of {}'.format(container_name).encode(), b''
+
+        with mock.patch.object(api, 'logs', side_effect=logs) as logs_mock:
+            log = status.get_failed_pod_logs(failed_pod)
+
+        assert log == '==> init <==\nlog of init\n==> main <==\nlog of main\n'
+        logs_mock.assert_any_call('migrate-abc', 'main', namespace=None, limit_bytes=100, tail=10)
+
+
+class TestRenderProcesses:
+    def test_if_definitions_rendered_in_processes_are_applied_in_order(self, tmp_path):
+        (tmp_path / 'definitions').mkdir()
+        for name in ['first', 'second', 'third']:
+            definition = dict(get_job_definition(name), kind='Deployment')
+            (tmp_path / 'definitions' / (name + '.yml')).write_text(yaml.dump(definition))
+        options = appliers_options.Options(render_processes=2, build_tag='v2', cache_dir=str(tmp_path / 'cache'))
+        definitions_applier = appliers.directories_applier([tmp_path / 'definitions'], options)
+
+        with mock.patch.object(api, 'apply') as apply_mock:
+            definitions_applier.apply_all()
+
+        assert [
+            (call.args[0]['metadata']['name'], call.args[0]['spec']['template']['spec']['containers'][0]['image'])
+            for call in apply_mock.call_args_list
+        ] == [('first', 'python:v2'), ('second', 'python:v2'), ('third', 'python:v2')]
+
+    def test_if_rendered_definition_is_passed_to_applier(self):
+        rendered_definition = get_definition('ConfigMap', 'rendered')
+        applier = appliers.UniversalDefinitionApplier(
+            get_definition('ConfigMap', 'config'), appliers_options.Options(), rendered_definition=rendered_definition,
+        ).get_applier()
+
+        assert isinstance(applier, appliers.ResourceApplier)
+        assert applier.new_definition is rendered_definition
+
+
+class TestApplierRegistry:
+    def test_if_builtin_kinds_are_found_without_entry_points(self):
+        registry = appliers.ApplierRegistry([appliers.ResourceApplier], 'kubepy.appliers')
+
+        with mock.patch('importlib.metadata.entry_points') as entry_points_mock:
+            assert registry.get('ConfigMap') is appliers.ResourceApplier
+
+        entry_points_mock.assert_not_called()
+
+    def test_if_plugin_applier_is_loaded_for_its_kind(self):
+        registry = appliers.ApplierRegistry([], 'kubepy.appliers')
+        entry_point = mock.Mock()
+        entry_point.name = 'Widget'
+        entry_point.load.return_value = appliers.ResourceApplier
+
+        with mock.patch.object(appliers, 'get_entry_points', return_value=[entry_point]) as get_entry_points_mock:
+            assert registry.get('Widget') is appliers.ResourceApplier
+            assert registry.get('Widget') is appliers.ResourceApplier
+            with pytest.raises(KeyError):
+                registry.get('Gadget')
+
+        get_entry_points_mock.assert_called_once_with('kubepy.appliers')
+        entry_point.load.assert_called_once_with()
+
+    def test_if_unknown_kind_raises_install_error(self):
+        with mock.patch.object(appliers, 'get_entry_points', return_value=[]):
+            with mock.patch.object(appliers, 'registry', appliers.ApplierRegistry([], 'kubepy.appliers')):
+                with pytest.raises(appliers.InstallError):
+                    get_applier(get_definition('Widget', 'widget'))
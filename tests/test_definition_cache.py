@@ -0,0 +1,43 @@
+import os
+
+from unittest import mock
+
+from kubepy import definition_cache
+
+
+class TestDefinitionCache:
+    def test_if_cached_definition_is_not_parsed_again(self, write_definition, cache, tmp_path):
+        path = write_definition(tmp_path / 'base', 'config', 'kind: ConfigMap\n')
+        cache.load_yaml(path)
+
+        new_cache = definition_cache.DefinitionCache(cache.directory, max_size=cache.max_size)
+        with mock.patch('kubepy.serialization.load_yaml', side_effect=AssertionError):
+            assert new_cache.load_yaml(path) == {'kind': 'ConfigMap'}
+
+    def test_if_changed_file_is_parsed_again(self, write_definition, cache, tmp_path):
+        path = write_definition(tmp_path / 'base', 'config', 'kind: ConfigMap\n')
+        cache.load_yaml(path)
+        path.write_text('kind: Secret\n')
+        os.utime(path, ns=(1, 1))
+
+        assert cache.load_yaml(path) == {'kind': 'Secret'}
+
+    def test_if_merged_definitions_are_cached(self, write_definition, make_manager, cache, tmp_path):
+        write_definition(tmp_path / 'base', 'config', 'kind: ConfigMap\ndata: {a: "1", b: "2"}\n')
+        write_definition(tmp_path / 'override', 'config', 'data: {b: "3"}\n')
+
+        expected = {'kind': 'ConfigMap', 'data': {'a': '1', 'b': '3'}}
+        assert make_manager(cache)['config'] == expected
+        with mock.patch('kubepy.definition_merger.merge_definitions', side_effect=AssertionError):
+            assert make_manager(cache)['config'] == expected
+
+    def test_if_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = definition_cache.DefinitionCache(tmp_path / 'cache', max_size=400)
+        for name in ['first', 'second', 'third']:
+            cache.get_or_create(cache.get_key(name), lambda: 'x' * 150)
+            os.utime(cache.directory / (cache.get_key(name) + '.pickle'), ns=(len(name), len(name)))
+
+        entries = {path.name for path in cache.directory.iterdir()}
+
+        assert cache.get_key('first') + '.pickle' not in entries
+        assert cache.get_key('third') + '.pickle' in entries
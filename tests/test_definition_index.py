@@ -0,0 +1,142 @@
+import json
+import os
+
+from unittest import mock
+
+import pytest
+
+from kubepy import definition_index
+from kubepy import serialization
+from kubepy.commands import apply_one
+
+
+@pytest.fixture
+def directories(tmp_path, write_definition):
+    write_definition(tmp_path / 'base', 'web', 'kind: Deployment\nmetadata: {labels: {tier: frontend}}\n')
+    write_definition(tmp_path / 'base', 'api', 'kind: Deployment\nmetadata: {labels: {tier: backend}}\n')
+    write_definition(tmp_path / 'base', 'cleanup', 'kind: CronJob\nmetadata: {namespace: jobs}\n')
+    write_definition(tmp_path / 'override', 'web', 'metadata: {labels: {tier: backend, canary: "true"}}\n')
+    return tmp_path
+
+
+class TestDefinitionIndex:
+    def test_if_summaries_are_merged_from_overrides(self, make_manager, directories):
+        summaries = make_manager().get_summaries(['web', 'cleanup'])
+
+        assert summaries == {
+            'web': definition_index.DefinitionSummary('Deployment', None, {'tier': 'backend', 'canary': 'true'}),
+            'cleanup': definition_index.DefinitionSummary('CronJob', 'jobs', {}),
+        }
+
+    def test_if_index_is_stored_in_cache_directory(self, cache, make_manager, directories):
+        make_manager(cache).get_summaries(['web', 'api', 'cleanup'])
+
+        content = json.loads(cache.get_index_path(directories / 'base').read_text())
+        assert sorted(content['definitions']) == ['api', 'cleanup', 'web']
+        assert content['definitions']['cleanup']['kind'] == 'CronJob'
+
+    def test_if_index_is_not_written_without_cache(self, make_manager, directories):
+        make_manager().get_summaries(['web', 'api', 'cleanup'])
+
+        assert sorted(path.name for path in (directories / 'base').iterdir()) == ['api.yml', 'cleanup.yml', 'web.yml']
+
+    def test_if_stored_index_is_used_without_parsing_files(self, cache, make_manager, directories):
+        make_manager(cache).get_summaries(['web', 'api', 'cleanup'])
+
+        with mock.patch.object(serialization, 'load_yaml', side_effect=AssertionError):
+            summaries = make_manager(cache).get_summaries(['web', 'api', 'cleanup'])
+
+        assert summaries['api'].labels == {'tier': 'backend'}
+
+    def test_if_only_changed_files_are_parsed_again(self, write_definition, make_manager, directories):
+        manager = make_manager()
+        manager.get_summaries(['web', 'api', 'cleanup'])
+        path = write_definition(directories / 'base', 'api', 'kind: StatefulSet\n')
+        os.utime(path, ns=(1, 1))
+
+        with mock.patch.object(serialization, 'load_yaml', wraps=serialization.load_yaml) as load_yaml:
+            summaries = manager.get_summaries(['web', 'api', 'cleanup'])
+
+        assert load_yaml.call_count == 1
+        assert summaries['api'] == definition_index.DefinitionSummary('StatefulSet', None, {})
+
+    def test_if_broken_index_is_rebuilt(self, cache, make_manager, directories):
+        cache.get_index_path(directories / 'base').parent.mkdir()
+        cache.get_index_path(directories / 'base').write_text('{')
+
+        summaries = make_manager(cache).get_summaries(['api'])
+
+        assert summaries['api'].kind == 'Deployment'
+
+
+class TestDefinitionFilter:
+    def test_if_definitions_are_selected_by_kind_and_selector(self, make_manager, directories):
+        manager = make_manager()
+        definition_filter = definition_index.DefinitionFilter(kinds=['deployment,cronjob'], selector='tier=backend')
+
+        assert definition_filter.select(manager, list(manager)) == ['api', 'web']
+
+    def test_if_non_matching_names_are_not_indexed(self, make_manager, directories):
+        manager = make_manager()
+        names = definition_index.expand_names(manager, ['w*'])
+
+        with mock.patch.object(serialization, 'load_yaml', wraps=serialization.load_yaml) as load_yaml:
+            selected = definition_index.DefinitionFilter(kinds=['Deployment']).select(manager, names)
+
+        assert selected == ['web']
+        assert load_yaml.call_count == 2
+
+    def test_if_unknown_names_are_kept_to_be_reported(self, make_manager, directories):
+        manager = make_manager()
+
+        assert definition_index.DefinitionFilter(kinds=['Job']).select(manager, ['missing', 'web']) == ['missing']
+
+    @pytest.mark.parametrize('selector, expected', [
+        ('tier=backend', True),
+        ('tier==backend,canary', True),
+        ('tier!=backend', False),
+        ('tier in (frontend, backend)', True),
+        ('tier notin (backend),canary', False),
+        ('!canary', False),
+        ('!missing,canary=true', True),
+    ])
+    def test_if_selector_requirements_are_matched(self, selector, expected):
+        summary = definition_index.DefinitionSummary('Deployment', None, {'tier': 'backend', 'canary': 'true'})
+
+        assert definition_index.DefinitionFilter(selector=selector).matches(summary) == expected
+
+    def test_if_invalid_selector_raises_error(self):
+        with pytest.raises(definition_index.SelectorError):
+            definition_index.DefinitionFilter(selector='tier in backend')
+
+
+class TestExpandNames:
+    def test_if_patterns_are_expanded_and_names_are_kept(self):
+        names = ['api', 'web', 'web-worker']
+
+        assert definition_index.expand_names(names, ['web*', 'missing', '?pi']) == ['web', 'web-worker', 'missing',
+                                                                                    'api']
+
+
+class TestApplyOneSelection:
+    def test_if_selected_definitions_are_shown(self, write_definition, tmp_path, capsys):
+        for name, tier in [('first', 'backend'), ('second', 'frontend'), ('third', 'backend')]:
+            write_definition(tmp_path / 'base', name,
+                             'kind: ConfigMap\nmetadata: {{name: {}, labels: {{tier: {}}}}}\n'.format(name, tier))
+
+        exit_code = apply_one.ApplyOneCommand().main([
+            '--directory', str(tmp_path / 'base'), '--show-definition', '--selector', 'tier=backend',
+        ])
+
+        shown_names = [line for line in capsys.readouterr().out.splitlines() if line.startswith('  name:')]
+        assert exit_code == 0
+        assert shown_names == ['  name: first', '  name: third']
+
+    @pytest.mark.parametrize('args', [['nomatch-*'], ['--kind', 'Secret']])
+    def test_if_empty_selection_fails(self, write_definition, tmp_path, capsys, args):
+        write_definition(tmp_path / 'base', 'first', 'kind: ConfigMap\nmetadata: {name: first}\n')
+
+        exit_code = apply_one.ApplyOneCommand().main(['--directory', str(tmp_path / 'base'), *args])
+
+        assert exit_code == 1
+        assert 'No definitions match given names and filters.' in capsys.readouterr().out
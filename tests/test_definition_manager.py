@@ -0,0 +1,59 @@
+import os
+
+from unittest import mock
+
+import pytest
+
+from kubepy import serialization
+
+
+@pytest.fixture
+def manager(make_manager, write_definition, tmp_path):
+    write_definition(tmp_path / 'base', 'web', 'kind: Deployment\nspec: {replicas: 1}\n')
+    write_definition(tmp_path / 'base', 'config', 'kind: ConfigMap\n')
+    write_definition(tmp_path / 'override', 'web', 'spec: {replicas: 3}\n')
+    write_definition(tmp_path / 'override', 'migrate', 'kind: Job\n')
+    return make_manager()
+
+
+class TestOverridenDefinitionManager:
+    def test_if_names_come_from_all_directories(self, manager):
+        assert list(manager) == ['config', 'migrate', 'web']
+        assert len(manager) == 3
+        assert 'migrate' in manager
+        assert 'missing' not in manager
+
+    def test_if_definitions_are_merged(self, manager):
+        assert manager['web'] == {'kind': 'Deployment', 'spec': {'replicas': 3}}
+
+    def test_if_missing_definition_raises_key_error(self, manager):
+        with pytest.raises(KeyError):
+            manager['missing']
+
+    def test_if_definitions_are_parsed_once(self, manager):
+        manager['web']
+
+        with mock.patch.object(serialization, 'load_yaml', side_effect=AssertionError):
+            assert manager['web'] == {'kind': 'Deployment', 'spec': {'replicas': 3}}
+
+    def test_if_changed_file_is_parsed_again(self, write_definition, manager, tmp_path):
+        manager['web']
+        path = write_definition(tmp_path / 'override', 'web', 'spec: {replicas: 5}\n')
+        os.utime(path, ns=(1, 1))
+
+        assert manager['web'] == {'kind': 'Deployment', 'spec': {'replicas': 5}}
+
+    def test_if_new_file_is_found(self, write_definition, manager, tmp_path):
+        list(manager)
+        write_definition(tmp_path / 'base', 'secret', 'kind: Secret\n')
+        os.utime(tmp_path / 'base', ns=(1, 1))
+
+        assert 'secret' in manager
+        assert manager['secret'] == {'kind': 'Secret'}
+
+    def test_if_directories_are_scanned_once(self, manager):
+        list(manager)
+
+        with mock.patch('os.scandir', side_effect=AssertionError):
+            assert len(manager) == 3
+            manager['config']
@@ -0,0 +1,66 @@
+from kubepy import definition_merger
+
+
+class TestMergeDefinitions:
+    def test_if_dicts_are_merged_recursively(self):
+        merged = definition_merger.merge_definitions(
+            {'metadata': {'name': 'web', 'labels': {'app': 'web'}}},
+            {'metadata': {'labels': {'tier': 'frontend'}}},
+        )
+
+        assert merged == {'metadata': {'name': 'web', 'labels': {'app': 'web', 'tier': 'frontend'}}}
+
+    def test_if_last_value_overrides(self):
+        merged = definition_merger.merge_definitions({'replicas': 1, 'image': 'web'}, {'replicas': 3})
+
+        assert merged == {'replicas': 3, 'image': 'web'}
+
+    def test_if_none_removes_value(self):
+        merged = definition_merger.merge_definitions(
+            {'metadata': {'name': 'web', 'annotations': {'a': 'b'}}},
+            {'metadata': {'annotations': None}},
+        )
+
+        assert merged == {'metadata': {'name': 'web'}}
+
+    def test_if_none_values_are_removed_from_untouched_subtrees(self):
+        merged = definition_merger.merge_definitions(
+            {'spec': {'template': {'metadata': None, 'spec': {}}}, 'kind': 'Job'},
+            {'kind': 'Job'},
+        )
+
+        assert merged == {'spec': {'template': {'spec': {}}}, 'kind': 'Job'}
+
+    def test_if_untouched_subtrees_are_reused(self):
+        spec = {'containers': [{'name': 'web', 'env': [{'name': 'A', 'value': '1'}]}]}
+
+        merged = definition_merger.merge_definitions({'spec': spec}, {'metadata': {'name': 'web'}})
+
+        assert merged['spec'] is spec
+
+    def test_if_list_items_are_merged_by_name(self):
+        merged = definition_merger.merge_definitions(
+            {'env': [{'name': 'A', 'value': '1'}, {'name': 'B', 'value': '2'}, 'other']},
+            {'env': [{'name': 'B', 'value': '3'}, {'name': 'C', 'value': '4'}, 'another']},
+        )
+
+        assert merged == {'env': [
+            {'name': 'A', 'value': '1'},
+            {'name': 'B', 'value': '3'},
+            'other',
+            {'name': 'C', 'value': '4'},
+            'another',
+        ]}
+
+    def test_if_duplicated_names_in_single_list_are_merged(self):
+        merged = definition_merger.merge_definitions(
+            {'env': [{'name': 'A', 'value': '1'}, {'name': 'A', 'value': '2'}]},
+            {'kind': 'Pod'},
+        )
+
+        assert merged == {'env': [{'name': 'A', 'value': '2'}], 'kind': 'Pod'}
+
+    def test_if_key_order_is_preserved(self):
+        merged = definition_merger.merge_definitions({'kind': 'Pod', 'metadata': {}}, {'spec': {}, 'kind': 'Pod'})
+
+        assert list(merged) == ['kind', 'metadata', 'spec']
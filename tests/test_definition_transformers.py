@@ -683,3 +683,83 @@ class TestIterateContainerDefinitions:
         }
         containers = definition_transformers.iterate_container_definitions(definition)
         assert containers == [{'name': 'nginx-container', 'image': 'nginx'}]
+
+
+class TestDefinitionTransformer:
+    def get_definition(self):
+        return {
+            'kind': 'CronJob',
+            'metadata': {
+                'name': 'cleanup',
+                'labels': {
+                    'app': 'cleanup',
+                },
+            },
+            'spec': {
+                'schedule': '0 * * * *',
+                'jobTemplate': {
+                    'spec': {
+                        'template': {
+                            'spec': {
+                                'containers': [
+                                    {
+                                        'name': 'python-container',
+                                        'image': 'python',
+                                        'env': [{'name': 'DEBUG', 'value': 'false'}],
+                                    },
+                                ],
+                                'volumes': [{'name': 'data', 'emptyDir': {}}],
+                            },
+                        },
+                    },
+                },
+            },
+        }
+
+    def test_if_result_matches_separate_transformations(self):
+        definition = self.get_definition()
+        options = {
+            'environment': {'DEBUG': 'true'},
+            'host_volumes': {'dev-volume': '/home'},
+        }
+        labels = {'tier': 'backend'}
+        annotations = {'builder': 'jenkins'}
+        expected = definition_transformers.tag_untaged_images(definition, tag='dev')
+        expected = definition_transformers.set_environment(expected, options['environment'])
+        expected = definition_transformers.add_host_volumes(expected, options['host_volumes'])
+        expected = definition_transformers.add_labels(expected, labels=labels, pod_labels=labels)
+        expected = definition_transformers.add_annotations(
+            expected, annotations=annotations, pod_annotations=annotations)
+
+        transformer = definition_transformers.DefinitionTransformer(
+            tag='dev', labels=labels, pod_labels=labels, annotations=annotations, pod_annotations=annotations,
+            **options)
+
+        assert transformer(definition) == expected
+
+    def test_if_original_definition_is_not_modified(self):
+        definition = self.get_definition()
+        transformer = definition_transformers.DefinitionTransformer(
+            tag='dev', environment={'DEBUG': 'true'}, host_volumes={'dev-volume': '/home'},
+            labels={'tier': 'backend'}, pod_labels={'tier': 'backend'})
+
+        transformer(definition)
+
+        assert definition == self.get_definition()
+
+    def test_if_untouched_parts_are_shared(self):
+        definition = self.get_definition()
+        transformer = definition_transformers.DefinitionTransformer(labels={'tier': 'backend'})
+
+        new_definition = transformer(definition)
+
+        assert new_definition['metadata'] is not definition['metadata']
+        assert new_definition['spec'] is definition['spec']
+
+    def test_if_empty_options_are_skipped(self):
+        definition = self.get_definition()
+
+        new_definition = definition_transformers.DefinitionTransformer()(definition)
+
+        assert new_definition == definition
+        assert definition_transformers.DefinitionTransformer().operations == []
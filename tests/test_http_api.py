@@ -0,0 +1,328 @@
+import http.server
+import json
+import re
+import socketserver
+import sys
+import threading
+import urllib.parse
+
+import pytest
+import yaml
+
+from kubepy import api
+from kubepy import http_api
+
+API_RESOURCES = {
+    '/api/v1': [
+        {'name': 'pods', 'singularName': 'pod', 'kind': 'Pod', 'namespaced': True},
+        {'name': 'pods/log', 'singularName': '', 'kind': 'Pod', 'namespaced': True},
+        {'name': 'configmaps', 'singularName': 'configmap', 'kind': 'ConfigMap', 'namespaced': True},
+    ],
+    '/apis/batch/v1': [
+        {'name': 'jobs', 'singularName': 'job', 'kind': 'Job', 'namespaced': True},
+    ],
+    '/apis/cert-manager.io/v1': [
+        {'name': 'certificates', 'singularName': 'certificate', 'kind': 'Certificate', 'namespaced': True,
+         'shortNames': ['cert']},
+    ],
+}
+OBJECT_PATH = re.compile(r'^(?P<collection>/apis?/.+/namespaces/[^/]+/[^/]+)(/(?P<name>[^/]+))?(/(?P<sub>log))?$')
+
+
+class FakeApiServer(http.server.ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeApiHandler)
+        self.objects = {}
+        self.requests = []
+        self.clients = set()
+        self.stalled = False
+        self.released = threading.Event()
+
+    @property
+    def url(self):
+        return 'http://{}:{}'.format(*self.server_address)
+
+
+class FakeUnixApiServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        super().__init__(str(socket_path), FakeApiHandler)
+        self.objects = {}
+        self.requests = []
+        self.clients = set()
+        self.stalled = False
+        self.released = threading.Event()
+
+
+class FakeApiHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.register()
+        if self.server.stalled:
+            self.server.released.wait(5)
+            return
+        path = self.path.split('?')[0]
+        if path == '/apis':
+            group_versions = [key[len('/apis/'):] for key in API_RESOURCES if key.startswith('/apis/')]
+            return self.respond(200, {'groups': [
+                {'preferredVersion': {'groupVersion': group_version}} for group_version in group_versions
+            ]})
+        if path in API_RESOURCES:
+            return self.respond(200, {'resources': API_RESOURCES[path]})
+        match = OBJECT_PATH.match(path)
+        if match is None:
+            return self.respond(404, {'reason': 'NotFound', 'message': 'the server could not find the resource'})
+        if match['sub'] == 'log' and 'follow=true' in self.path:
+            return self.follow_log(match['name'])
+        if match['sub'] == 'log':
+            return self.respond(200, 'log of {}'.format(match['name']).encode())
+        if match['name']:
+            if path in self.server.objects:
+                return self.respond(200, self.server.objects[path])
+            return self.respond(404, {'reason': 'NotFound', 'message': '"{}" not found'.format(match['name'])})
+        items = [value for key, value in self.server.objects.items() if key.startswith(path + '/')]
+        return self.respond(200, {'kind': 'List', 'items': items})
+
+    def do_POST(self):
+        self.register()
+        definition = self.read_body()
+        path = '{}/{}'.format(self.path.split('?')[0], definition['metadata']['name'])
+        if path in self.server.objects:
+            return self.respond(409, {'reason': 'AlreadyExists', 'message': 'already exists'})
+        self.server.objects[path] = definition
+        self.respond(201, definition)
+
+    def do_PATCH(self):
+        self.register()
+        self.server.objects[self.path.split('?')[0]] = self.read_body()
+        self.respond(200, self.server.objects[self.path.split('?')[0]])
+
+    def do_DELETE(self):
+        self.register()
+        path = self.path.split('?')[0]
+        if self.server.objects.pop(path, None) is None:
+            return self.respond(404, {'reason': 'NotFound', 'message': 'not found'})
+        self.respond(200, {'status': 'Success'})
+
+    def follow_log(self, name):
+        self.send_response(200)
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write('log of {}\n'.format(name).encode())
+        self.wfile.flush()
+        self.server.released.wait(5)
+
+    def register(self):
+        self.server.clients.add(self.client_address)
+        self.server.requests.append((self.command, self.path, self.headers.get('Authorization')))
+
+    def read_body(self):
+        return json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+
+    def respond(self, status, body):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server():
+    server = FakeApiServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def write_kubeconfig(server, tmp_path, user):
+    kubeconfig = {
+        'current-context': 'test',
+        'contexts': [{'name': 'test', 'context': {'cluster': 'local', 'user': 'tester', 'namespace': 'testing'}}],
+        'clusters': [{'name': 'local', 'cluster': {'server': server.url}}],
+        'users': [{'name': 'tester', 'user': user}],
+    }
+    kubeconfig_path = tmp_path / 'config'
+    kubeconfig_path.write_text(yaml.dump(kubeconfig))
+    return kubeconfig_path
+
+
+@pytest.fixture
+def backend(server, tmp_path):
+    backend = http_api.HttpBackend.from_kubeconfig(write_kubeconfig(server, tmp_path, {'token': 'secret-token'}))
+    yield backend
+    backend.close()
+
+
+def get_config_map(name):
+    return {'apiVersion': 'v1', 'kind': 'ConfigMap', 'metadata': {'name': name}, 'data': {'key': 'value'}}
+
+
+class TestHttpBackend:
+    def test_if_applied_definition_can_be_read(self, backend):
+        backend.apply(get_config_map('config'))
+
+        assert backend.get('ConfigMap', 'config') == get_config_map('config')
+
+    @pytest.mark.parametrize('force_conflicts, expected_query', [
+        (False, 'fieldManager=kubepy'),
+        (True, 'fieldManager=kubepy&force=true'),
+    ])
+    def test_if_conflicts_are_forced_only_on_request(self, backend, server, force_conflicts, expected_query):
+        backend.force_conflicts = force_conflicts
+        backend.apply(get_config_map('config'))
+
+        assert ('PATCH', '/api/v1/namespaces/testing/configmaps/config?' + expected_query,
+                'Bearer secret-token') in server.requests
+
+    def test_if_list_is_applied(self, backend, server):
+        backend.apply({'kind': 'List', 'items': [get_config_map('first'), get_config_map('second')]})
+
+        assert set(server.objects) == {
+            '/api/v1/namespaces/testing/configmaps/first',
+            '/api/v1/namespaces/testing/configmaps/second',
+        }
+
+    def test_if_job_is_created_and_deleted(self, backend, server):
+        job = {'apiVersion': 'batch/v1', 'kind': 'Job', 'metadata': {'name': 'migrate', 'namespace': 'other'}}
+
+        backend.create(job)
+        created = set(server.objects)
+        backend.delete('Job', 'migrate', namespace='other')
+
+        assert created == {'/apis/batch/v1/namespaces/other/jobs/migrate'}
+        assert server.objects == {}
+
+    def test_if_logs_are_returned(self, backend):
+        assert backend.logs('migrate-abc') == (b'log of migrate-abc', b'')
+
+    def test_if_logs_are_limited(self, backend):
+        assert backend.logs('migrate-abc', limit_bytes=3) == (b'abc', b'')
+
+    def test_if_closing_followed_logs_stops_reading(self, backend, server):
+        stream = backend.follow_logs('migrate-abc')
+        lines = []
+        first_line_read = threading.Event()
+
+        def read():
+            for line in stream:
+                lines.append(line)
+                first_line_read.set()
+
+        thread = threading.Thread(target=read, daemon=True)
+        thread.start()
+        first_line_read.wait(5)
+        stream.close()
+        thread.join(2)
+        server.released.set()
+
+        assert not thread.is_alive()
+        assert lines == [b'log of migrate-abc\n']
+
+    def test_if_stalled_request_times_out(self, backend, server):
+        backend.timeout = 0.1
+        server.stalled = True
+
+        with pytest.raises(api.ApiError, match='Timed out'):
+            backend.get('ConfigMap', 'first')
+        server.released.set()
+
+    def test_if_missing_object_raises(self, backend):
+        with pytest.raises(api.ApiError):
+            backend.get('Job', 'missing')
+
+    def test_if_unknown_kind_is_reported_like_kubectl(self, backend):
+        definition = {'apiVersion': 'monitoring.coreos.com/v1', 'kind': 'ServiceMonitor', 'metadata': {'name': 'm'}}
+
+        with pytest.raises(api.ApiError) as error_info:
+            backend.apply(definition)
+
+        assert 'no matches for kind "ServiceMonitor"' in str(error_info.value)
+
+    def test_if_custom_resource_kind_is_discovered(self, backend, server):
+        certificate = {'apiVersion': 'cert-manager.io/v1', 'kind': 'Certificate', 'metadata': {'name': 'web'}}
+        backend.apply(certificate)
+
+        assert backend.get('Certificate')['items'] == [certificate]
+        assert backend.get('cert', 'web') == certificate
+        assert ('GET', '/apis', 'Bearer secret-token') in server.requests
+
+    def test_if_unknown_kind_without_api_version_is_not_guessed(self, backend):
+        with pytest.raises(api.ApiError, match='the server doesn\'t have a resource type "IngressRoute"'):
+            backend.get('IngressRoute')
+
+    def test_if_connection_is_reused(self, backend, server):
+        for name in ['first', 'second', 'third']:
+            backend.apply(get_config_map(name))
+
+        assert len(server.clients) == 1
+
+    def test_if_token_is_sent(self, backend, server):
+        backend.apply(get_config_map('config'))
+
+        assert {authorization for _, _, authorization in server.requests} == {'Bearer secret-token'}
+
+
+class TestUnixSocket:
+    def test_if_exec_credential_plugin_token_is_sent(self, server, tmp_path):
+        plugin = tmp_path / 'plugin.py'
+        plugin.write_text(
+            'import json, os, sys\n'
+            'assert json.loads(os.environ["KUBERNETES_EXEC_INFO"])["kind"] == "ExecCredential"\n'
+            'print(json.dumps({"status": {"token": sys.argv[1] + os.environ["TOKEN_SUFFIX"]}}))\n',
+        )
+        user = {'exec': {
+            'apiVersion': 'client.authentication.k8s.io/v1',
+            'command': sys.executable,
+            'args': [str(plugin), 'exec-'],
+            'env': [{'name': 'TOKEN_SUFFIX', 'value': 'token'}],
+        }}
+        backend = http_api.HttpBackend.from_kubeconfig(write_kubeconfig(server, tmp_path, user))
+
+        backend.get('ConfigMap')
+        backend.close()
+
+        assert server.requests[0][2] == 'Bearer exec-token'
+
+    def test_if_expired_exec_credential_is_refreshed(self, tmp_path):
+        plugin = tmp_path / 'plugin.py'
+        plugin.write_text(
+            'import json, pathlib\n'
+            'counter = pathlib.Path(__file__).with_suffix(".count")\n'
+            'count = int(counter.read_text()) + 1 if counter.exists() else 1\n'
+            'counter.write_text(str(count))\n'
+            'print(json.dumps({"status": {"token": "t{}".format(count), '
+            '"expirationTimestamp": "2000-01-01T00:00:00Z"}}))\n',
+        )
+        credential = http_api.ExecCredential({'command': sys.executable, 'args': [str(plugin)]}, tmp_path)
+
+        assert credential.get_headers() == {'Authorization': 'Bearer t1'}
+        assert credential.get_headers() == {'Authorization': 'Bearer t2'}
+
+    def test_if_auth_provider_is_rejected(self, server, tmp_path):
+        kubeconfig_path = write_kubeconfig(server, tmp_path, {'auth-provider': {'name': 'oidc'}})
+
+        with pytest.raises(api.ApiError, match='auth-provider "oidc" is not supported'):
+            http_api.HttpBackend.from_kubeconfig(kubeconfig_path)
+
+    def test_if_api_is_called_through_unix_socket(self, tmp_path):
+        server = FakeUnixApiServer(tmp_path / 'proxy.sock')
+        thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+        thread.start()
+        socket_path = urllib.parse.quote(str(tmp_path / 'proxy.sock'), safe='')
+        backend = http_api.HttpBackend('http+unix://{}'.format(socket_path))
+        try:
+            backend.apply(get_config_map('config'))
+
+            assert backend.get('ConfigMap', 'config') == get_config_map('config')
+        finally:
+            backend.close()
+            server.shutdown()
+            server.server_close()
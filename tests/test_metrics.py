@@ -0,0 +1,53 @@
+import json
+import subprocess
+
+from unittest import mock
+
+from kubepy import api
+from kubepy import metrics
+
+
+class TestMetrics:
+    def test_if_stages_are_summed(self):
+        collector = metrics.Metrics()
+
+        with mock.patch('time.perf_counter', side_effect=[1.0, 1.5, 2.0, 3.0]):
+            with collector.measure('load'):
+                pass
+            with collector.measure('load'):
+                pass
+
+        assert collector.get_stages() == {'load': {'count': 2, 'seconds': 1.5}}
+
+    def test_if_prometheus_format_is_written_for_prom_files(self, tmp_path):
+        collector = metrics.Metrics()
+        collector.add_stage('merge', 0.25)
+        collector.add_api_call('apply', 'kubectl apply -f -', 0.5, 1, bytes_in=10)
+
+        collector.write(tmp_path / 'kubepy.prom')
+
+        lines = (tmp_path / 'kubepy.prom').read_text().splitlines()
+        assert 'kubepy_stage_duration_seconds{stage="merge"} 0.25' in lines
+        assert 'kubepy_api_failures_total{call="apply"} 1' in lines
+        assert 'kubepy_api_sent_bytes_total{call="apply"} 10' in lines
+
+    def test_if_json_is_written_for_other_files(self, tmp_path):
+        collector = metrics.Metrics()
+        collector.add_api_call('get', 'kubectl get job', 0.5, 0, bytes_out=20)
+
+        collector.write(tmp_path / 'metrics.json')
+
+        report = json.loads((tmp_path / 'metrics.json').read_text())
+        assert report['api'] == {'get': {'count': 1, 'failures': 0, 'seconds': 0.5, 'bytes_in': 0, 'bytes_out': 20}}
+        assert report['api_calls'][0]['command'] == 'kubectl get job'
+
+    def test_if_kubectl_calls_are_recorded(self):
+        collector = metrics.Metrics()
+        completed_process = subprocess.CompletedProcess([], 0, stdout=b'{"items": []}', stderr=b'')
+
+        with mock.patch.object(metrics, 'collector', collector):
+            with mock.patch('subprocess.run', return_value=completed_process):
+                api.KubectlBackend().get('Job')
+
+        call, = collector.api_calls
+        assert (call.name, call.command, call.exit_code, call.bytes_out) == ('get', 'kubectl get Job -o json', 0, 13)
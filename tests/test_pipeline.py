@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from kubepy import pipeline
+
+
+class TestPrefetch:
+    def test_if_items_are_yielded_in_order(self):
+        assert list(pipeline.prefetch(range(10), size=2)) == list(range(10))
+
+    def test_if_error_is_raised_after_previous_items(self):
+        def get_items():
+            yield 'first'
+            raise ValueError('broken definition')
+
+        items = pipeline.prefetch(get_items(), size=2)
+
+        assert next(items) == 'first'
+        with pytest.raises(ValueError):
+            next(items)
+
+    def test_if_loading_is_limited_by_size(self):
+        loaded = []
+
+        def get_items():
+            for item in range(100):
+                loaded.append(item)
+                yield item
+
+        items = pipeline.prefetch(get_items(), size=3)
+        assert next(items) == 0
+        time.sleep(0.2)
+        items.close()
+
+        assert len(loaded) <= 5
@@ -0,0 +1,105 @@
+from unittest import mock
+
+from kubepy import api
+from kubepy import appliers
+from kubepy import appliers_options
+from kubepy import planner
+from kubepy.commands import plan as plan_command
+
+
+def get_definition(kind, name, annotations=None):
+    definition = {'kind': kind, 'metadata': {'name': name, 'annotations': annotations or {}}}
+    if kind == 'Job':
+        definition['spec'] = {'template': {'spec': {'containers': [{'name': 'python', 'image': 'python'}]}}}
+    return definition
+
+
+def get_planner(**options):
+    options = appliers_options.Options(**options)
+    return planner.Planner(appliers.DefinitionsApplier({}, options))
+
+
+class TestPlanner:
+    def test_if_resources_are_planned_with_dry_run(self):
+        definitions = [get_definition('ConfigMap', 'config'), get_definition('Service', 'api')]
+        actions = {('configmap', 'config'): 'created', ('service', 'api'): 'unchanged'}
+
+        with mock.patch.object(api, 'dry_run_apply', return_value=(actions, [])) as dry_run_mock:
+            plan = get_planner().plan_definitions(definitions)
+
+        dry_run_mock.assert_called_once_with(appliers.list_definition(definitions), namespace=None)
+        assert plan.changes == [
+            planner.PlannedChange('ConfigMap', 'config', None, 'created'),
+            planner.PlannedChange('Service', 'api', None, 'unchanged'),
+        ]
+        assert plan.get_summary() == '1 created, 1 unchanged'
+
+    def test_if_plan_with_errors_fails(self):
+        definitions = [get_definition('ConfigMap', 'config')]
+        errors = ['Error from server (Invalid): ConfigMap "config" is invalid']
+
+        with mock.patch.object(api, 'dry_run_apply', return_value=({}, errors)):
+            plan = get_planner().plan_definitions(definitions)
+
+        assert plan.errors == errors
+        assert plan.changes == [planner.PlannedChange('ConfigMap', 'config', None, 'failed')]
+        assert plan.failed
+
+    def test_if_jobs_are_not_run(self):
+        definitions = [get_definition('Job', 'migrate')]
+
+        with mock.patch.object(api, 'create') as create_mock, mock.patch.object(api, 'dry_run_apply') as dry_run_mock:
+            plan = get_planner().plan_definitions(definitions)
+
+        create_mock.assert_not_called()
+        dry_run_mock.assert_not_called()
+        assert plan.changes == [planner.PlannedChange('Job', 'migrate', None, 'run')]
+
+    def test_if_job_durations_are_summed(self):
+        definitions = [
+            get_definition('Job', 'migrate', {planner.EXPECTED_DURATION_ANNOTATION: '60'}),
+            get_definition('Job', 'check', {planner.EXPECTED_DURATION_ANNOTATION: '30'}),
+            get_definition('Job', 'unknown'),
+        ]
+
+        plan = get_planner().plan_definitions(definitions)
+
+        assert plan.expected_duration == 90
+        assert plan.jobs_without_expected_duration == ['unknown']
+
+    def test_if_invalid_durations_are_reported(self):
+        definitions = [
+            get_definition('Job', 'migrate', {planner.EXPECTED_DURATION_ANNOTATION: '5m'}),
+            get_definition('Job', 'check', {planner.EXPECTED_DURATION_ANNOTATION: ''}),
+            get_definition('Job', 'seed', {planner.EXPECTED_DURATION_ANNOTATION: '30'}),
+        ]
+
+        plan = get_planner().plan_definitions(definitions)
+
+        assert plan.expected_duration == 30
+        assert plan.errors == [
+            "Invalid kubepy/expected-duration annotation of migrate: '5m' is not a number of seconds.",
+            "Invalid kubepy/expected-duration annotation of check: '' is not a number of seconds.",
+        ]
+        assert plan.failed
+
+    def test_if_concurrent_job_durations_are_not_summed(self):
+        definitions = [
+            get_definition('Job', 'migrate', {planner.EXPECTED_DURATION_ANNOTATION: '60'}),
+            get_definition('Job', 'check', {planner.EXPECTED_DURATION_ANNOTATION: '30'}),
+        ]
+
+        plan = get_planner(concurrent_jobs=True).plan_definitions(definitions)
+
+        assert plan.expected_duration == 60
+
+
+class TestPlanCommand:
+    def test_if_command_fails_with_plan_errors(self, tmp_path, capsys):
+        (tmp_path / 'config.yml').write_text('kind: ConfigMap\nmetadata: {name: config}\n')
+
+        with mock.patch.object(api, 'dry_run_apply', return_value=({}, ['error: invalid'])):
+            exit_code = plan_command.PlanCommand().main(['--directory', str(tmp_path)])
+
+        assert exit_code == 1
+        assert 'ConfigMap/config: failed' in capsys.readouterr().out
@@ -0,0 +1,67 @@
+import concurrent.futures
+import io
+import pstats
+import subprocess
+import sys
+import time
+
+from unittest import mock
+
+from kubepy import api
+from kubepy import profiling
+
+
+class TestProfiler:
+    def test_if_stats_and_collapsed_stacks_are_written(self, tmp_path):
+        output = io.StringIO()
+
+        with profiling.Profiler(tmp_path / 'kubepy.pstats', interval=0.001, output=output):
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+
+        assert pstats.Stats(str(tmp_path / 'kubepy.pstats')).total_calls > 0
+        collapsed_lines = (tmp_path / 'kubepy.pstats.collapsed').read_text().splitlines()
+        assert any('test_if_stats_and_collapsed_stacks_are_written' in line for line in collapsed_lines)
+        assert 'Top functions in Python:' in output.getvalue()
+
+    def test_if_kubectl_calls_are_recognized(self):
+        stacks = []
+
+        def run(*args, **kwargs):
+            stacks.append(profiling.get_stack(sys._getframe()))
+            return subprocess.CompletedProcess(args, 0, stdout=b'', stderr=b'')
+
+        with mock.patch('subprocess.run', side_effect=run):
+            api.KubectlBackend().delete('Job', 'migrate')
+
+        (_, kubectl_command), = stacks
+        assert kubectl_command == 'kubectl delete'
+
+    def test_if_kubectl_calls_in_worker_threads_are_sampled(self, tmp_path):
+        output = io.StringIO()
+        profiler = profiling.Profiler(tmp_path / 'kubepy.pstats', interval=0.001, output=output)
+
+        def run(*args, **kwargs):
+            time.sleep(0.1)
+            return subprocess.CompletedProcess(args, 0, stdout=b'', stderr=b'')
+
+        with mock.patch('subprocess.run', side_effect=run), profiler:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(lambda name: api.KubectlBackend().delete('Job', name), ['first', 'second']))
+
+        kubectl_samples = sum(count for (_, command), count in profiler.samples.items() if command == 'kubectl delete')
+        python_samples = sum(count for (_, command), count in profiler.samples.items() if command is None)
+        assert kubectl_samples > python_samples
+
+    def test_if_log_calls_are_recognized(self):
+        stacks = []
+        process = mock.Mock()
+        process.stdout.read1.side_effect = lambda size: stacks.append(profiling.get_stack(sys._getframe())) or b''
+        process.wait.return_value = 0
+
+        with mock.patch('subprocess.Popen', return_value=process):
+            api.KubectlBackend().logs('migrate')
+
+        (_, kubectl_command), = stacks
+        assert kubectl_command == 'kubectl logs'
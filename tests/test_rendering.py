@@ -0,0 +1,56 @@
+import io
+
+import yaml
+
+from kubepy import appliers_options
+from kubepy import rendering
+
+
+def write_definitions(directory, definitions):
+    directory.mkdir()
+    for definition in definitions:
+        (directory / (definition['metadata']['name'] + '.yml')).write_text(yaml.dump(definition))
+
+
+def get_deployment(name, image='web'):
+    return {
+        'kind': 'Deployment',
+        'metadata': {'name': name},
+        'spec': {'template': {'spec': {'containers': [{'name': 'web', 'image': image}]}}},
+    }
+
+
+class TestRenderDefinitions:
+    def test_if_overridden_definitions_are_rendered_with_options(self, tmp_path):
+        write_definitions(tmp_path / 'base', [get_deployment('first'), get_deployment('second')])
+        write_definitions(tmp_path / 'production', [get_deployment('second', image='production')])
+        options = appliers_options.Options(build_tag='v2')
+
+        rendered = rendering.render_definitions([tmp_path / 'base', tmp_path / 'production'], options, processes=1)
+
+        assert [(name, yaml.safe_load(definition)['spec']['template']['spec']['containers'][0]['image'])
+                for name, definition in rendered] == [('first', 'web:v2'), ('second', 'production:v2')]
+
+    def test_if_process_pool_renders_the_same_stream(self, tmp_path):
+        write_definitions(tmp_path / 'base', [get_deployment('deployment-{}'.format(index)) for index in range(6)])
+        options = appliers_options.Options(build_tag='v2')
+        streams = []
+
+        for processes in [1, 2]:
+            output = io.StringIO()
+            rendering.write_stream(rendering.render_definitions([tmp_path / 'base'], options, processes=processes),
+                                   output)
+            streams.append(output.getvalue())
+
+        assert streams[0] == streams[1]
+        assert len(list(yaml.safe_load_all(streams[0]))) == 6
+
+    def test_if_definitions_are_written_to_directory(self, tmp_path):
+        write_definitions(tmp_path / 'base', [get_deployment('first')])
+
+        rendering.write_directory(
+            rendering.render_definitions([tmp_path / 'base'], appliers_options.Options(), processes=1),
+            tmp_path / 'rendered')
+
+        rendered_definition = yaml.safe_load((tmp_path / 'rendered' / 'first.yml').read_text())
+        assert rendered_definition == get_deployment('first', 'web:latest')
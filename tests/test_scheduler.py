@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from kubepy import scheduler
+
+
+def get_definition(kind, name, order=None):
+    definition = {
+        'kind': kind,
+        'metadata': {
+            'name': name,
+        },
+    }
+    if order is not None:
+        definition['metadata']['annotations'] = {scheduler.ORDER_ANNOTATION: order}
+    return definition
+
+
+class TestGetStages:
+    def test_if_kinds_are_ordered(self):
+        deployment = get_definition('Deployment', 'web')
+        migration = get_definition('Job', 'migrate')
+        config = get_definition('ConfigMap', 'config')
+        account = get_definition('ServiceAccount', 'account')
+        secret = get_definition('Secret', 'secret')
+
+        stages = scheduler.get_stages([deployment, migration, config, account, secret])
+
+        assert stages == [[account], [config, secret], [migration], [deployment]]
+
+    def test_if_order_annotation_is_used(self):
+        deployment = get_definition('Deployment', 'web')
+        migration = get_definition('Job', 'migrate', order='45')
+
+        stages = scheduler.get_stages([deployment, migration])
+
+        assert stages == [[deployment], [migration]]
+
+    def test_if_invalid_order_annotation_raises(self):
+        with pytest.raises(scheduler.SchedulerError):
+            scheduler.get_stages([get_definition('Job', 'migrate', order='first')])
+
+
+class TestRunConcurrently:
+    def test_if_tasks_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        scheduler.run_concurrently([barrier.wait] * 3, parallelism=3)
+
+    def test_if_first_error_is_raised(self):
+        def fail():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            scheduler.run_concurrently([fail, lambda: None], parallelism=2)
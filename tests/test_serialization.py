@@ -0,0 +1,15 @@
+import datetime
+
+from kubepy import serialization
+
+
+class TestSerialization:
+    def test_if_yaml_dates_are_sent_as_strings(self):
+        definition = serialization.load_yaml('metadata:\n  annotations:\n    build-date: 2017-12-12\n')
+
+        assert serialization.dump_json(definition) == '{"metadata": {"annotations": {"build-date": "2017-12-12"}}}'
+
+    def test_if_dumped_yaml_can_be_loaded(self):
+        definition = {'kind': 'ConfigMap', 'data': {'date': datetime.date(2017, 12, 12), 'multiline': 'a\nb\n'}}
+
+        assert serialization.load_yaml(serialization.dump_yaml(definition)) == definition
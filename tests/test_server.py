@@ -0,0 +1,129 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+import yaml
+
+from kubepy import appliers_options
+from kubepy import client
+from kubepy import server
+
+
+def write_config_map(directory, name, value):
+    directory.mkdir(exist_ok=True)
+    definition = {'apiVersion': 'v1', 'kind': 'ConfigMap', 'metadata': {'name': name}, 'data': {'value': value}}
+    path = directory / (name + '.yml')
+    path.write_text(yaml.dump(definition))
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10 ** 9,) * 2)
+
+
+@pytest.fixture
+def kubepy_server(tmp_path):
+    kubepy_server = server.KubepyServer(tmp_path / 'kubepy.sock', watch_interval=0.05)
+    thread = threading.Thread(target=kubepy_server.serve_forever)
+    thread.start()
+    yield kubepy_server
+    kubepy_server.shutdown()
+    thread.join()
+    kubepy_server.server_close()
+
+
+class SleepingCommand:
+    name = 'sleep'
+    started = threading.Event()
+    aborted = threading.Event()
+
+    def __init__(self, server=None):
+        pass
+
+    def main(self, args):
+        self.started.set()
+        try:
+            while True:
+                time.sleep(0.01)
+        except server.ClientDisconnected:
+            self.aborted.set()
+            raise
+
+
+class TestKubepyServer:
+    def test_if_definitions_are_rendered_by_server_with_loaded_managers(self, kubepy_server, tmp_path, capfd):
+        write_config_map(tmp_path / 'definitions', 'settings', 'first')
+        args = ['--directory', str(tmp_path / 'definitions'), '--show-definition', 'settings']
+
+        first_exit_code = client.run_command(kubepy_server.socket_path, 'apply-one', args)
+        first_output = capfd.readouterr().out
+        write_config_map(tmp_path / 'definitions', 'settings', 'second')
+        second_exit_code = client.run_command(kubepy_server.socket_path, 'apply-one', args)
+        second_output = capfd.readouterr().out
+
+        assert (first_exit_code, second_exit_code) == (0, 0)
+        assert yaml.safe_load(first_output)['data'] == {'value': 'first'}
+        assert yaml.safe_load(second_output)['data'] == {'value': 'second'}
+        assert len(kubepy_server.definition_managers) == 1
+
+    def test_if_relative_directories_are_resolved_in_client_directory(self, kubepy_server, tmp_path, capfd,
+                                                                      monkeypatch):
+        write_config_map(tmp_path / 'definitions', 'settings', 'first')
+        monkeypatch.chdir(tmp_path)
+
+        exit_code = client.run_command(kubepy_server.socket_path, 'render', ['--directory', 'definitions'])
+
+        assert exit_code == 0
+        assert yaml.safe_load(capfd.readouterr().out)['metadata']['name'] == 'settings'
+
+    def test_if_command_errors_are_returned_as_exit_code(self, kubepy_server, capfd):
+        exit_code = client.run_command(kubepy_server.socket_path, 'apply-one', ['--replace'])
+
+        assert exit_code == 1
+        assert 'Provide definition names.' in capfd.readouterr().out
+
+    def test_if_unknown_command_is_rejected(self, kubepy_server, capfd):
+        exit_code = client.run_command(kubepy_server.socket_path, 'unknown', [])
+
+        assert exit_code == 1
+        assert 'Unknown command: unknown' in capfd.readouterr().err
+
+    def test_if_command_is_aborted_when_client_disconnects(self, kubepy_server, tmp_path, capfd, monkeypatch):
+        monkeypatch.setitem(server.COMMANDS, SleepingCommand.name, SleepingCommand)
+        write_config_map(tmp_path / 'definitions', 'settings', 'first')
+        request = {'command': SleepingCommand.name, 'args': [], 'cwd': str(tmp_path)}
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(kubepy_server.socket_path)
+            socket.send_fds(connection, [json.dumps(request).encode() + b'\n'],
+                            [sys.stdout.fileno(), sys.stderr.fileno()])
+            assert SleepingCommand.started.wait(5)
+
+        assert SleepingCommand.aborted.wait(5)
+        args = ['--directory', str(tmp_path / 'definitions')]
+        exit_code = client.run_command(kubepy_server.socket_path, 'render', args)
+        assert exit_code == 0
+        assert yaml.safe_load(capfd.readouterr().out)['metadata']['name'] == 'settings'
+
+    def test_if_watcher_loads_changed_definitions(self, kubepy_server, tmp_path):
+        write_config_map(tmp_path / 'definitions', 'settings', 'first')
+        manager = kubepy_server.get_definition_manager([tmp_path / 'definitions'], appliers_options.Options())
+        server.load_definitions(manager)
+        write_config_map(tmp_path / 'definitions', 'settings', 'second')
+        write_config_map(tmp_path / 'definitions', 'other', 'third')
+
+        for _ in range(100):
+            loaded = {name: definition['data']['value'] for name, (_, definition) in manager.definitions.items()}
+            if loaded == {'settings': 'second', 'other': 'third'}:
+                break
+            threading.Event().wait(0.05)
+
+        assert loaded == {'settings': 'second', 'other': 'third'}
+
+
+class TestClient:
+    def test_if_missing_server_is_reported(self, tmp_path, capfd):
+        exit_code = client.run_command(str(tmp_path / 'missing.sock'), 'apply-one', ['name'])
+
+        assert exit_code == 1
+        assert 'Cannot send command to kubepy server' in capfd.readouterr().err
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+COMMAND_MODULES = ['kubepy.commands.apply_all', 'kubepy.commands.apply_one']
+DEFERRED_MODULES = [
+    'yaml', 'tenacity', 'importlib.metadata', 'concurrent.futures', 'cProfile', 'tempfile',
+    'kubepy.appliers', 'kubepy.definition_index', 'kubepy.definition_manager',
+]
+STARTUP_BUDGET_MS = os.environ.get('KUBEPY_STARTUP_BUDGET_MS')
+HELP_CODE = '''
+import sys
+from {module} import run
+sys.argv = ['kubepy', '--help']
+try:
+    run()
+except SystemExit:
+    pass
+print(' '.join(sys.modules), file=sys.stderr)
+'''
+
+
+def get_import_times(module):
+    code = 'import sys, {}; print(" ".join(sys.modules))'.format(module)
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                             check=True)
+    import_times = {}
+    for line in process.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            if cumulative.strip().isdigit():
+                import_times[name.strip()] = int(cumulative) / 1000
+    return import_times, set(process.stdout.split())
+
+
+@pytest.mark.parametrize('module', COMMAND_MODULES)
+class TestStartup:
+    @pytest.mark.skipif(STARTUP_BUDGET_MS is None, reason='KUBEPY_STARTUP_BUDGET_MS is not set.')
+    def test_if_command_module_is_imported_within_budget(self, module):
+        import_times, _ = get_import_times(module)
+        assert import_times[module] < float(STARTUP_BUDGET_MS)
+
+    def test_if_heavy_modules_are_not_imported_at_startup(self, module):
+        _, imported_modules = get_import_times(module)
+        assert imported_modules.isdisjoint(DEFERRED_MODULES)
+
+    def test_if_help_does_not_import_heavy_modules(self, module):
+        process = subprocess.run([sys.executable, '-c', HELP_CODE.format(module=module)], capture_output=True,
+                                 text=True, check=True)
+        assert 'Usage:' in process.stdout
+        assert set(process.stderr.split()).isdisjoint(DEFERRED_MODULES)